@@ -0,0 +1,63 @@
+import os
+import pathlib
+import sys
+from argparse import ArgumentParser
+from nibbles.benchmark.benchmark_history import BenchmarkHistory
+from nibbles.benchmark.benchmark_suite import BenchmarkSuite
+BENCHMARK_DIR = pathlib.Path(os.path.abspath(__file__)).parent.parent.joinpath('benchmarks')
+
+
+def parse_groups(groups):
+    """
+    Parses a comma separated list of benchmark groups
+
+    :param groups: The benchmark groups to run, e.g. 'update,ai'
+    :return: A tuple of benchmark group names
+    """
+    return tuple(group.strip() for group in groups.split(','))
+
+
+def print_result(result):
+    """
+    Prints the statistics of a benchmark result
+
+    :param result: The BenchmarkResult to print
+    """
+    print("{0:<32} median {1:9.3f}ms  min {2:9.3f}ms  p95 {3:9.3f}ms".format(
+        result.name, result.median * 1e3, result.minimum * 1e3, result.percentile(95) * 1e3))
+
+
+if __name__ == "__main__":
+    arg_parser = ArgumentParser(description="Benchmark the game engine, the AI, the level parser and the renderer and "
+                                            "compare the results with the baseline")
+    arg_parser.add_argument('--groups', metavar='-g', type=parse_groups,
+                            help='The comma separated benchmark groups to run (update, ai, parser, display)',
+                            default=','.join(BenchmarkSuite.GROUPS))
+    arg_parser.add_argument('--quick', action='store_true', help='Take fewer samples for a faster but noisier run')
+    arg_parser.add_argument('--history', metavar='-hi', type=str, help='The JSON file to append the results to',
+                            default=str(BENCHMARK_DIR.joinpath('history.json')))
+    arg_parser.add_argument('--baseline', metavar='-b', type=str, help='The JSON file holding the baseline results',
+                            default=str(BENCHMARK_DIR.joinpath('baseline.json')))
+    arg_parser.add_argument('--tolerance', metavar='-t', type=float,
+                            help='The fraction a median may grow by before it counts as a regression', default=0.25)
+    arg_parser.add_argument('--update_baseline', action='store_true',
+                            help='Store the results as the new baseline instead of comparing them with it')
+    args = arg_parser.parse_args()
+    benchmark_suite = BenchmarkSuite(args.groups, args.quick)
+    results = benchmark_suite.run(print_result)
+    benchmark_history = BenchmarkHistory(args.history, args.baseline)
+    run = BenchmarkHistory.create_run(results)
+    benchmark_history.append_run(run)
+    baseline = benchmark_history.load_baseline()
+    if args.update_baseline or not baseline:
+        benchmark_history.save_baseline(run)
+        print("stored the results as the baseline in {0}".format(args.baseline))
+        sys.exit(0)
+    regressions = 0
+    for name, baseline_median, median, ratio, regressed in BenchmarkHistory.compare(run, baseline, args.tolerance):
+        print("{0:<32} {1:9.3f}ms -> {2:9.3f}ms  {3:6.2f}x{4}".format(
+            name, baseline_median * 1e3, median * 1e3, ratio, "  REGRESSION" if regressed else ""))
+        regressions += regressed
+    if regressions:
+        print("{0} benchmarks are more than {1:.0%} slower than the baseline".format(regressions, args.tolerance))
+        sys.exit(1)
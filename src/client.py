@@ -0,0 +1,26 @@
+from argparse import ArgumentParser
+from nibbles.network.nibbles_client_gui import NibblesClientGUI
+
+
+if __name__ == "__main__":
+    arg_parser = ArgumentParser(description="Join a nibbles game hosted with server.py")
+    arg_parser.add_argument('--host', metavar='-ho', type=str, help='The address of the server', default='127.0.0.1')
+    arg_parser.add_argument('--port', metavar='-p', type=int, help='The port of the server', default=7777)
+    arg_parser.add_argument('--watch', action='store_true', help='Only watch the game instead of controlling a snake')
+    arg_parser.add_argument('--level_dir', metavar='-ld', type=str,
+                            help='The path to the level data of the server (the bundled levels by default)',
+                            default=None)
+    arg_parser.add_argument('--display_scale', metavar='-ds', type=int, help='The multiplier for screen resolution',
+                            default=15)
+    arg_parser.add_argument('--refresh_rate', metavar='-rr', type=int, help='The screen refresh rate to use',
+                            default=60)
+    arg_parser.add_argument('--full_redraw', action='store_true',
+                            help='Redraw the whole screen every frame instead of only the parts that changed')
+    arg_parser.add_argument('--interpolate', action='store_true',
+                            help='Slide the snakes between ticks at the refresh rate (redraws the whole screen)')
+    arg_parser.add_argument('--cache_dir', metavar='-cd', type=str,
+                            help='The directory to cache processed resources in between launches', default=None)
+    args = arg_parser.parse_args()
+    nibbles_client_gui = NibblesClientGUI(args.host, args.port, args.display_scale, args.refresh_rate, not args.watch,
+                                          not args.full_redraw, args.cache_dir, args.level_dir, args.interpolate)
+    nibbles_client_gui.start()
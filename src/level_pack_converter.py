@@ -0,0 +1,36 @@
+from argparse import ArgumentParser
+from nibbles.level.level_parsers.level_parser_builder import LevelParserBuilder
+from nibbles.level.level_parsers.level_parser_types import LevelParserTypes
+from nibbles.level.level_parsers.pack_level_parser import PackLevelParser
+BOARD_WIDTH = 80
+BOARD_HEIGHT = 50
+
+
+def convert_levels(level_dir, pack_path, board_width=BOARD_WIDTH, board_height=BOARD_HEIGHT):
+    """
+    Parses a directory of PNG levels and writes them into a level pack
+
+    :param level_dir: The directory containing the PNG levels
+    :param pack_path: The path of the level pack file to write
+    :param board_width: The width of the levels
+    :param board_height: The height of the levels
+    :return: The number of levels written
+    """
+    level_parser = LevelParserBuilder(LevelParserTypes.PNG_PARSER).build()
+    level_parser.set_data_source(board_width, board_height, level_dir)
+    levels = level_parser.parse_levels()
+    PackLevelParser.write_level_pack(levels, board_width, board_height, pack_path)
+    return len(levels)
+
+
+if __name__ == "__main__":
+    arg_parser = ArgumentParser(description="Convert a directory of PNG levels into a level pack")
+    arg_parser.add_argument('level_dir', type=str, help='The directory containing the PNG levels')
+    arg_parser.add_argument('pack_path', type=str, help='The path of the level pack file to write')
+    arg_parser.add_argument('--board_width', metavar='-bw', type=int, help='The width of the levels',
+                            default=BOARD_WIDTH)
+    arg_parser.add_argument('--board_height', metavar='-bh', type=int, help='The height of the levels',
+                            default=BOARD_HEIGHT)
+    args = arg_parser.parse_args()
+    level_count = convert_levels(args.level_dir, args.pack_path, args.board_width, args.board_height)
+    print("wrote {0} levels to {1}".format(level_count, args.pack_path))
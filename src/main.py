@@ -1,6 +1,7 @@
 from argparse import ArgumentParser
 from nibbles.level.level_parsers.level_parser_types import LevelParserTypes
 from nibbles.ai.ai_difficulty_levels import AiDifficultyLevel
+from nibbles.ai.ai_executors.ai_executor_types import AiExecutorTypes
 from nibbles.nibbles_gui import NibblesGUI
 BOARD_WIDTH = 80
 BOARD_HEIGHT = 50
@@ -8,11 +9,11 @@ BOARD_HEIGHT = 50
 
 if __name__ == "__main__":
     arg_parser = ArgumentParser(description="Launch nibbles gui")
-    arg_parser.add_argument('--level_dir', metavar='-ld', type=str, help='The path to the level data directory',
-                            default=None)
+    arg_parser.add_argument('--level_dir', metavar='-ld', type=str,
+                            help='The path to the level data (a level directory or a level pack file)', default=None)
     arg_parser.add_argument('--level_parser', metavar='-lp', type=LevelParserTypes,
-                            help='The level parser to use (png_parser)', default="png_parser",
-                            choices=[LevelParserTypes.PNG_PARSER])
+                            help='The level parser to use (png_parser, pack_parser)', default="png_parser",
+                            choices=[LevelParserTypes.PNG_PARSER, LevelParserTypes.PACK_PARSER])
     arg_parser.add_argument('--initial_level_number', metavar='-ln', type=int, help='The level number to play',
                             default=0)
     arg_parser.add_argument('--initial_game_difficulty', metavar='-d', type=float, help='The initial game difficulty',
@@ -24,10 +25,31 @@ if __name__ == "__main__":
     arg_parser.add_argument('--ai_difficulty_level', metavar='-adl', type=AiDifficultyLevel,
                             help='The difficulty level of the ai (easy, intermediate, hard)', default="intermediate",
                             choices=[AiDifficultyLevel.EASY, AiDifficultyLevel.INTERMEDIATE, AiDifficultyLevel.HARD])
+    arg_parser.add_argument('--ai_executor', metavar='-ae', type=AiExecutorTypes,
+                            help='How to run the ai (auto, inline, thread_pool, process_pool)', default="auto",
+                            choices=[AiExecutorTypes.AUTO, AiExecutorTypes.INLINE, AiExecutorTypes.THREAD_POOL,
+                                     AiExecutorTypes.PROCESS_POOL])
     arg_parser.add_argument('--display_scale', metavar='-ds', type=int, help='The multiplier for screen resolution',
                             default=15)
     arg_parser.add_argument('--refresh_rate', metavar='-rr', type=int, help='The screen refresh rate to use',
                             default=60)
+    arg_parser.add_argument('--full_redraw', action='store_true',
+                            help='Redraw the whole screen every frame instead of only the parts that changed')
+    arg_parser.add_argument('--interpolate', action='store_true',
+                            help='Slide the snakes between ticks at the refresh rate (redraws the whole screen)')
+    arg_parser.add_argument('--buffered_turns', metavar='-bt', type=int,
+                            help='The number of turns to remember per player between ticks', default=3)
+    arg_parser.add_argument('--cache_dir', metavar='-cd', type=str,
+                            help='The directory to cache processed resources in between launches', default=None)
+    arg_parser.add_argument('--seed', metavar='-s', type=int,
+                            help='The seed of the random number generator (random by default)', default=None)
+    arg_parser.add_argument('--record_replay', metavar='-rp', type=str,
+                            help='The path to write a replay of the game to when it ends', default=None)
+    arg_parser.add_argument('--profile', action='store_true',
+                            help='Time the game loop and the renderer and show the timings in the stats bar')
+    arg_parser.add_argument('--profile_output', metavar='-po', type=str,
+                            help='The path to write the timings to as JSON when the game ends (enables --profile)',
+                            default=None)
     arg_parser.add_argument('--skip_intro', metavar='-si', type=bool, help='Should skip intro screen',
                             default=False)
     args = arg_parser.parse_args()
@@ -36,5 +58,10 @@ if __name__ == "__main__":
                              number_of_players=args.number_of_players, number_of_ai=args.number_of_ai,
                              ai_difficulty_level=args.ai_difficulty_level, display_scale=args.display_scale,
                              refresh_rate=args.refresh_rate, level_parser_type=args.level_parser,
-                             initial_level_number=args.initial_level_number, skip_intro=args.skip_intro)
+                             initial_level_number=args.initial_level_number, skip_intro=args.skip_intro,
+                             ai_executor_type=args.ai_executor, incremental_rendering=not args.full_redraw,
+                             cache_dir=args.cache_dir, level_dir=args.level_dir,
+                             seed=args.seed, replay_path=args.record_replay,
+                             profile=args.profile or bool(args.profile_output), profile_path=args.profile_output,
+                             interpolation=args.interpolate, max_buffered_turns=args.buffered_turns)
     nibbles_gui.start_nibbles()
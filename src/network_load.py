@@ -0,0 +1,109 @@
+import asyncio
+import random
+import time
+from argparse import ArgumentParser
+from nibbles import Nibbles
+from nibbles.directions import Directions
+from nibbles.level.level_parsers.level_parser_types import LevelParserTypes
+from nibbles.ai.ai_difficulty_levels import AiDifficultyLevel
+from nibbles.network.nibbles_client import NibblesClient
+from nibbles.network.nibbles_server import NibblesServer
+BOARD_WIDTH = 80
+BOARD_HEIGHT = 50
+LOAD_TEST_COLORS = [(index * 32, 255 - index * 32, 128) for index in range(8)]
+
+
+async def simulate_client(client, turn_interval, turn_random):
+    """
+    Receives the game like a player would and sends a random turn every turn interval while it controls a snake
+
+    :param client: The connected NibblesClient
+    :param turn_interval: The number of seconds between two turns
+    :param turn_random: The Random to pick the turns with
+    """
+    loop = asyncio.get_running_loop()
+    next_turn_time = loop.time()
+    try:
+        while True:
+            await client.receive_frame()
+            if client.player_number and loop.time() >= next_turn_time:
+                client.send_turn(turn_random.choice(Directions.DIRECTIONS))
+                next_turn_time += turn_interval
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+
+
+async def load_test(args):
+    """
+    Connects the simulated clients to a server, lets them play for the duration of the test and prints the statistics
+
+    :param args: The parsed command line arguments
+    """
+    nibbles_server = None
+    host, port = args.host, args.port
+    if not port:
+        nibbles = Nibbles(LOAD_TEST_COLORS, BOARD_WIDTH, BOARD_HEIGHT, args.initial_game_difficulty, 2,
+                          args.number_of_ai, AiDifficultyLevel.EASY, LevelParserTypes.PNG_PARSER,
+                          args.initial_level_number, True, seed=args.seed, prefetch=False)
+        nibbles_server = NibblesServer(nibbles, host=host, resume_delay=0.5)
+        await nibbles_server.start()
+        port = nibbles_server.port
+        server_task = asyncio.create_task(nibbles_server.run())
+    first_client = NibblesClient(host, port)
+    await first_client.connect()
+    clients = [first_client]
+    for _ in range(args.clients - 1):
+        client = NibblesClient(host, port, level_registry=first_client.level_registry)
+        await client.connect()
+        clients.append(client)
+    turn_random = random.Random(args.seed)
+    start_time = time.perf_counter()
+    client_tasks = [asyncio.create_task(simulate_client(client, args.turn_interval, turn_random)) for client in clients]
+    await asyncio.sleep(args.duration)
+    elapsed_time = time.perf_counter() - start_time
+    for task in client_tasks:
+        task.cancel()
+    await asyncio.gather(*client_tasks, return_exceptions=True)
+    frames = [client.keyframes_received + client.deltas_received for client in clients]
+    ticks = [client.frame.tick for client in clients if client.frame]
+    received_bytes = sum(client.received_bytes for client in clients)
+    keyframes = sum(client.keyframes_received for client in clients)
+    print("{0} clients for {1:.1f}s".format(len(clients), elapsed_time))
+    print("frames per client: min {0}, mean {1:.1f}, max {2} ({3:.1f}/s)".format(
+        min(frames), sum(frames) / len(frames), max(frames), sum(frames) / len(frames) / elapsed_time))
+    print("ticks behind the most recent client: max {0}".format(max(ticks) - min(ticks) if ticks else 0))
+    print("received {0} bytes, {1:.1f} bytes per frame, {2:.1%} keyframes".format(
+        received_bytes, received_bytes / max(sum(frames), 1), keyframes / max(sum(frames), 1)))
+    if nibbles_server:
+        scheduler = nibbles_server.scheduler
+        print("server: {0} ticks, {1} missed deadlines, {2} dropped ticks, {3} skipped frames".format(
+            scheduler.ticks, scheduler.missed_deadlines, scheduler.dropped_ticks,
+            sum(connection.skipped_frames for connection in nibbles_server.connections)))
+        p50, p95 = nibbles_server.input_queue.latency.percentiles((50, 95))
+        print("turn latency: p50 {0:.2f}ms, p95 {1:.2f}ms".format(p50 * 1e3, p95 * 1e3))
+    for client in clients[1:] + [first_client]:  # the first client shuts down the level registry they share
+        await client.close()
+    if nibbles_server:
+        await nibbles_server.stop()
+        await server_task
+
+
+if __name__ == "__main__":
+    arg_parser = ArgumentParser(description="Connect many simulated clients to a nibbles server and report how well "
+                                            "the server kept up")
+    arg_parser.add_argument('--host', metavar='-ho', type=str, help='The address of the server', default='127.0.0.1')
+    arg_parser.add_argument('--port', metavar='-p', type=int,
+                            help='The port of the server (starts a server in this process by default)', default=None)
+    arg_parser.add_argument('--clients', metavar='-c', type=int, help='The number of simulated clients', default=100)
+    arg_parser.add_argument('--duration', metavar='-du', type=float, help='The number of seconds to play', default=10.0)
+    arg_parser.add_argument('--turn_interval', metavar='-ti', type=float,
+                            help='The number of seconds between two turns of a player', default=0.25)
+    arg_parser.add_argument('--initial_level_number', metavar='-ln', type=int,
+                            help='The level number the server in this process plays', default=0)
+    arg_parser.add_argument('--initial_game_difficulty', metavar='-d', type=float,
+                            help='The game difficulty of the server in this process', default=9.0)
+    arg_parser.add_argument('--number_of_ai', metavar='-na', type=int,
+                            help='The number of AI players of the server in this process', default=6)
+    arg_parser.add_argument('--seed', metavar='-s', type=int, help='The seed of the game and the turns', default=None)
+    args = arg_parser.parse_args()
+    asyncio.run(load_test(args))
@@ -1,11 +1,19 @@
-import math
+import logging
+from threading import local
 from nibbles.directions import Directions
-from nibbles.food import Food
 from nibbles.ai.ai_difficulty_levels import AiDifficultyLevel
-from nibbles.ai.a_star import AStar
+from nibbles.ai.grid_a_star import GridAStar
+from nibbles.ai.distance_field import DistanceField
+from nibbles.collision_map import CollisionMap
+logger = logging.getLogger(__name__)  # the AI logs at debug level when it can't find a way to the food
 
 
 class Ai:
+    grid_a_stars = local()  # path finders are reused between calls but never shared between threads
+    barrier_distance_fields = local()
+    BARRIER_TABLE = bytes(cell_type & CollisionMap.CELL_BARRIER for cell_type in range(256))  # keeps only barriers
+    SHARED_DISTANCE_FIELD_SNAKES = 8  # from this many hard snakes one search from the food beats an A* search each
+
     @staticmethod
     def is_in_bounds(direction_to_check, current_col, current_row, map_width, map_height):
         """
@@ -30,6 +38,8 @@ class Ai:
         :param: update_data: A dictionary of data used to update the snake direction
         """
         food = update_data['food']
+        if not food:
+            return  # the board is full, keep moving in the same direction
         current_row = snake.head.row
         current_col = snake.head.column
         if current_row != food.row:
@@ -66,85 +76,156 @@ class Ai:
         current_row = snake.head.row
         current_col = snake.head.column
         collision_map = update_data['collision_map']
-        map_width = len(collision_map)
-        map_height = 0
-        if map_width > 0:
-            map_height = len(collision_map[0])
+        map_width = collision_map.width
+        map_height = collision_map.height
         Ai.easy_calculate_snake_direction(snake, update_data)  # use this as a base
         # then improve it by avoiding obstacles
-        potential_next_coords = (current_col + snake.direction_to_move[0], current_row + snake.direction_to_move[1])
-        space_to_move_to = collision_map[potential_next_coords[0]][potential_next_coords[1]]
-        danger = False
-        if len(space_to_move_to) > 0:
-            for x in space_to_move_to:
-                if not isinstance(x, Food):
-                    danger = True
-                    break
-        if not danger:
+        potential_next_coords = ((current_col + snake.direction_to_move[0]) % map_width,
+                                 (current_row + snake.direction_to_move[1]) % map_height)
+        if not collision_map.is_blocked(potential_next_coords[0], potential_next_coords[1]):
             return
         for direction in Directions.DIRECTIONS:
             if (direction != Directions.OPPOSITE_DIRECTIONS[snake.last_direction_moved]
                     and Ai.is_in_bounds(direction, current_col, current_row, map_width, map_height)
-                    and len(collision_map[current_col + direction[0]][current_row + direction[1]]) == 0):
+                    and collision_map.is_empty(current_col + direction[0], current_row + direction[1])):
                 snake.direction_to_move = direction
                 return
-        print("intermediate AI is stumped")
-
-    class SnakeSolver(AStar):
-        def __init__(self, grid, illegal_coordinate):
-            self.grid = grid
-            self.illegal_coordinate = illegal_coordinate
-            self.width = len(self.grid)
-            self.height = len(self.grid[0])
-
-        def heuristic_cost_estimate(self, n1, n2):
-            """
-            Computes the 'direct' distance between two (x,y) tuples
-            """
-            (x1, y1) = n1
-            (x2, y2) = n2
-            euclidean_distance = math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
-            return euclidean_distance
-
-        def distance_between(self, n1, n2):
-            """
-            this method always returns 1, as two 'neighbors' are always adjacent
-            """
-            return 1
-
-        def neighbors(self, node):
-            """
-            for a given coordinate in the maze, returns up to 4 adjacent(north,east,south,west)
-            nodes that can be reached (=any adjacent coordinate that is not a wall)
-            """
-            x, y = node
-            neighbors = [(nx, ny) for nx, ny in [(x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)] if
-                         0 <= nx < self.width and 0 <= ny < self.height
-                         and (nx, ny) != self.illegal_coordinate
-                         and (len(self.grid[nx][ny]) == 0 or isinstance(self.grid[nx][ny][0], Food))]
-            return neighbors
+        logger.debug("intermediate AI is stumped")
+
+    @staticmethod
+    def get_grid_a_star(width, height):
+        """
+        Returns the path finder of the current thread for the given board size, creating it if needed
+
+        :param width: The width of the game board
+        :param height: The height of the game board
+        :return: A GridAStar for the given board size
+        """
+        grid_a_star = getattr(Ai.grid_a_stars, 'grid_a_star', None)
+        if grid_a_star is None or grid_a_star.width != width or grid_a_star.height != height:
+            grid_a_star = GridAStar(width, height)
+            Ai.grid_a_stars.grid_a_star = grid_a_star
+        return grid_a_star
+
+    @staticmethod
+    def get_barrier_distance_field(collision_map, goal):
+        """
+        Returns the distance field of the current thread from the goal around the barriers of the collision map, the
+        snakes are ignored so the field only has to be computed again when the goal or the barrier version of the
+        collision map changes. The distances are a lower bound that guides A* around the walls of the level
+
+        :param collision_map: The current collision map
+        :param goal: The index of the cell to compute the distances to
+        :return: A DistanceField of the barriers
+        """
+        distance_field = getattr(Ai.barrier_distance_fields, 'distance_field', None)
+        if distance_field is None or distance_field.width != collision_map.width or \
+                distance_field.height != collision_map.height:
+            distance_field = DistanceField(collision_map.width, collision_map.height)
+            Ai.barrier_distance_fields.distance_field = distance_field
+            Ai.barrier_distance_fields.barrier_version = None
+        if distance_field.goal != goal or Ai.barrier_distance_fields.barrier_version != collision_map.barrier_version:
+            distance_field.compute(collision_map.cell_types.translate(Ai.BARRIER_TABLE), goal)
+            Ai.barrier_distance_fields.barrier_version = collision_map.barrier_version
+        return distance_field
+
+    @staticmethod
+    def distance_field_targets(snake, distance_field):
+        """
+        Returns the cells adjacent to the snake's head that the snake may move onto next
+
+        :param: snake: The snake that the AI is controlling
+        :param: distance_field: The DistanceField that will be followed
+        :return: A tuple of the indices of the cells that the distance field needs to reach for the snake
+        """
+        head_neighbors = distance_field.neighbors[snake.head.column + snake.head.row * distance_field.width]
+        opposite_direction = Directions.OPPOSITE_DIRECTIONS[snake.last_direction_moved]
+        return tuple(neighbor for direction, neighbor in zip(Directions.DIRECTIONS, head_neighbors)
+                     if direction != opposite_direction)
+
+    @staticmethod
+    def follow_distance_field(snake, distance_field):
+        """
+        Points the snake towards the adjacent cell that is closest to the goal of the distance field, prefers to keep
+        moving in the same direction when there is a tie
+
+        :param: snake: The snake that the AI is controlling
+        :param: distance_field: A DistanceField computed for the current state of the game board
+        :return: True if the goal can be reached from the snake's head otherwise false
+        """
+        distances = distance_field.distances
+        head_neighbors = distance_field.neighbors[snake.head.column + snake.head.row * distance_field.width]
+        opposite_direction = Directions.OPPOSITE_DIRECTIONS[snake.last_direction_moved]
+        best_distance = DistanceField.UNREACHABLE
+        for direction, neighbor in zip(Directions.DIRECTIONS, head_neighbors):
+            distance = distances[neighbor]
+            if distance == DistanceField.UNREACHABLE or direction == opposite_direction:
+                continue
+            if (best_distance == DistanceField.UNREACHABLE or distance < best_distance
+                    or (distance == best_distance and direction == snake.last_direction_moved)):
+                best_distance = distance
+                snake.direction_to_move = direction
+        return best_distance != DistanceField.UNREACHABLE
 
     @staticmethod
     def hard_calculate_snake_direction(snake, update_data):
         """
-        Calculates the direction that the snake AI should move using A*
-        NOTE: This will probably not get done during the projects time frame but if I get bored, who knows.
+        Calculates the direction that the snake AI should move using the shared distance field from the food when the
+        update data contains one, otherwise using A* guided by the distances from the food around the barriers
 
         :param: snake: The snake that the AI is controlling
         :param: update_data: A dictionary of data used to update the snake direction
         """
         food = update_data['food']
-        curr_pos = (snake.head.column, snake.head.row)
+        if not food:
+            return  # the board is full, keep moving in the same direction
+        distance_field = update_data.get('distance_field')
+        if distance_field:
+            if not Ai.follow_distance_field(snake, distance_field):
+                logger.debug("hard AI is stumped")
+            return
+        current_row = snake.head.row
+        current_col = snake.head.column
         collision_map = update_data['collision_map']
+        map_width = collision_map.width
+        map_height = collision_map.height
         opposite_direction = Directions.OPPOSITE_DIRECTIONS[snake.last_direction_moved]
-        illegal_coordinate = (curr_pos[0] + opposite_direction[0], curr_pos[1] + opposite_direction[1])
-        path = Ai.SnakeSolver(collision_map, illegal_coordinate).astar(curr_pos, (food.column, food.row))
+        illegal_index = collision_map.index((current_col + opposite_direction[0]) % map_width,
+                                            (current_row + opposite_direction[1]) % map_height)
+        goal = collision_map.index(food.column, food.row)
+        path = Ai.get_grid_a_star(map_width, map_height).find_path(collision_map.counts,
+                                                                   collision_map.index(current_col, current_row), goal,
+                                                                   illegal_index,
+                                                                   Ai.get_barrier_distance_field(collision_map,
+                                                                                                 goal).distances)
         if path and len(path) > 1:
-            next_location = path[1]
-            direction = (next_location[0] - curr_pos[0], next_location[1] - curr_pos[1])
-            snake.direction_to_move = direction
+            next_col, next_row = collision_map.position(path[1])
+            # the path may wrap around the board, so normalize the step back into a unit vector
+            snake.direction_to_move = ((next_col - current_col + 1) % map_width - 1,
+                                       (next_row - current_row + 1) % map_height - 1)
             return
-        print("hard AI is stumped")
+        logger.debug("hard AI is stumped")
+
+    @staticmethod
+    def build_update_data(food, collision_map, ai_snakes, distance_field):
+        """
+        Builds the update data shared by the AI snakes for the current tick, the distance field from the food is only
+        computed when enough snakes use the hard AI to make it cheaper than an A* search for each of them
+
+        :param food: The current food item (None if the board is full)
+        :param collision_map: The current collision map
+        :param ai_snakes: The snakes that are controlled by the AI
+        :param distance_field: A DistanceField the size of the collision map that is reused between ticks
+        :return: A dictionary of data used to update the snake directions
+        """
+        update_data = {'food': food, 'collision_map': collision_map}
+        hard_snakes = [snake for snake in ai_snakes if snake.on_update_direction == Ai.hard_calculate_snake_direction]
+        if food and len(hard_snakes) >= Ai.SHARED_DISTANCE_FIELD_SNAKES:
+            # only the hard snakes follow the field, so the search can stop once it reached all of them
+            target_groups = [Ai.distance_field_targets(snake, distance_field) for snake in hard_snakes]
+            distance_field.compute(collision_map.counts, collision_map.coordinate_index(food), target_groups)
+            update_data['distance_field'] = distance_field
+        return update_data
 
     @staticmethod
     def resolve_difficulty_level(ai_difficulty_level):
@@ -0,0 +1,48 @@
+import os
+from nibbles.ai.ai_difficulty_levels import AiDifficultyLevel
+from nibbles.ai.ai_executors.ai_executor_types import AiExecutorTypes
+from nibbles.ai.ai_executors.ai_executor_interface import AiExecutorInterface
+from nibbles.ai.ai_executors.inline_ai_executor import InlineAiExecutor
+from nibbles.ai.ai_executors.thread_pool_ai_executor import ThreadPoolAiExecutor
+from nibbles.ai.ai_executors.process_pool_ai_executor import ProcessPoolAiExecutor
+
+
+class AiExecutorBuilder:
+    """
+    Represents a way to dynamically create an AI executor based on some input parameters
+    """
+    def __init__(self, ai_executor_type: AiExecutorTypes, ai_difficulty_level: AiDifficultyLevel):
+        """
+        :param ai_executor_type: The type of AI executor to build
+        :param ai_difficulty_level: The difficulty level of the AI, used to pick an executor when the type is AUTO
+        """
+        self.ai_executor_type = ai_executor_type
+        self.ai_difficulty_level = ai_difficulty_level
+
+    def resolve_executor_type(self) -> AiExecutorTypes:
+        """
+        Resolves the AUTO executor type, the hard AI runs in a separate process when there is more than one core so it
+        doesn't hold the GIL that the display needs while every other difficulty level is cheap enough to run inline
+
+        :return: The executor type that should be built
+        """
+        if self.ai_executor_type != AiExecutorTypes.AUTO:
+            return self.ai_executor_type
+        if self.ai_difficulty_level == AiDifficultyLevel.HARD and (os.cpu_count() or 1) > 1:
+            return AiExecutorTypes.PROCESS_POOL
+        return AiExecutorTypes.INLINE
+
+    def build(self) -> AiExecutorInterface:
+        """
+        Initializes an AI executor matching the input parameters
+        :return: An AI executor that matches the input parameters
+        """
+        ai_executor_type = self.resolve_executor_type()
+        if ai_executor_type == AiExecutorTypes.INLINE:
+            return InlineAiExecutor()
+        elif ai_executor_type == AiExecutorTypes.THREAD_POOL:
+            return ThreadPoolAiExecutor()
+        elif ai_executor_type == AiExecutorTypes.PROCESS_POOL:
+            return ProcessPoolAiExecutor()
+        else:
+            raise RuntimeError("invalid ai executor '{0}'".format(self.ai_executor_type))
@@ -0,0 +1,47 @@
+import time
+
+
+class AiExecutorInterface:
+    """
+    Represents a long lived runner for the AI strategies of a nibbles game
+
+    A Profiler sets strategy_histograms on the executor it instruments, the executor then times the strategy of every
+    AI snake and records it in the histogram of the strategy
+    """
+    strategy_histograms = None  # AI strategy -> SpanHistogram, None while the strategies aren't timed
+
+    def calculate_ai_directions(self, nibbles):
+        """
+        Calculates the movement direction for the ai players in the nibbles instance
+
+        :param: nibbles: The nibbles instance to calculate the ai directions for
+        """
+        pass
+
+    def timed_update_direction(self, snake, update_data):
+        """
+        Updates the direction of an AI snake and records the time its strategy took
+
+        :param snake: The AI snake to update
+        :param update_data: A dictionary of data used to update the snake direction
+        """
+        start_time = time.perf_counter()
+        snake.update_direction(update_data)
+        self.record_strategy_time(snake, time.perf_counter() - start_time)
+
+    def record_strategy_time(self, snake, seconds):
+        """
+        Records the time the strategy of an AI snake took in the histogram of the strategy
+
+        :param snake: The AI snake the strategy was run for
+        :param seconds: The number of seconds the strategy took
+        """
+        histogram = self.strategy_histograms.get(snake.on_update_direction)
+        if histogram:
+            histogram.record(seconds)
+
+    def shutdown(self):
+        """
+        Releases the workers of the executor
+        """
+        pass
@@ -0,0 +1,14 @@
+from enum import Enum
+
+
+class AiExecutorTypes(Enum):
+    """
+    Represents different ways of running the AI strategies
+    """
+    AUTO = 'auto'
+    INLINE = 'inline'
+    THREAD_POOL = 'thread_pool'
+    PROCESS_POOL = 'process_pool'
+
+    def __str__(self):
+        return self.value
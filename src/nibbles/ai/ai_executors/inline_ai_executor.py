@@ -0,0 +1,30 @@
+from nibbles.ai import Ai
+from nibbles.ai.distance_field import DistanceField
+from nibbles.ai.ai_executors.ai_executor_interface import AiExecutorInterface
+
+
+class InlineAiExecutor(AiExecutorInterface):
+    """
+    Represents an AI executor that runs the AI strategies one after another on the calling thread
+    """
+    def __init__(self):
+        self.distance_field = None
+
+    def calculate_ai_directions(self, nibbles):
+        """
+        Calculates the movement direction for the ai players in the nibbles instance
+
+        :param: nibbles: The nibbles instance to calculate the ai directions for
+        """
+        ai_snakes = [snake for snake in nibbles.snakes if not snake.player_number]
+        if not ai_snakes:
+            return
+        if not self.distance_field:
+            self.distance_field = DistanceField(nibbles.board_width, nibbles.board_height)
+        update_data = Ai.build_update_data(nibbles.food, nibbles.collision_map, ai_snakes, self.distance_field)
+        if self.strategy_histograms:
+            for snake in ai_snakes:
+                self.timed_update_direction(snake, update_data)
+            return
+        for snake in ai_snakes:
+            snake.update_direction(update_data)
@@ -0,0 +1,92 @@
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from nibbles.ai import Ai
+from nibbles.ai.distance_field import DistanceField
+from nibbles.ai.ai_executors.ai_executor_interface import AiExecutorInterface
+from nibbles.collision_map import CollisionMap
+from nibbles.food import Food
+from nibbles.snake import Snake
+from nibbles.snake_body import SnakeBody
+
+
+class ProcessPoolAiExecutor(AiExecutorInterface):
+    """
+    Represents an AI executor that runs the AI strategies in a persistent worker process
+
+    Each tick the board is sent as the raw bytes of the collision map's cell types and counts together with the heads
+    of the AI snakes, the worker mirrors it into a collision map that it keeps between ticks. The worker sends back how
+    long the strategy of each snake took next to its direction, which is recorded when a Profiler times the strategies
+    """
+    worker_boards = {}  # (width, height) -> (CollisionMap, DistanceField), only populated inside the workers
+
+    def __init__(self, max_workers=1):
+        """
+        :param max_workers: The number of worker processes, each tick is handled by a single worker so that the
+                            distance field is computed once
+        """
+        self.pool = ProcessPoolExecutor(max_workers=max_workers)
+
+    @staticmethod
+    def calculate_directions(board_state):
+        """
+        Calculates the directions of the AI snakes described by the board state, runs inside a worker process
+
+        :param board_state: A tuple of the board size, cell types, collision counts, barrier version, food and AI snake
+                            states
+        :return: A list with a (direction, seconds) tuple of every AI snake, the direction it should move in and the
+                 time its strategy took
+        """
+        width, height, cell_types, counts, barrier_version, food_state, snake_states = board_state
+        board = ProcessPoolAiExecutor.worker_boards.get((width, height))
+        if not board:
+            board = (CollisionMap(width, height), DistanceField(width, height))
+            ProcessPoolAiExecutor.worker_boards[(width, height)] = board
+        collision_map, distance_field = board
+        collision_map.cell_types[:] = cell_types
+        collision_map.counts = array('H', counts)
+        collision_map.barrier_version = barrier_version
+        food = Food(*food_state) if food_state else None
+        snakes = []
+        for column, row, last_direction_moved, direction_to_move, on_update_direction in snake_states:
+            snake = Snake(SnakeBody(row, column), None, direction_to_move=last_direction_moved,
+                          on_update_direction=on_update_direction)
+            snake.direction_to_move = direction_to_move
+            snakes.append(snake)
+        update_data = Ai.build_update_data(food, collision_map, snakes, distance_field)
+        perf_counter = time.perf_counter
+        results = []
+        for snake in snakes:
+            start_time = perf_counter()
+            snake.update_direction(update_data)
+            results.append((snake.direction_to_move, perf_counter() - start_time))
+        return results
+
+    def calculate_ai_directions(self, nibbles):
+        """
+        Calculates the movement direction for the ai players in the nibbles instance
+
+        :param: nibbles: The nibbles instance to calculate the ai directions for
+        """
+        ai_snakes = [snake for snake in nibbles.snakes if not snake.player_number]
+        if not ai_snakes:
+            return
+        collision_map = nibbles.collision_map
+        food = nibbles.food
+        board_state = (collision_map.width, collision_map.height, bytes(collision_map.cell_types),
+                       collision_map.counts.tobytes(), collision_map.barrier_version,
+                       (food.row, food.column, food.points) if food else None,
+                       [(snake.head.column, snake.head.row, snake.last_direction_moved, snake.direction_to_move,
+                         snake.on_update_direction) for snake in ai_snakes])
+        results = self.pool.submit(ProcessPoolAiExecutor.calculate_directions, board_state).result()
+        for snake, (direction, _) in zip(ai_snakes, results):
+            snake.direction_to_move = direction
+        if self.strategy_histograms:
+            for snake, (_, seconds) in zip(ai_snakes, results):
+                self.record_strategy_time(snake, seconds)
+
+    def shutdown(self):
+        """
+        Releases the workers of the executor
+        """
+        self.pool.shutdown()
@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+from nibbles.ai import Ai
+from nibbles.ai.distance_field import DistanceField
+from nibbles.ai.ai_executors.ai_executor_interface import AiExecutorInterface
+
+
+class ThreadPoolAiExecutor(AiExecutorInterface):
+    """
+    Represents an AI executor that runs each AI strategy on a persistent pool of threads
+    """
+    def __init__(self, max_workers=None):
+        """
+        :param max_workers: The number of threads in the pool (defaults to the ThreadPoolExecutor default)
+        """
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='nibbles-ai')
+        self.distance_field = None
+
+    def calculate_ai_directions(self, nibbles):
+        """
+        Calculates the movement direction for the ai players in the nibbles instance
+
+        :param: nibbles: The nibbles instance to calculate the ai directions for
+        """
+        ai_snakes = [snake for snake in nibbles.snakes if not snake.player_number]
+        if not ai_snakes:
+            return
+        if not self.distance_field:
+            self.distance_field = DistanceField(nibbles.board_width, nibbles.board_height)
+        update_data = Ai.build_update_data(nibbles.food, nibbles.collision_map, ai_snakes, self.distance_field)
+        if self.strategy_histograms:
+            futures = [self.pool.submit(self.timed_update_direction, snake, update_data) for snake in ai_snakes]
+        else:
+            futures = [self.pool.submit(snake.update_direction, update_data) for snake in ai_snakes]
+        for future in futures:
+            future.result()
+
+    def shutdown(self):
+        """
+        Releases the workers of the executor
+        """
+        self.pool.shutdown()
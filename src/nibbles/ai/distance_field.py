@@ -0,0 +1,58 @@
+from array import array
+from nibbles.ai.grid_a_star import GridAStar
+
+
+class DistanceField:
+    """
+    Represents the number of moves needed to reach a goal from every cell of the game board
+
+    The field is computed once with a breadth first search outwards from the goal, so any number of snakes can look up
+    their best move in constant time. Movement wraps around the edges of the board the same way the snakes do
+    """
+    UNREACHABLE = -1
+
+    def __init__(self, width, height):
+        """
+        :param width: The width of the game board
+        :param height: The height of the game board
+        """
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.neighbors = GridAStar.build_neighbor_table(width, height)
+        self.unreachable_distances = array('i', [self.UNREACHABLE]) * self.size
+        self.distances = array('i', self.unreachable_distances)
+        self.goal = None
+
+    def compute(self, counts, goal, target_groups=None):
+        """
+        Computes the distance from the goal to every cell that can reach it without passing through colliding objects
+
+        :param counts: The collision counts of the collision map
+        :param goal: The index of the cell to compute the distances to
+        :param target_groups: An optional list of cell index tuples, when given the search stops after the first layer
+                              in which every group contains a reached cell and further cells are left unreachable
+        """
+        unreachable = self.UNREACHABLE
+        neighbors = self.neighbors
+        distances = self.distances
+        distances[:] = self.unreachable_distances
+        distances[goal] = 0
+        self.goal = goal
+        pending_groups = list(target_groups) if target_groups is not None else None
+        frontier = [goal]
+        distance = 0
+        while frontier:
+            if pending_groups is not None:
+                pending_groups = [group for group in pending_groups
+                                  if all(distances[cell] == unreachable for cell in group)]
+                if not pending_groups:
+                    return
+            distance += 1
+            next_frontier = []
+            for cell in frontier:
+                for neighbor in neighbors[cell]:
+                    if distances[neighbor] == unreachable and not counts[neighbor]:
+                        distances[neighbor] = distance
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
@@ -0,0 +1,136 @@
+from array import array
+from heapq import heappush, heappop
+
+
+class GridAStar:
+    """
+    Represents an A* path finder specialized for the game board
+
+    Cells are addressed by their collision map index and movement wraps around the edges of the board the same way the
+    snakes do. The neighbor table and score buffers are allocated once and reused by every search, a cell's scores are
+    only valid when its mark matches the id of the current search. The heuristic is looked up in an array of goal
+    distances, which is either passed in (e.g. a DistanceField around the barriers) or the wrap-aware Manhattan
+    distances of the goal that are kept until the goal changes
+    """
+    NO_PARENT = -1
+
+    def __init__(self, width, height):
+        """
+        :param width: The width of the game board
+        :param height: The height of the game board
+        """
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.neighbors = GridAStar.build_neighbor_table(width, height)
+        self.g_scores = array('i', [0]) * self.size
+        self.came_from = array('i', [self.NO_PARENT]) * self.size
+        self.open_marks = array('I', [0]) * self.size
+        self.closed_marks = array('I', [0]) * self.size
+        self.search_id = 0
+        self.manhattan_goal = None
+        self.manhattan_distances = None
+
+    @staticmethod
+    def build_neighbor_table(width, height):
+        """
+        Calculates the indices of the four cells adjacent to every cell, wrapping around the edges of the board
+
+        :param width: The width of the game board
+        :param height: The height of the game board
+        :return: A list containing a tuple of the cells above, below, left of and right of each cell (the same order as
+                 Directions.DIRECTIONS)
+        """
+        neighbor_table = []
+        for row in range(height):
+            for column in range(width):
+                neighbor_table.append((column + (row + 1) % height * width,
+                                       column + (row - 1) % height * width,
+                                       (column - 1) % width + row * width,
+                                       (column + 1) % width + row * width))
+        return neighbor_table
+
+    def get_manhattan_distances(self, goal):
+        """
+        Returns the wrap-aware Manhattan distance between every cell and the goal, computed again only when the goal
+        changed since the last call
+
+        :param goal: The index of the goal
+        :return: An array of the distance of every cell to the goal
+        """
+        if goal != self.manhattan_goal:
+            width = self.width
+            height = self.height
+            goal_column = goal % width
+            goal_row = goal // width
+            # the distance is separable, so compute the wrapped distance of each column and row once
+            column_costs = [min(abs(column - goal_column), width - abs(column - goal_column))
+                            for column in range(width)]
+            row_costs = [min(abs(row - goal_row), height - abs(row - goal_row)) for row in range(height)]
+            self.manhattan_distances = array('i', [row_cost + column_cost for row_cost in row_costs
+                                                   for column_cost in column_costs])
+            self.manhattan_goal = goal
+        return self.manhattan_distances
+
+    def find_path(self, counts, start, goal, illegal_index=NO_PARENT, goal_distances=None):
+        """
+        Finds the shortest path between two cells that only passes through cells without colliding objects
+
+        :param counts: The collision counts of the collision map
+        :param start: The index of the cell to start from (may be occupied)
+        :param goal: The index of the cell to reach
+        :param illegal_index: The index of a cell that may not be entered (e.g. behind a snake's head)
+        :param goal_distances: An array of a lower bound of the number of moves from every cell to the goal that never
+                               drops by more than one between neighbors, negative for cells that can't reach the goal
+                               (None to use the wrap-aware Manhattan distance)
+        :return: A list of cell indices from start to goal or None if the goal can't be reached
+        """
+        if start == goal:
+            return [start]
+        size = self.size
+        neighbors = self.neighbors
+        g_scores = self.g_scores
+        came_from = self.came_from
+        open_marks = self.open_marks
+        closed_marks = self.closed_marks
+        self.search_id += 1
+        if self.search_id > 0xFFFFFFFF:
+            open_marks[:] = array('I', [0]) * size
+            closed_marks[:] = array('I', [0]) * size
+            self.search_id = 1
+        search_id = self.search_id
+        if goal_distances is None:
+            goal_distances = self.get_manhattan_distances(goal)
+
+        # heap entries are encoded as ints ordered by f score, then by the highest g score, then by index
+        g_scores[start] = 0
+        came_from[start] = self.NO_PARENT
+        open_marks[start] = search_id
+        open_set = [(max(goal_distances[start], 0) * size + size) * size + start]  # the start may be occupied
+        while open_set:
+            current = heappop(open_set) % size
+            if closed_marks[current] == search_id:
+                continue
+            if current == goal:
+                path = []
+                while current != self.NO_PARENT:
+                    path.append(current)
+                    current = came_from[current]
+                path.reverse()
+                return path
+            closed_marks[current] = search_id
+            tentative_g_score = g_scores[current] + 1
+            for neighbor in neighbors[current]:
+                if counts[neighbor] or neighbor == illegal_index or closed_marks[neighbor] == search_id:
+                    continue
+                estimate = goal_distances[neighbor]
+                if estimate < 0:
+                    continue
+                if open_marks[neighbor] == search_id and tentative_g_score >= g_scores[neighbor]:
+                    continue
+                open_marks[neighbor] = search_id
+                g_scores[neighbor] = tentative_g_score
+                came_from[neighbor] = current
+                f_score = tentative_g_score + estimate
+                heappush(open_set, (f_score * size + size - tentative_g_score) * size + neighbor)
+        return None
@@ -0,0 +1,72 @@
+import hashlib
+import os
+import pathlib
+import pygame
+
+
+class AssetManager:
+    """
+    Represents a cache of image assets that are loaded, scaled and converted to the display format once per size
+
+    When a cache directory is given the scaled pixels are also stored on disk, keyed by the content of the source image
+    and the scaled size, so later launches can skip decoding and scaling the source image
+    """
+    CACHE_FORMAT = 'RGB'
+
+    def __init__(self, resource_dir, cache_dir=None):
+        """
+        :param resource_dir: The directory that asset paths are relative to
+        :param cache_dir: The directory to store scaled assets in (None to only cache them in memory)
+        """
+        self.resource_dir = pathlib.Path(resource_dir)
+        self.cache_dir = pathlib.Path(cache_dir) if cache_dir else None
+        self.images = {}
+
+    def load_scaled_image(self, relative_path, size):
+        """
+        Returns an image scaled to the given size and converted to the display format
+
+        :param relative_path: The path of the image relative to the resource directory
+        :param size: A (width, height) tuple to scale the image to
+        :return: The scaled image
+        """
+        key = (relative_path, size)
+        image = self.images.get(key)
+        if image:
+            return image
+        source_path = self.resource_dir.joinpath(relative_path)
+        cache_path = self.get_cache_path(source_path, size) if self.cache_dir else None
+        if cache_path and cache_path.is_file():
+            image = pygame.image.frombytes(cache_path.read_bytes(), size, self.CACHE_FORMAT)
+        else:
+            image = pygame.transform.scale(pygame.image.load(str(source_path)), size)
+            if cache_path:
+                self.store_cached_image(image, cache_path)
+        image = image.convert()
+        self.images[key] = image
+        return image
+
+    def get_cache_path(self, source_path, size):
+        """
+        Returns the path that the scaled pixels of an image are cached at
+
+        :param source_path: The path of the source image
+        :param size: A (width, height) tuple that the image is scaled to
+        :return: The path of the cache file
+        """
+        source_hash = hashlib.sha1(source_path.read_bytes()).hexdigest()
+        file_name = '{0}_{1}x{2}_{3}.{4}'.format(source_path.stem.replace(' ', '_'), size[0], size[1], source_hash,
+                                                  self.CACHE_FORMAT.lower())
+        return self.cache_dir.joinpath('assets', file_name)
+
+    def store_cached_image(self, image, cache_path):
+        """
+        Stores the pixels of an image in the cache, replacing the file atomically so a partial file is never read
+
+        :param image: The image to store
+        :param cache_path: The path of the cache file
+        """
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_name(cache_path.name + '.tmp')
+        temp_path.write_bytes(pygame.image.tobytes(image, self.CACHE_FORMAT))
+        os.replace(temp_path, cache_path)
@@ -0,0 +1,4 @@
+from .benchmark import Benchmark
+from .benchmark_result import BenchmarkResult
+from .benchmark_history import BenchmarkHistory
+from .benchmark_suite import BenchmarkSuite
@@ -0,0 +1,68 @@
+import gc
+import time
+from nibbles.benchmark.benchmark_result import BenchmarkResult
+
+
+class Benchmark:
+    """
+    Represents a named piece of code whose call time is measured
+
+    The garbage collector is disabled while measuring like timeit does, so collections triggered by earlier benchmarks
+    don't end up in the timings of later ones
+    """
+    def __init__(self, name, run, prepare=None, number=10, warmup=2):
+        """
+        :param name: The name of the benchmark, used to compare it with earlier runs
+        :param run: The function to time, called without arguments
+        :param prepare: A function that is called before every call of run without being timed (None to skip)
+        :param number: The number of calls to time per repeat
+        :param warmup: The number of calls to make before timing, so caches and lazily built tables are filled
+        """
+        self.name = name
+        self.run = run
+        self.prepare = prepare
+        self.number = number
+        self.warmup = warmup
+
+    @property
+    def number(self):
+        return self._number
+
+    @number.setter
+    def number(self, number):
+        if not isinstance(number, int):
+            raise ValueError("number must be an integer")
+        if number < 1:
+            raise ValueError("number must be greater than 0")
+        self._number = number
+
+    def call(self):
+        """
+        Prepares and times one call of the benchmark
+
+        :return: The time the call took in seconds
+        """
+        if self.prepare:
+            self.prepare()
+        start_time = time.perf_counter()
+        self.run()
+        return time.perf_counter() - start_time
+
+    def measure(self, repeats=5):
+        """
+        Times the benchmark
+
+        :param repeats: The number of times to repeat the number of calls
+        :return: A BenchmarkResult with the time of every timed call
+        """
+        gc_was_enabled = gc.isenabled()
+        gc.collect()
+        gc.disable()
+        try:
+            for _ in range(self.warmup):
+                self.call()
+            samples = [self.call() for _ in range(repeats * self.number)]
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        return BenchmarkResult(self.name, samples)
@@ -0,0 +1,117 @@
+import json
+import os
+import platform
+import time
+
+
+class BenchmarkHistory:
+    """
+    Represents the JSON files that keep the results of every benchmark run and the baseline that runs are compared with
+
+    The history file holds a list of runs and the baseline file holds a single run, a run is a dictionary with the time
+    it was recorded, the machine it was recorded on and the results of every benchmark by name
+    """
+    def __init__(self, history_path, baseline_path):
+        """
+        :param history_path: The path of the JSON file to append runs to
+        :param baseline_path: The path of the JSON file holding the baseline run
+        """
+        self.history_path = history_path
+        self.baseline_path = baseline_path
+
+    @staticmethod
+    def create_run(results):
+        """
+        Creates a run from benchmark results
+
+        :param results: A list of BenchmarkResults
+        :return: A dictionary describing the run
+        """
+        return {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'machine': platform.platform(),
+            'results': {result.name: result.to_dict() for result in results}
+        }
+
+    @staticmethod
+    def read_json(path, default):
+        """
+        Reads a JSON file
+
+        :param path: The path of the file
+        :param default: The value to return when the file doesn't exist
+        :return: The decoded contents of the file
+        """
+        if not os.path.isfile(path):
+            return default
+        with open(path) as json_file:
+            return json.load(json_file)
+
+    @staticmethod
+    def write_json(path, value):
+        """
+        Writes a JSON file atomically so an interrupted run never leaves a truncated file behind
+
+        :param path: The path of the file
+        :param value: The value to encode
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temporary_path = path + '.tmp'
+        with open(temporary_path, 'w') as json_file:
+            json.dump(value, json_file, indent=2)
+        os.replace(temporary_path, path)
+
+    def load_runs(self):
+        """
+        Loads every run of the history
+
+        :return: A list of runs ordered from oldest to newest
+        """
+        return self.read_json(self.history_path, [])
+
+    def append_run(self, run):
+        """
+        Adds a run to the end of the history
+
+        :param run: The run to add
+        """
+        runs = self.load_runs()
+        runs.append(run)
+        self.write_json(self.history_path, runs)
+
+    def load_baseline(self):
+        """
+        Loads the baseline run
+
+        :return: The baseline run or None if no baseline was stored yet
+        """
+        return self.read_json(self.baseline_path, None)
+
+    def save_baseline(self, run):
+        """
+        Stores a run as the new baseline
+
+        :param run: The run to compare later runs with
+        """
+        self.write_json(self.baseline_path, run)
+
+    @staticmethod
+    def compare(run, baseline, tolerance=0.25):
+        """
+        Compares the median call times of a run with the baseline
+
+        :param run: The run to check
+        :param baseline: The baseline run
+        :param tolerance: The fraction a median may grow by before it counts as a regression
+        :return: A list of (name, baseline median, median, ratio, regressed) tuples for the benchmarks in both runs
+        """
+        comparisons = []
+        for name, result in run['results'].items():
+            baseline_result = baseline['results'].get(name)
+            if not baseline_result:
+                continue
+            ratio = result['median'] / baseline_result['median'] if baseline_result['median'] else 1.0
+            comparisons.append((name, baseline_result['median'], result['median'], ratio, ratio > 1 + tolerance))
+        return comparisons
@@ -0,0 +1,57 @@
+class BenchmarkResult:
+    """
+    Represents the timings of one benchmark, every sample is the time a single call took in seconds
+    """
+    def __init__(self, name, samples):
+        """
+        :param name: The name of the benchmark
+        :param samples: A list of the measured call times in seconds
+        """
+        self.name = name
+        self.samples = sorted(samples)
+
+    @property
+    def samples(self):
+        return self._samples
+
+    @samples.setter
+    def samples(self, samples):
+        if not samples:
+            raise ValueError("samples must contain at least one sample")
+        self._samples = samples
+
+    @property
+    def median(self):
+        return self.percentile(50)
+
+    @property
+    def minimum(self):
+        return self.samples[0]
+
+    @property
+    def mean(self):
+        return sum(self.samples) / len(self.samples)
+
+    def percentile(self, percentile):
+        """
+        Returns a percentile of the call times using the nearest rank
+
+        :param percentile: The percentile between 0 and 100
+        :return: The call time of the percentile in seconds
+        """
+        rank = max(1, -(-percentile * len(self.samples) // 100))
+        return self.samples[int(rank) - 1]
+
+    def to_dict(self):
+        """
+        Converts the result into a dictionary that can be serialized as JSON
+
+        :return: A dictionary of the statistics of the call times
+        """
+        return {
+            'samples': len(self.samples),
+            'min': self.minimum,
+            'median': self.median,
+            'mean': self.mean,
+            'p95': self.percentile(95)
+        }
@@ -0,0 +1,188 @@
+import os
+import pathlib
+from functools import partial
+from nibbles.nibbles import Nibbles
+from nibbles.ai.ai import Ai
+from nibbles.ai.ai_difficulty_levels import AiDifficultyLevel
+from nibbles.ai.ai_executors.inline_ai_executor import InlineAiExecutor
+from nibbles.level.level_parsers.level_parser_types import LevelParserTypes
+from nibbles.level.level_parsers.png_level_parser import PNGLevelParser
+from nibbles.benchmark.benchmark import Benchmark
+
+
+class BenchmarkSuite:
+    """
+    Represents the benchmarks of the game engine, the AI, the level parser and the renderer
+
+    Every game is seeded and every timed call starts from the same state, so two runs on the same machine measure the
+    same work
+    """
+    GROUPS = ('update', 'ai', 'parser', 'display')
+    BENCHMARK_COLORS = [(index * 30, 255 - index * 30, 128) for index in range(8)]
+    BENCHMARK_SEED = 1
+    BOARD_WIDTH = 80
+    BOARD_HEIGHT = 50
+    LEVEL_NUMBER = 0
+    SNAKE_COUNTS = (1, 2, 4, 8)
+    SNAKE_LENGTHS = (1, 32, 256)
+    UNLIMITED_LIVES = 2 ** 30
+    DISPLAY_SCALE = 15
+    REFRESH_RATE = 60
+
+    def __init__(self, groups=GROUPS, quick=False):
+        """
+        :param groups: The groups of benchmarks to run (see GROUPS)
+        :param quick: Whether to take fewer samples for a faster but noisier run
+        """
+        for group in groups:
+            if group not in self.GROUPS:
+                raise ValueError("invalid benchmark group '{0}'".format(group))
+        self.groups = groups
+        self.quick = quick
+
+    @staticmethod
+    def create_game(number_of_ai, ai_difficulty_level=AiDifficultyLevel.HARD):
+        """
+        Creates a seeded AI game on the benchmark level
+
+        :param number_of_ai: The number of AI snakes
+        :param ai_difficulty_level: The AiDifficultyLevel of the snakes
+        :return: The Nibbles instance with its level loaded
+        """
+        nibbles = Nibbles(BenchmarkSuite.BENCHMARK_COLORS, BenchmarkSuite.BOARD_WIDTH, BenchmarkSuite.BOARD_HEIGHT, 1.0,
+                          0, number_of_ai, ai_difficulty_level, LevelParserTypes.PNG_PARSER,
+                          BenchmarkSuite.LEVEL_NUMBER, True, seed=BenchmarkSuite.BENCHMARK_SEED, prefetch=False)
+        nibbles.initialize_level()
+        nibbles.paused = False
+        nibbles.publish_frame()
+        return nibbles
+
+    @staticmethod
+    def play_ticks(nibbles, ai_executor, ticks):
+        """
+        Plays ticks of an AI game
+
+        :param nibbles: The Nibbles instance to play
+        :param ai_executor: The AI executor that steers the snakes
+        :param ticks: The number of ticks to play
+        """
+        for _ in range(ticks):
+            if nibbles.stopped:
+                return
+            ai_executor.calculate_ai_directions(nibbles)
+            nibbles.update()
+            if nibbles.snake_reset_needed:
+                nibbles.reset_snakes()
+            nibbles.paused = False
+            nibbles.publish_frame()
+
+    def create_update_benchmarks(self):
+        """
+        Creates the benchmarks of Nibbles.update for different numbers of snakes and snake lengths
+
+        :return: A list of Benchmarks
+        """
+        benchmarks = []
+        for snake_count in self.SNAKE_COUNTS:
+            for snake_length in self.SNAKE_LENGTHS:
+                nibbles = self.create_game(snake_count, AiDifficultyLevel.EASY)
+                for snake in nibbles.snakes:
+                    snake.lives = self.UNLIMITED_LIVES  # keep every snake on the board with its full length
+                    for _ in range(snake_length - 1):
+                        nibbles.increase_snake_length(snake)
+                # let the AI unfold the bodies that were stacked on the tail, the snakes are never reset
+                ai_executor = InlineAiExecutor()
+                for _ in range(snake_length + 16):
+                    ai_executor.calculate_ai_directions(nibbles)
+                    nibbles.update()
+                snapshot = nibbles.create_snapshot()
+                benchmarks.append(Benchmark('update/{0}_snakes/length_{1}'.format(snake_count, snake_length),
+                                            nibbles.update, partial(nibbles.restore_snapshot, snapshot), number=20))
+        return benchmarks
+
+    def create_ai_benchmarks(self):
+        """
+        Creates the benchmarks of each AI strategy steering six snakes, plus the hard AI steering enough snakes to share
+        one distance field from the food
+
+        :return: A list of Benchmarks
+        """
+        benchmarks = []
+        games = [('ai/{0}'.format(ai_difficulty_level), 6, ai_difficulty_level)
+                 for ai_difficulty_level in AiDifficultyLevel]
+        games.append(('ai/hard_shared_field', Ai.SHARED_DISTANCE_FIELD_SNAKES, AiDifficultyLevel.HARD))
+        for name, number_of_ai, ai_difficulty_level in games:
+            nibbles = self.create_game(number_of_ai, ai_difficulty_level)
+            ai_executor = InlineAiExecutor()
+            self.play_ticks(nibbles, ai_executor, 64)
+            benchmarks.append(Benchmark(name, partial(ai_executor.calculate_ai_directions, nibbles), number=20))
+        return benchmarks
+
+    def create_parser_benchmarks(self):
+        """
+        Creates the benchmark of parsing every bundled level without the level cache
+
+        :return: A list of Benchmarks
+        """
+        level_dir = pathlib.Path(os.path.abspath(__file__)).parent.parent.joinpath('resources/levels')
+        level_parser = PNGLevelParser()
+        level_parser.set_data_source(self.BOARD_WIDTH, self.BOARD_HEIGHT, level_dir)
+        return [Benchmark('parser/png_parse_levels', level_parser.parse_levels, number=2, warmup=1)]
+
+    def prepare_frame(self, nibbles, ai_executor, display, incremental_rendering):
+        """
+        Plays the tick that the next benchmarked frame shows
+
+        :param nibbles: The Nibbles instance that is displayed
+        :param ai_executor: The AI executor that steers the snakes
+        :param display: The Display that draws the frame
+        :param incremental_rendering: Whether the frame should be drawn incrementally
+        """
+        display.incremental_rendering = incremental_rendering
+        self.play_ticks(nibbles, ai_executor, 1)
+
+    def create_display_benchmarks(self):
+        """
+        Creates the benchmarks of Display.draw_frame drawing full and incremental frames of a six snake game on SDL's
+        dummy video driver, so they run without a screen
+
+        :return: A list of Benchmarks
+        """
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        from nibbles.display import Display  # imported here so the other groups don't need pygame
+        nibbles = self.create_game(6)
+        ai_executor = InlineAiExecutor()
+        self.play_ticks(nibbles, ai_executor, 64)
+        display = Display(nibbles, self.DISPLAY_SCALE, self.REFRESH_RATE)
+        # the first incremental frame after a full one redraws everything, the warmup calls absorb it
+        return [Benchmark('display/{0}_frame'.format('incremental' if incremental_rendering else 'full'),
+                          display.draw_frame, partial(self.prepare_frame, nibbles, ai_executor, display,
+                                                      incremental_rendering), number=20)
+                for incremental_rendering in (False, True)]
+
+    def create_benchmarks(self):
+        """
+        Creates the benchmarks of the selected groups
+
+        :return: A list of Benchmarks
+        """
+        benchmarks = []
+        for group in self.groups:
+            benchmarks.extend(getattr(self, 'create_{0}_benchmarks'.format(group))())
+        return benchmarks
+
+    def run(self, on_result=None):
+        """
+        Measures the benchmarks of the selected groups
+
+        :param on_result: A function that is called with each BenchmarkResult as soon as it is available
+        :return: A list of BenchmarkResults
+        """
+        repeats = 1 if self.quick else 5
+        results = []
+        for benchmark in self.create_benchmarks():
+            result = benchmark.measure(repeats)
+            results.append(result)
+            if on_result:
+                on_result(result)
+        return results
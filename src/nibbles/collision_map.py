@@ -0,0 +1,195 @@
+from array import array
+from itertools import count
+from nibbles.free_cell_index import FreeCellIndex
+
+
+class CollisionMap:
+    """
+    Represents a flat occupancy grid of the game board
+
+    Each cell is addressed by its index (column + row * width) and stores the types of the objects inside of it, the
+    owner of the last snake body chunk placed inside of it and the number of objects inside of it that a snake collides
+    with (barriers and snake body chunks). The body chunks of every owner are counted per cell, so when the owner leaves
+    a cell that other snakes are still inside of, the cell is handed to one of them. Cells registered with
+    track_free_cells are kept in a FreeCellIndex while they are empty. Every change of the barriers gives the collision
+    map a new barrier version, the versions are drawn from a counter shared by every collision map of the process, so a
+    version identifies one layout of barriers
+    """
+    CELL_EMPTY = 0
+    CELL_FOOD = 1
+    CELL_BARRIER = 2
+    CELL_SNAKE = 4
+
+    NO_OWNER = 0
+    OWNER_SLOTS = 9  # NO_OWNER and the ids of the 8 snakes a level has spawns for
+
+    barrier_versions = count(1)
+
+    def __init__(self, width, height):
+        """
+        :param width: The width of the game board
+        :param height: The height of the game board
+        """
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.cell_types = bytearray(self.size)
+        self.owners = bytearray(self.size)
+        self.counts = array('H', bytes(2 * self.size))
+        self.owner_counts = array('H', bytes(2 * self.size * self.OWNER_SLOTS))
+        self.free_cells = FreeCellIndex(self.size)
+        self.barrier_version = next(self.barrier_versions)
+
+    def index(self, column, row):
+        """
+        Returns the cell index of the given column and row
+
+        :param column: The column of the cell
+        :param row: The row of the cell
+        :return: The cell index of the given column and row
+        """
+        return column + row * self.width
+
+    def position(self, index):
+        """
+        Returns the column and row of the given cell index
+
+        :param index: The index of the cell
+        :return: A (column, row) tuple
+        """
+        return index % self.width, index // self.width
+
+    def coordinate_index(self, coordinate):
+        """
+        Returns the cell index of the given coordinate
+
+        :param coordinate: The coordinate to get the cell index of
+        :return: The cell index of the given coordinate
+        """
+        return coordinate.column + coordinate.row * self.width
+
+    def place(self, coordinate, owner=NO_OWNER):
+        """
+        Places a coordinate into the collision map
+
+        :param coordinate: The coordinate to place into the collision map
+        :param owner: The id of the snake that owns the coordinate (only used for snake body chunks)
+        """
+        self.place_index(coordinate.column + coordinate.row * self.width, coordinate.CELL_TYPE, owner)
+
+    def place_index(self, index, cell_type, owner=NO_OWNER):
+        """
+        Places an object into a cell of the collision map
+
+        :param index: The index of the cell
+        :param cell_type: The cell type of the object
+        :param owner: The id of the snake that owns the object (only used for snake body chunks)
+        """
+        if self.cell_types[index] == self.CELL_EMPTY:
+            self.free_cells.discard(index)
+        self.cell_types[index] |= cell_type
+        if cell_type != self.CELL_FOOD:
+            self.counts[index] += 1
+            if cell_type == self.CELL_SNAKE:
+                self.owners[index] = owner
+                self.owner_counts[index * self.OWNER_SLOTS + owner] += 1
+            elif cell_type == self.CELL_BARRIER:
+                self.barrier_version = next(self.barrier_versions)
+
+    def remove(self, coordinate, owner=NO_OWNER):
+        """
+        Removes a coordinate from the collision map
+
+        :param coordinate: The coordinate to remove from the collision map
+        :param owner: The id of the snake that owns the coordinate (only used for snake body chunks)
+        """
+        self.remove_index(coordinate.column + coordinate.row * self.width, coordinate.CELL_TYPE, owner)
+
+    def remove_index(self, index, cell_type, owner=NO_OWNER):
+        """
+        Removes an object from a cell of the collision map
+
+        :param index: The index of the cell
+        :param cell_type: The cell type of the object
+        :param owner: The id of the snake that owns the object (only used for snake body chunks)
+        """
+        if cell_type == self.CELL_SNAKE:
+            count = self.counts[index] - 1
+            self.counts[index] = count
+            slot = index * self.OWNER_SLOTS
+            self.owner_counts[slot + owner] -= 1
+            if count == 0 or (count == 1 and self.cell_types[index] & self.CELL_BARRIER):
+                self.cell_types[index] &= ~self.CELL_SNAKE
+                self.owners[index] = self.NO_OWNER
+            elif self.owners[index] == owner and not self.owner_counts[slot + owner]:
+                # the owner left, hand the cell to one of the snakes still inside of it
+                self.owners[index] = next((other for other in range(1, self.OWNER_SLOTS)
+                                           if self.owner_counts[slot + other]), self.NO_OWNER)
+        else:
+            self.cell_types[index] &= ~cell_type
+            if cell_type != self.CELL_FOOD:
+                self.counts[index] -= 1
+                if cell_type == self.CELL_BARRIER:
+                    self.barrier_version = next(self.barrier_versions)
+        if self.cell_types[index] == self.CELL_EMPTY:
+            self.free_cells.add(index)
+
+    def track_free_cells(self, coordinates):
+        """
+        Starts keeping the given cells in the free cell index whenever they are empty
+
+        :param coordinates: The coordinates of the cells to track
+        """
+        for coordinate in coordinates:
+            index = coordinate.column + coordinate.row * self.width
+            self.free_cells.track(index, self.cell_types[index] == self.CELL_EMPTY)
+
+    def is_empty(self, column, row):
+        """
+        Checks if a cell doesn't contain any objects
+
+        :param column: The column of the cell
+        :param row: The row of the cell
+        :return: True if the cell doesn't contain any objects otherwise false
+        """
+        return self.cell_types[column + row * self.width] == self.CELL_EMPTY
+
+    def is_blocked(self, column, row):
+        """
+        Checks if a cell contains an object that a snake collides with
+
+        :param column: The column of the cell
+        :param row: The row of the cell
+        :return: True if the cell contains a barrier or a snake body chunk otherwise false
+        """
+        return self.counts[column + row * self.width] > 0
+
+    def has_food(self, column, row):
+        """
+        Checks if a cell contains a food item
+
+        :param column: The column of the cell
+        :param row: The row of the cell
+        :return: True if the cell contains a food item otherwise false
+        """
+        return bool(self.cell_types[column + row * self.width] & self.CELL_FOOD)
+
+    def count(self, column, row):
+        """
+        Returns the number of objects inside of a cell that a snake collides with
+
+        :param column: The column of the cell
+        :param row: The row of the cell
+        :return: The number of barriers and snake body chunks inside of the cell
+        """
+        return self.counts[column + row * self.width]
+
+    def owner(self, column, row):
+        """
+        Returns the id of the snake that last placed a body chunk inside of a cell that is still inside of it
+
+        :param column: The column of the cell
+        :param row: The row of the cell
+        :return: The id of the owning snake or NO_OWNER if the cell doesn't contain a snake body chunk
+        """
+        return self.owners[column + row * self.width]
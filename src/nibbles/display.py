@@ -1,8 +1,11 @@
 import math
+import time
 import pygame
 import os
 import pathlib
 from pygame.color import THECOLORS
+from nibbles.text_renderer import TextRenderer
+from nibbles.asset_manager import AssetManager
 
 
 class Display:
@@ -11,24 +14,41 @@ class Display:
     """
     STATS_BAR_HEIGHT = 2
 
-    def __init__(self, nibbles, display_scale, refresh_rate):
+    def __init__(self, nibbles, display_scale, refresh_rate, incremental_rendering=True, cache_dir=None,
+                 interpolation=False):
         """
         Initializes the pygame window
 
         :param: nibbles: The game instance to display
         :param: display_scale: The multiplier to apply to the game board resolution to obtain the display resolution
         :param: refresh_rate: How many times a second the display should be updated
+        :param: incremental_rendering: Whether to only redraw the parts of the screen that changed while playing
+        :param: cache_dir: The directory to cache scaled assets in (None to only cache them in memory)
+        :param: interpolation: Whether to slide the heads and tails of the snakes between ticks, every frame is then
+                               redrawn completely
         """
         self.use_alternate_border_animation = False
+        self.incremental_rendering = incremental_rendering
+        self.interpolation = interpolation
+        self.full_redraw_needed = True
+        self.drawn_level = None
+        self.static_layer = None
+        self.static_layer_key = None
+        self.drawn_cells = {}  # cell index -> color of the snake drawn there by the last incremental frame
+        self.drawn_food_state = None
+        self.drawn_food_rect = None
+        self.drawn_stats = None
+        self.drawn_stats_rect = None
+        self.profiler = None  # set to an enabled Profiler to show its timing overlay in the stats bar
+        self.frame = None  # the FrameSnapshot being drawn, taken from the game once at the start of every frame
+        self.text_renderer = TextRenderer()
+        display_file_path = pathlib.Path(os.path.abspath(__file__)).parent
+        display_file_path.resolve()
+        self.asset_manager = AssetManager(display_file_path.joinpath('resources'), cache_dir)
         self.nibbles = nibbles
-        self.display_scale = display_scale
         self.refresh_rate = refresh_rate
-        self.display_width = self.nibbles.board_width * self.display_scale
-        self.display_height = (self.nibbles.board_height + self.STATS_BAR_HEIGHT) * self.display_scale
-        self.pixel_size = self.calculate_game_coordinate_size()
         pygame.init()
-        self.display = pygame.display.set_mode((self.display_width, self.display_height), 0, 32)
-        self.display.fill(THECOLORS['black'])
+        self.resize(display_scale)
 
     @property
     def refresh_rate(self):
@@ -54,6 +74,20 @@ class Display:
             raise ValueError("display scale must greater than 0")
         self._display_scale = display_scale
 
+    def resize(self, display_scale):
+        """
+        Changes the display scale and resizes the window to match, the whole screen is drawn again on the next frame
+
+        :param display_scale: The multiplier to apply to the game board resolution to obtain the display resolution
+        """
+        self.display_scale = display_scale
+        self.display_width = self.nibbles.board_width * self.display_scale
+        self.display_height = (self.nibbles.board_height + self.STATS_BAR_HEIGHT) * self.display_scale
+        self.pixel_size = self.calculate_game_coordinate_size()
+        self.display = pygame.display.set_mode((self.display_width, self.display_height), 0, 32)
+        self.display.fill(THECOLORS['black'])
+        self.full_redraw_needed = True
+
     def calculate_game_coordinate_size(self):
         """
         Calculates the size in pixels that each game coordinate should be
@@ -68,22 +102,178 @@ class Display:
     def draw_frame(self):
         """
         The main loop that draws the game state to the screen
+
+        Only the frame snapshot that the game published last is drawn, it is read once so the whole frame shows the
+        same tick even when the game thread publishes a new one in the meantime
         """
-        self.draw_play_area()
-        if self.nibbles.loaded_level:
-            self.draw_barriers()
+        self.frame = self.nibbles.frame
+        if self.incremental_rendering and not self.interpolation and self.frame and not self.frame.paused:
+            self.draw_changes()
+            return
+        self.full_redraw_needed = True  # overlays are drawn on top of the board, clear them once the game resumes
+        if self.frame:
+            self.draw_static_layer()
             self.draw_snakes()
             self.draw_food()
             self.draw_game_stats()
-        if self.nibbles.paused:
-            if self.nibbles.intro:
-                self.draw_intro_screen()
-            elif len(self.nibbles.killed_snakes) == 0:
+        else:
+            self.draw_play_area()
+        if self.nibbles.intro:
+            self.draw_intro_screen()
+        elif self.frame and self.frame.paused:
+            if len(self.frame.killed_player_numbers) == 0:
                 self.draw_game_paused()
             else:
                 self.draw_snake_death()
         pygame.display.update()
 
+    def draw_changes(self):
+        """
+        Redraws only the cells, food and stats that changed since the last frame and updates just those parts of the
+        screen
+        """
+        snake_cells = self.collect_snake_cells()
+        food_state = self.frame.food
+        stats = self.collect_game_stats()
+        dirty_rects = []
+        if self.full_redraw_needed or self.drawn_level is not self.frame.level:
+            self.full_redraw_needed = False
+            self.drawn_level = self.frame.level
+            self.draw_static_layer()
+            self.drawn_cells = {}
+            self.drawn_food_state = None
+            self.drawn_food_rect = None
+            self.drawn_stats = None
+            self.drawn_stats_rect = None
+            dirty_rects.append(self.display.get_rect())
+
+        changed_cells = {index for index, color in self.drawn_cells.items() if snake_cells.get(index) != color}
+        changed_cells.update(index for index, color in snake_cells.items() if self.drawn_cells.get(index) != color)
+        # the food number and the stats text can be bigger than the cells they are drawn over, so when either of them
+        # or the cells underneath them change, restore those cells and draw both of them again on top
+        overlay_rects = [rect for rect in (self.drawn_food_rect, self.drawn_stats_rect) if rect]
+        redraw_overlays = (food_state != self.drawn_food_state or stats != self.drawn_stats
+                           or any(self.rect_contains_cells(rect, changed_cells) for rect in overlay_rects))
+        if redraw_overlays:
+            for rect in overlay_rects:
+                changed_cells.update(self.cells_in_rect(rect))
+        for index in changed_cells:
+            dirty_rects.append(self.draw_cell(index, snake_cells.get(index)))
+        self.drawn_cells = snake_cells
+
+        if redraw_overlays:
+            self.display.fill(THECOLORS['black'], (0, 0, self.display_width, self.pixel_size * self.STATS_BAR_HEIGHT))
+            self.drawn_food_state = food_state
+            self.drawn_food_rect = self.draw_food()
+            self.drawn_stats = stats
+            self.drawn_stats_rect = self.draw_game_stats()
+            dirty_rects.extend(overlay_rects)
+            dirty_rects.extend(rect for rect in (self.drawn_food_rect, self.drawn_stats_rect) if rect)
+        pygame.display.update(dirty_rects)
+
+    def collect_snake_cells(self):
+        """
+        Collects the color of every cell that contains a snake, later snakes are drawn over earlier ones
+
+        :return: A dictionary of cell index to snake color
+        """
+        snake_cells = {}
+        for color, _, _, _, cells in self.frame.snakes:
+            for index in cells:
+                snake_cells[index] = color
+        return snake_cells
+
+    def collect_game_stats(self):
+        """
+        Collects the values shown in the stats bar
+
+        :return: A tuple of the player number, score, lives and color of each player controlled snake followed by the
+                 lines of the timing overlay
+        """
+        return tuple((player_number, score, lives, color)
+                     for color, player_number, score, lives, _ in self.frame.snakes if player_number) + \
+            self.get_overlay_lines()
+
+    def get_overlay_lines(self):
+        """
+        Returns the lines of the timing overlay
+
+        :return: A tuple of lines of text (empty when there is no enabled profiler)
+        """
+        if self.profiler and self.profiler.enabled:
+            return self.profiler.get_overlay_lines()
+        return ()
+
+    def cell_rect(self, index):
+        """
+        Returns the screen rectangle of a cell
+
+        :param index: The index of the cell
+        :return: The screen rectangle of the cell
+        """
+        column = index % self.nibbles.board_width
+        row = index // self.nibbles.board_width
+        return pygame.Rect(column * self.pixel_size, self.display_height - ((row + 1) * self.pixel_size),
+                           self.pixel_size, self.pixel_size)
+
+    def cells_in_rect(self, rect):
+        """
+        Returns the indices of the cells that overlap a screen rectangle
+
+        :param rect: The screen rectangle
+        :return: A list of the indices of the cells that overlap the rectangle
+        """
+        board_width = self.nibbles.board_width
+        board_height = self.nibbles.board_height
+        first_column = max(int(rect.left // self.pixel_size), 0)
+        last_column = min(int((rect.right - 1) // self.pixel_size), board_width - 1)
+        first_row = max(int((self.display_height - rect.bottom) // self.pixel_size), 0)
+        last_row = min(int((self.display_height - rect.top - 1) // self.pixel_size), board_height - 1)
+        return [column + row * board_width
+                for row in range(first_row, last_row + 1) for column in range(first_column, last_column + 1)]
+
+    def rect_contains_cells(self, rect, cells):
+        """
+        Checks if any of the given cells overlap a screen rectangle
+
+        :param rect: The screen rectangle
+        :param cells: A set of cell indices
+        :return: True if any of the cells overlap the rectangle otherwise false
+        """
+        return any(index in cells for index in self.cells_in_rect(rect))
+
+    def draw_cell(self, index, snake_color):
+        """
+        Draws a single cell of the play area
+
+        :param index: The index of the cell
+        :param snake_color: The color of the snake inside of the cell or None if the cell doesn't contain a snake
+        :return: The screen rectangle of the cell
+        """
+        rect = self.cell_rect(index)
+        if snake_color:
+            pygame.draw.rect(self.display, snake_color, rect)
+        else:
+            self.display.blit(self.get_static_layer(), rect, rect)
+        return rect
+
+    def draw_text(self, text, font_size, center, color=THECOLORS['white'], background=THECOLORS['black']):
+        """
+        Draws text centered on the given position using the cached text renderer
+
+        :param text: The text to draw
+        :param font_size: The size of the font to draw the text with
+        :param center: The screen position to center the text on
+        :param color: The color of the text
+        :param background: The background color of the text (None for a transparent background)
+        :return: The screen rectangle that the text was drawn into
+        """
+        rendered_text = self.text_renderer.render(text, font_size, color, background)
+        text_rect = rendered_text.get_rect()
+        text_rect.center = center
+        self.display.blit(rendered_text, text_rect)
+        return text_rect
+
     def draw_play_area(self):
         """
         Draws the play area and edge barriers for the given game
@@ -97,81 +287,145 @@ class Display:
     def draw_game_stats(self):
         """
         Draws the stats of the given game to the top portion of the game window
+
+        :return: The screen rectangle of the stats bar including any text that was drawn past it
         """
-        text = ""
         if self.STATS_BAR_HEIGHT <= 0:
-            return
+            return None
+        stats_rect = pygame.Rect(0, 0, self.display_width, self.pixel_size * self.STATS_BAR_HEIGHT)
         font_size = math.floor(self.STATS_BAR_HEIGHT / self.nibbles.board_height * self.display_height)
-        font = pygame.font.Font('freesansbold.ttf', font_size)
         stat_format_text = 'Player {0} Score: {1} Lives: {2}'
-        for snake in self.nibbles.snakes:
-            if snake.player_number:
-                text_to_display = stat_format_text.format(snake.player_number, snake.score, snake.lives, snake.color)
-                text = font.render(text_to_display, True, snake.color, THECOLORS['black'])
-                text_rect = text.get_rect()
+        for color, player_number, score, lives, _ in self.frame.snakes:
+            if player_number:
+                text_to_display = stat_format_text.format(player_number, score, lives)
                 x_segment_length = self.display_width // 5
-                x = x_segment_length * (snake.player_number + (snake.player_number - 1) * 2)
-                text_rect.center = (x, font_size // 2)
-                self.display.blit(text, text_rect)
+                x = x_segment_length * (player_number + (player_number - 1) * 2)
+                stats_rect.union_ip(self.draw_text(text_to_display, font_size, (x, font_size // 2), color))
+        overlay_lines = self.get_overlay_lines()
+        overlay_font_size = max(stats_rect.height // max(len(overlay_lines), 1) - 2, 1)
+        for line_number, line in enumerate(overlay_lines):
+            center = (self.display_width // 2, overlay_font_size // 2 + line_number * (overlay_font_size + 2))
+            stats_rect.union_ip(self.draw_text(line, overlay_font_size, center, THECOLORS['gray']))
+        return stats_rect
+
+    def get_static_layer(self):
+        """
+        Returns the play area and barriers of the loaded level rendered into a surface, the surface is rendered again
+        when the level or the display scale changes. The cached text is dropped at the same time, it was rendered for
+        the stats of the previous level or at the font sizes of the previous display scale
 
-    def draw_barriers(self):
+        :return: A surface the size of the display containing the parts of the level that never move
+        """
+        static_layer_key = (self.frame.level, self.display_scale)
+        if self.static_layer_key != static_layer_key:
+            self.static_layer = self.render_static_layer()
+            self.static_layer_key = static_layer_key
+            self.text_renderer.clear()
+        return self.static_layer
+
+    def render_static_layer(self):
         """
-        Draws the level barriers of the given game
+        Renders the play area and the barriers of the loaded level into a new surface
+
+        :return: A surface the size of the display containing the parts of the level that never move
         """
-        for barrier in self.nibbles.loaded_level.barriers:
-            pygame.draw.rect(self.display, THECOLORS['coral'],
+        static_layer = pygame.Surface((self.display_width, self.display_height)).convert()
+        static_layer.fill(THECOLORS['black'])
+        pygame.draw.rect(static_layer, THECOLORS['blue'], (0,
+                                                           self.pixel_size * self.STATS_BAR_HEIGHT,
+                                                           self.display_width,
+                                                           self.display_height))
+        for barrier in self.frame.level.barriers:
+            pygame.draw.rect(static_layer, THECOLORS['coral'],
                              (barrier.column * self.pixel_size,
                               self.display_height - ((barrier.row + 1) * self.pixel_size),
                               self.pixel_size,
                               self.pixel_size))
+        return static_layer
+
+    def draw_static_layer(self):
+        """
+        Draws the play area and the level barriers of the given game
+        """
+        self.display.blit(self.get_static_layer(), (0, 0))
 
     def draw_snakes(self):
         """
         Draws the snakes for the given game
         """
-        for snake in self.nibbles.snakes:
-            for coordinate in snake.body:
-                pygame.draw.rect(self.display, snake.color,
-                                 (coordinate.column * self.pixel_size,
-                                  self.display_height - ((coordinate.row + 1) * self.pixel_size),
-                                  self.pixel_size,
-                                  self.pixel_size))
+        progress = self.frame.interpolation_progress(time.perf_counter()) if self.interpolation else 1.0
+        # snake colors are unique, so they identify the snakes of the previous frame snapshot
+        previous_bodies = {color: cells for color, _, _, _, cells in self.frame.previous_snakes} \
+            if progress < 1.0 else {}
+        for color, _, _, _, cells in self.frame.snakes:
+            previous_cells = previous_bodies.get(color)
+            if not previous_cells or not self.are_neighbors(previous_cells[0], cells[0]):
+                for index in cells:
+                    pygame.draw.rect(self.display, color, self.cell_rect(index))
+                continue
+            # the head slides out of the cell it was in and the tail slides out of the cell it left
+            for index in cells[1:]:
+                pygame.draw.rect(self.display, color, self.cell_rect(index))
+            pygame.draw.rect(self.display, color, self.interpolate_rect(previous_cells[0], cells[0], progress))
+            if len(previous_cells) > 1 and previous_cells[-1] not in cells:
+                pygame.draw.rect(self.display, color,
+                                 self.interpolate_rect(previous_cells[-1], previous_cells[-2], progress))
+
+    def are_neighbors(self, index, other_index):
+        """
+        Checks if two cells are next to each other on the screen, cells on opposite edges of the board are not
+
+        :param index: The index of a cell
+        :param other_index: The index of the other cell
+        :return: True if the cells share an edge otherwise false
+        """
+        board_width = self.nibbles.board_width
+        column_distance = abs(index % board_width - other_index % board_width)
+        row_distance = abs(index // board_width - other_index // board_width)
+        return column_distance + row_distance == 1
+
+    def interpolate_rect(self, index, other_index, progress):
+        """
+        Returns the screen rectangle of a cell moved part of the way towards another cell
+
+        :param index: The index of the cell to start from
+        :param other_index: The index of the cell to move towards
+        :param progress: How far to move between 0 and 1
+        :return: The screen rectangle in between the two cells
+        """
+        rect = self.cell_rect(index)
+        other_rect = self.cell_rect(other_index)
+        return rect.move(round((other_rect.x - rect.x) * progress), round((other_rect.y - rect.y) * progress))
 
     def draw_food(self):
         """
         Draws the food as a number indicating its value for the given game
+
+        :return: The screen rectangle that the food was drawn into or None if there is no food
         """
-        color = THECOLORS['yellow']
-        font = pygame.font.Font('freesansbold.ttf', 18)
-        text = font.render(str(self.nibbles.food.points), True, color)
-        text_rect = text.get_rect()
-        text_rect.center = (self.nibbles.food.column * self.pixel_size + self.pixel_size // 2,
-                            self.display_height - (self.nibbles.food.row + 1) * self.pixel_size + self.pixel_size // 2)
-        self.display.blit(text, text_rect)
+        if not self.frame.food:
+            return None  # the board is full
+        column, row, points = self.frame.food
+        return self.draw_text(str(points), 18,
+                              (column * self.pixel_size + self.pixel_size // 2,
+                               self.display_height - (row + 1) * self.pixel_size + self.pixel_size // 2),
+                              THECOLORS['yellow'], None)
 
     def draw_game_paused(self):
         """
         Draws a notification at the center of the screen saying that the game is paused
         """
         font_size = math.floor(self.STATS_BAR_HEIGHT / self.nibbles.board_height * self.display_height)
-        font = pygame.font.Font('freesansbold.ttf', font_size)
-        text = font.render('Game Paused', True, THECOLORS['white'], THECOLORS['black'])
-        text_rect = text.get_rect()
-        text_rect.center = (self.display_width // 2, self.display_height // 2)
-        self.display.blit(text, text_rect)
+        self.draw_text('Game Paused', font_size, (self.display_width // 2, self.display_height // 2))
 
     def draw_snake_death(self):
         """
         Draws a notification at the center of the screen saying that the game is paused
         """
         font_size = math.floor(self.STATS_BAR_HEIGHT / self.nibbles.board_height * self.display_height)
-        font = pygame.font.Font('freesansbold.ttf', font_size)
-        dead_snake = self.nibbles.killed_snakes[0]
-        text = 'Bot Died' if not dead_snake.player_number else 'Player {} Died'.format(dead_snake.player_number)
-        rendered_text = font.render(text, True, THECOLORS['white'], THECOLORS['black'])
-        text_rect = rendered_text.get_rect()
-        text_rect.center = (self.display_width // 2, self.display_height // 2)
-        self.display.blit(rendered_text, text_rect)
+        player_number = self.frame.killed_player_numbers[0]
+        text = 'Bot Died' if not player_number else 'Player {} Died'.format(player_number)
+        self.draw_text(text, font_size, (self.display_width // 2, self.display_height // 2))
 
     def draw_intro_screen(self):
         """
@@ -197,98 +451,36 @@ class Display:
         intro_diff_4 = "9 = Twiddle Fingers"
         intro_diff_5 = "Computer speed may affect your skill level"
 
-        display_file_path = pathlib.Path(os.path.abspath(__file__)).parent
-        display_file_path.resolve()
-        intro_resource_dir = display_file_path.joinpath('resources/intro')
-
-        background_1_path = intro_resource_dir.joinpath('border animation 1.png')
-        background_2_path = intro_resource_dir.joinpath('border animation 2.png')
         scaled_size = (80 * self.display_scale, 50 * self.display_scale)
-        background_animation_1 = pygame.transform.scale(pygame.image.load(str(background_1_path)), scaled_size)
-        background_animation_2 = pygame.transform.scale(pygame.image.load(str(background_2_path)), scaled_size)
+        if self.use_alternate_border_animation:
+            background_animation = self.asset_manager.load_scaled_image('intro/border animation 1.png', scaled_size)
+        else:
+            background_animation = self.asset_manager.load_scaled_image('intro/border animation 2.png', scaled_size)
 
         self.display.fill(THECOLORS['black'])
 
-        if self.use_alternate_border_animation:
-            image_rect = background_animation_1.get_rect()
-            image_rect = image_rect.move(0, (self.STATS_BAR_HEIGHT * self.display_scale))
-            self.display.blit(background_animation_1, image_rect)
-        else:
-            image_rect = background_animation_2.get_rect()
-            image_rect = image_rect.move(0, (self.STATS_BAR_HEIGHT * self.display_scale))
-            self.display.blit(background_animation_2, image_rect)
+        image_rect = background_animation.get_rect()
+        image_rect = image_rect.move(0, (self.STATS_BAR_HEIGHT * self.display_scale))
+        self.display.blit(background_animation, image_rect)
 
         if self.nibbles.intro_1:
-            font = pygame.font.Font('freesansbold.ttf', 50)
-            title = font.render(intro_title, True, THECOLORS['white'], THECOLORS['black'])
-            title_rect = title.get_rect()
-            title_rect.center = (self.display_width // 2, 110)
-            self.display.blit(title, title_rect)
-
-            font = pygame.font.Font('freesansbold.ttf', 30)
-            text_1 = font.render(intro_text_1, True, THECOLORS['white'], THECOLORS['black'])
-            text_rect_1 = text_1.get_rect()
-            text_rect_1.center = (self.display_width // 2, 276)
-            self.display.blit(text_1, text_rect_1)
-
-            text_2 = font.render(intro_text_2, True, THECOLORS['white'], THECOLORS['black'])
-            text_rect_2 = text_2.get_rect()
-            text_rect_2.center = (self.display_width // 2, 316)
-            self.display.blit(text_2, text_rect_2)
-
-            text_3 = font.render(intro_text_3, True, THECOLORS['white'], THECOLORS['black'])
-            text_rect_3 = text_3.get_rect()
-            text_rect_3.center = (self.display_width // 2, 356)
-            self.display.blit(text_3, text_rect_3)
-
-            continue_text = font.render(intro_continue_text, True, THECOLORS['white'], THECOLORS['black'])
-            continue_text_rect = continue_text.get_rect()
-            continue_text_rect.center = (self.display_width // 2, 700)
-            self.display.blit(continue_text, continue_text_rect)
+            self.draw_text(intro_title, 50, (self.display_width // 2, 110))
+            self.draw_text(intro_text_1, 30, (self.display_width // 2, 276))
+            self.draw_text(intro_text_2, 30, (self.display_width // 2, 316))
+            self.draw_text(intro_text_3, 30, (self.display_width // 2, 356))
+            self.draw_text(intro_continue_text, 30, (self.display_width // 2, 700))
 
         if self.nibbles.intro_2_players or self.nibbles.intro_2_ai or self.nibbles.intro_2_difficulty:
-            font = pygame.font.Font('freesansbold.ttf', 30)
-            text = font.render(intro_players, True, THECOLORS['white'], THECOLORS['black'])
-            text_rect = text.get_rect()
-            text_rect.center = (self.display_width // 2, 200)
-            self.display.blit(text, text_rect)
+            self.draw_text(intro_players, 30, (self.display_width // 2, 200))
 
         if self.nibbles.intro_2_ai or self.nibbles.intro_2_difficulty:
-            font = pygame.font.Font('freesansbold.ttf', 30)
-            text = font.render(intro_ai, True, THECOLORS['white'], THECOLORS['black'])
-            text_rect = text.get_rect()
-            text_rect.center = (self.display_width // 2, 240)
-            self.display.blit(text, text_rect)
+            self.draw_text(intro_ai, 30, (self.display_width // 2, 240))
 
         if self.nibbles.intro_2_difficulty:
-            font = pygame.font.Font('freesansbold.ttf', 30)
-            text = font.render(intro_diff_1, True, THECOLORS['white'], THECOLORS['black'])
-            text_rect = text.get_rect()
-            text_rect.center = (self.display_width // 2, 300)
-            self.display.blit(text, text_rect)
-
-            font = pygame.font.Font('freesansbold.ttf', 30)
-            text = font.render(intro_diff_2, True, THECOLORS['white'], THECOLORS['black'])
-            text_rect = text.get_rect()
-            text_rect.center = (self.display_width // 2, 340)
-            self.display.blit(text, text_rect)
-
-            font = pygame.font.Font('freesansbold.ttf', 30)
-            text = font.render(intro_diff_3, True, THECOLORS['white'], THECOLORS['black'])
-            text_rect = text.get_rect()
-            text_rect.center = (self.display_width // 2, 380)
-            self.display.blit(text, text_rect)
-
-            font = pygame.font.Font('freesansbold.ttf', 30)
-            text = font.render(intro_diff_4, True, THECOLORS['white'], THECOLORS['black'])
-            text_rect = text.get_rect()
-            text_rect.center = (self.display_width // 2, 420)
-            self.display.blit(text, text_rect)
-
-            font = pygame.font.Font('freesansbold.ttf', 30)
-            text = font.render(intro_diff_5, True, THECOLORS['white'], THECOLORS['black'])
-            text_rect = text.get_rect()
-            text_rect.center = (self.display_width // 2, 460)
-            self.display.blit(text, text_rect)
+            self.draw_text(intro_diff_1, 30, (self.display_width // 2, 300))
+            self.draw_text(intro_diff_2, 30, (self.display_width // 2, 340))
+            self.draw_text(intro_diff_3, 30, (self.display_width // 2, 380))
+            self.draw_text(intro_diff_4, 30, (self.display_width // 2, 420))
+            self.draw_text(intro_diff_5, 30, (self.display_width // 2, 460))
 
         self.use_alternate_border_animation = not self.use_alternate_border_animation
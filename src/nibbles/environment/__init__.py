@@ -0,0 +1 @@
+from .nibbles_environment import NibblesEnvironment
@@ -0,0 +1,186 @@
+import numpy as np
+from nibbles.nibbles import Nibbles
+from nibbles.directions import Directions
+from nibbles.collision_map import CollisionMap
+from nibbles.ai.ai_difficulty_levels import AiDifficultyLevel
+from nibbles.ai.ai_executors.inline_ai_executor import InlineAiExecutor
+
+
+class NibblesEnvironment:
+    """
+    Represents a gym style environment that plays one headless Nibbles game through reset and step
+
+    Every snake has a slot (its snake id - 1) in the actions, observations, rewards and done flags. The player snakes are
+    controlled by the actions, the AI snakes pick their own direction unless an action overrides it. Observations,
+    rewards and done flags are written into preallocated arrays that are returned by every call, so they are
+    overwritten by the next step and have to be copied to be kept
+    """
+    ENVIRONMENT_COLORS = [(index, index, index) for index in range(8)]
+    NO_ACTION = -1
+    CHANNEL_BARRIERS = 0
+    CHANNEL_OWN_BODY = 1
+    CHANNEL_OTHER_BODIES = 2
+    CHANNEL_FOOD = 3
+    NUMBER_OF_CHANNELS = 4
+
+    def __init__(self, level_number, level_parser_type, board_width, board_height, number_of_players=1,
+                 number_of_ai=0, ai_difficulty_level=AiDifficultyLevel.EASY, death_penalty=1.0, max_ticks=10000,
+                 level_dir=None, cache_dir=None, seed=None):
+        """
+        :param level_number: The number of the level to play
+        :param level_parser_type: The type of the level parser to use when parsing levels
+        :param board_width: The width of the game board
+        :param board_height: The height of the game board
+        :param number_of_players: The number of snakes controlled by the actions
+        :param number_of_ai: The number of snakes controlled by the AI
+        :param ai_difficulty_level: The AiDifficultyLevel of the AI snakes
+        :param death_penalty: The amount subtracted from the reward of a snake when it loses a life
+        :param max_ticks: The number of ticks after which an episode is truncated
+        :param level_dir: The path of the level data to parse (None to use the bundled levels)
+        :param cache_dir: The directory to cache compiled levels in (None to disable the level cache)
+        :param seed: The seed of the first episode (None to pick a random seed)
+        """
+        if not 1 <= number_of_players + number_of_ai <= 8:
+            raise ValueError("number of snakes must be between 1 and 8")
+        self.death_penalty = death_penalty
+        self.max_ticks = max_ticks
+        self.number_of_snakes = number_of_players + number_of_ai
+        self.nibbles = Nibbles(self.ENVIRONMENT_COLORS, board_width, board_height, 1.0, number_of_players,
+                               number_of_ai, ai_difficulty_level, level_parser_type, level_number, True, cache_dir,
+                               level_dir, seed, prefetch=False)
+        self.ai_executor = InlineAiExecutor()
+        shape = (board_height, board_width)
+        self.observations = np.zeros((self.number_of_snakes, self.NUMBER_OF_CHANNELS) + shape, dtype=np.uint8)
+        self.rewards = np.zeros(self.number_of_snakes, dtype=np.float32)
+        self.dones = np.zeros(self.number_of_snakes, dtype=bool)
+        self.scores = np.zeros(self.number_of_snakes, dtype=np.int64)
+        self.snake_cells = np.zeros(shape, dtype=np.uint8)
+        self.cell_types = None
+        self.owners = None
+        self.food_index = None
+
+    @property
+    def max_ticks(self):
+        return self._max_ticks
+
+    @max_ticks.setter
+    def max_ticks(self, max_ticks):
+        if not isinstance(max_ticks, int):
+            raise ValueError("max ticks must be an integer")
+        if max_ticks < 1:
+            raise ValueError("max ticks must be greater than 0")
+        self._max_ticks = max_ticks
+
+    @property
+    def tick(self):
+        return self.nibbles.tick
+
+    def reset(self, seed=None):
+        """
+        Starts a new episode at the beginning of the level
+
+        :param seed: The seed of the episode (None to use the seed passed to the constructor on the first reset and to
+                     draw a new one from the previous episode afterwards)
+        :return: An (observations, info) tuple
+        """
+        if self.nibbles.loaded_level:
+            self.nibbles.restart_level(seed)
+        else:
+            if seed is not None:
+                self.nibbles.seed = seed
+                self.nibbles.random.seed(self.nibbles.seed)
+            self.nibbles.initialize_level()
+        collision_map = self.nibbles.collision_map
+        shape = (collision_map.height, collision_map.width)
+        # zero copy views that follow the collision map of the new level
+        self.cell_types = np.frombuffer(collision_map.cell_types, dtype=np.uint8).reshape(shape)
+        self.owners = np.frombuffer(collision_map.owners, dtype=np.uint8).reshape(shape)
+        self.observations[:, self.CHANNEL_BARRIERS] = (self.cell_types & CollisionMap.CELL_BARRIER) != 0
+        self.observations[:, self.CHANNEL_FOOD] = 0
+        self.food_index = None
+        self.rewards[:] = 0.0
+        self.dones[:] = False
+        self.scores[:] = 0
+        self.update_observations()
+        return self.observations, self.create_info()
+
+    def step(self, actions=None):
+        """
+        Plays one tick of the game
+
+        :param actions: A sequence with the index in Directions.DIRECTIONS that each snake should move in or NO_ACTION
+                        to keep the current direction of a player snake and let an AI snake decide (None for no actions)
+        :return: An (observations, rewards, dones, terminated, truncated, info) tuple, dones marks the snakes that are
+                 out of the game, terminated is True once the game is over or every player snake is out of the game and
+                 truncated is True once the episode reached max_ticks
+        """
+        nibbles = self.nibbles
+        if nibbles.stopped:
+            raise RuntimeError("step called on a finished episode, call reset first")
+        self.ai_executor.calculate_ai_directions(nibbles)
+        if actions is not None:
+            for snake in nibbles.snakes:
+                action = actions[snake.snake_id - 1]
+                if action != self.NO_ACTION:
+                    snake.direction_to_move = Directions.DIRECTIONS[action]
+        nibbles.update()
+        self.rewards[:] = 0.0
+        # snakes that lost their last life were removed from the game, this step still carries their final reward
+        removed_snakes = [snake for snake in nibbles.killed_snakes if not snake.alive]
+        for snake in nibbles.killed_snakes:
+            self.rewards[snake.snake_id - 1] -= self.death_penalty
+        for snake in removed_snakes:
+            self.dones[snake.snake_id - 1] = True
+        if nibbles.snake_reset_needed:
+            nibbles.reset_snakes()
+        for snake in nibbles.snakes + removed_snakes:
+            index = snake.snake_id - 1
+            self.rewards[index] += snake.score - self.scores[index]
+            self.scores[index] = snake.score
+        self.update_observations()
+        players_left = any(snake.player_number for snake in nibbles.snakes)
+        terminated = nibbles.stopped or (nibbles.number_of_players > 0 and not players_left)
+        truncated = not terminated and nibbles.tick >= self.max_ticks
+        return self.observations, self.rewards, self.dones, terminated, truncated, self.create_info()
+
+    def update_observations(self):
+        """
+        Writes the current state of the game into the observation buffers
+
+        The body channels are taken from the owners of the collision map, a cell that holds the body chunks of several
+        snakes belongs to the snake that entered it last until that snake leaves it
+        """
+        owners = self.owners
+        np.not_equal(owners, CollisionMap.NO_OWNER, out=self.snake_cells, casting='unsafe')
+        for index in range(self.number_of_snakes):
+            own_body = self.observations[index, self.CHANNEL_OWN_BODY]
+            other_bodies = self.observations[index, self.CHANNEL_OTHER_BODIES]
+            np.equal(owners, index + 1, out=own_body, casting='unsafe')
+            np.subtract(self.snake_cells, own_body, out=other_bodies)
+
+        food = self.nibbles.food
+        food_index = (food.row, food.column) if food else None
+        if food_index != self.food_index:
+            if self.food_index is not None:
+                self.observations[(slice(None), self.CHANNEL_FOOD) + self.food_index] = 0
+            if food_index is not None:
+                self.observations[(slice(None), self.CHANNEL_FOOD) + food_index] = 1
+            self.food_index = food_index
+
+    def create_info(self):
+        """
+        Returns the extra information about the current state of the episode
+
+        :return: A dictionary with the tick, seed and scores of the episode
+        """
+        return {
+            'tick': self.nibbles.tick,
+            'seed': self.nibbles.seed,
+            'scores': self.scores
+        }
+
+    def close(self):
+        """
+        Stops the level loading thread of the game
+        """
+        self.nibbles.level_registry.shutdown()
@@ -0,0 +1,94 @@
+import time
+
+
+class FixedTimestepScheduler:
+    """
+    Represents a scheduler that runs game ticks at a fixed rate measured on a monotonic clock
+
+    The time that passed since the last call is added to an accumulator and one tick is due for every tick interval in
+    it, so the tick rate doesn't drift with the time the ticks or the sleeps take. A late game catches up by running
+    several ticks at once, but never more than max_catch_up_ticks, anything beyond that is dropped so a stall doesn't
+    turn into a burst of ticks
+    """
+    def __init__(self, tick_rate, max_catch_up_ticks=5, clock=time.perf_counter, sleep=time.sleep):
+        """
+        :param tick_rate: The number of ticks per second
+        :param max_catch_up_ticks: The maximum number of ticks to run at once when the game is late
+        :param clock: The monotonic clock to measure time with in seconds
+        :param sleep: The function to sleep with in seconds
+        """
+        self.tick_rate = tick_rate
+        self.max_catch_up_ticks = max_catch_up_ticks
+        self.clock = clock
+        self.sleep = sleep
+        self.accumulator = 0.0
+        self.last_time = clock()
+        self.ticks = 0
+        self.missed_deadlines = 0  # ticks that ran more than one tick interval after they were due
+        self.dropped_ticks = 0  # ticks that were skipped because they exceeded the catch up limit
+
+    @property
+    def tick_rate(self):
+        return self._tick_rate
+
+    @tick_rate.setter
+    def tick_rate(self, tick_rate):
+        if tick_rate <= 0:
+            raise ValueError("tick rate must be greater than 0")
+        self._tick_rate = tick_rate
+        self.tick_interval = 1 / tick_rate
+
+    @property
+    def max_catch_up_ticks(self):
+        return self._max_catch_up_ticks
+
+    @max_catch_up_ticks.setter
+    def max_catch_up_ticks(self, max_catch_up_ticks):
+        if not isinstance(max_catch_up_ticks, int):
+            raise ValueError("max catch up ticks must be an integer")
+        if max_catch_up_ticks < 1:
+            raise ValueError("max catch up ticks must be greater than 0")
+        self._max_catch_up_ticks = max_catch_up_ticks
+
+    def reset(self):
+        """
+        Forgets the time that passed so far, used while the game is paused so it doesn't catch up once it resumes
+        """
+        self.accumulator = 0.0
+        self.last_time = self.clock()
+
+    def advance(self):
+        """
+        Adds the time that passed since the last call to the accumulator and takes the ticks that are due out of it
+
+        :return: The number of ticks to run now
+        """
+        now = self.clock()
+        self.accumulator += now - self.last_time
+        self.last_time = now
+        due_ticks = int(self.accumulator // self.tick_interval)
+        if due_ticks > self.max_catch_up_ticks:
+            self.dropped_ticks += due_ticks - self.max_catch_up_ticks
+            self.accumulator -= self.tick_interval * (due_ticks - self.max_catch_up_ticks)
+            due_ticks = self.max_catch_up_ticks
+        if due_ticks > 1:
+            self.missed_deadlines += due_ticks - 1
+        self.accumulator -= self.tick_interval * due_ticks
+        self.ticks += due_ticks
+        return due_ticks
+
+    def time_until_next_tick(self):
+        """
+        Returns the time left until the next tick is due
+
+        :return: The number of seconds until the next tick is due (0 if it is already due)
+        """
+        return max(self.tick_interval - self.accumulator - (self.clock() - self.last_time), 0.0)
+
+    def wait_for_next_tick(self):
+        """
+        Sleeps until the next tick is due
+        """
+        remaining_time = self.time_until_next_tick()
+        if remaining_time > 0:
+            self.sleep(remaining_time)
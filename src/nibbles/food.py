@@ -1,10 +1,13 @@
 from nibbles.coordinate import Coordinate
+from nibbles.collision_map import CollisionMap
 
 
 class Food(Coordinate):
     """
     Represents a food item
     """
+    CELL_TYPE = CollisionMap.CELL_FOOD
+
     def __init__(self, row=0, column=0, points=1):
         """
         :param row: Row of the food item
@@ -0,0 +1,93 @@
+class FreeCellIndex:
+    """
+    Represents the set of tracked cells that are currently free, supports O(1) insertion and removal and a random choice
+    in cell order
+
+    Next to a flag per cell the index counts the free cells of every block of 64 cells and of every group of 64 blocks.
+    Insertion and removal update the flag and the two counts. A choice skips whole groups by their counts, then at most
+    64 blocks of the group and then at most 64 cells of the block, so its cost grows with the number of groups (one per
+    4096 cells) instead of the number of cells. Picking the nth free cell in cell order makes the choice only depend on
+    which cells are free and not on the order they became free in, a game state restored from a snapshot makes the same
+    random choices as the original game and VectorNibbles reproduces the choices with a sorted array of free cells
+    """
+    BLOCK_SHIFT = 6  # add and discard use the shifts as literals, index >> 6 is the block and index >> 12 the group
+    BLOCK_SIZE = 1 << BLOCK_SHIFT
+    GROUP_SIZE = BLOCK_SIZE * BLOCK_SIZE
+
+    def __init__(self, size):
+        """
+        :param size: The number of cells on the game board
+        """
+        self.free = bytearray(size)
+        self.tracked = bytearray(size)
+        self.block_counts = [0] * -(-size // self.BLOCK_SIZE)
+        self.group_counts = [0] * -(-size // self.GROUP_SIZE)
+        self.free_count = 0
+
+    def __len__(self):
+        return self.free_count
+
+    def __contains__(self, index):
+        return self.free[index] == 1
+
+    def track(self, index, free):
+        """
+        Starts tracking a cell
+
+        :param index: The index of the cell to track
+        :param free: Whether the cell is currently free
+        """
+        self.tracked[index] = 1
+        if free:
+            self.add(index)
+
+    def add(self, index):
+        """
+        Marks a tracked cell as free, untracked cells are ignored
+
+        :param index: The index of the cell that became free
+        """
+        if self.tracked[index] and not self.free[index]:
+            self.free[index] = 1
+            self.block_counts[index >> 6] += 1
+            self.group_counts[index >> 12] += 1
+            self.free_count += 1
+
+    def discard(self, index):
+        """
+        Marks a cell as taken
+
+        :param index: The index of the cell that was taken
+        """
+        if self.free[index]:
+            self.free[index] = 0
+            self.block_counts[index >> 6] -= 1
+            self.group_counts[index >> 12] -= 1
+            self.free_count -= 1
+
+    def choice(self, random):
+        """
+        Returns a random free cell
+
+        :param random: The Random instance to draw from
+        :return: The index of a random free cell or None if there are no free cells
+        """
+        if not self.free_count:
+            return None
+        n = random.randrange(self.free_count)
+        # skip whole groups and blocks by their counts, then step through the free cells of the block
+        block = 0
+        for count in self.group_counts:
+            if n < count:
+                break
+            n -= count
+            block += self.BLOCK_SIZE
+        block_counts = self.block_counts
+        while n >= block_counts[block]:
+            n -= block_counts[block]
+            block += 1
+        free = self.free
+        index = free.index(1, block << self.BLOCK_SHIFT)
+        for _ in range(n):
+            index = free.index(1, index + 1)
+        return index
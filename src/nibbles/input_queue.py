@@ -0,0 +1,106 @@
+import time
+from collections import deque
+from nibbles.directions import Directions
+from nibbles.profiling.span_histogram import SpanHistogram
+
+
+class InputQueue:
+    """
+    Represents the turns the players requested that the game thread hasn't applied yet
+
+    The thread that reads the input pushes a timestamped turn for every key press and the game thread takes one turn per
+    player at the start of every tick, so two key presses within one tick turn the snake on two consecutive ticks
+    instead of the second one overwriting the first. Each player has their own bounded deque with a single producer and
+    a single consumer, appending and popping a deque are atomic so no lock is needed
+    """
+    def __init__(self, player_numbers, max_buffered_turns=3, latency_histogram=None, clock=time.perf_counter):
+        """
+        :param player_numbers: The player numbers that turns can be pushed for
+        :param max_buffered_turns: The maximum number of turns to buffer per player, turns beyond that are dropped
+        :param latency_histogram: The SpanHistogram to record the time from a key press to the tick that applied it in
+                                  (None to create one)
+        :param clock: The monotonic clock the turns are timestamped with in seconds
+        """
+        self.max_buffered_turns = max_buffered_turns
+        self.clock = clock
+        self.turns = {player_number: deque(maxlen=max_buffered_turns) for player_number in player_numbers}
+        self.latency = latency_histogram if latency_histogram is not None else SpanHistogram()
+        self.paused_at = None  # the last time the game was paused, turns pushed before it waited for the game
+        self.dropped_turns = 0  # turns pushed while the buffer of the player was full
+        self.skipped_turns = 0  # turns that would not have changed the direction of the snake when they were applied
+
+    @property
+    def max_buffered_turns(self):
+        return self._max_buffered_turns
+
+    @max_buffered_turns.setter
+    def max_buffered_turns(self, max_buffered_turns):
+        if not isinstance(max_buffered_turns, int):
+            raise ValueError("max buffered turns must be an integer")
+        if max_buffered_turns < 1:
+            raise ValueError("max buffered turns must be greater than 0")
+        self._max_buffered_turns = max_buffered_turns
+
+    def push(self, player_number, direction, timestamp=None):
+        """
+        Buffers a turn of a player, called from the thread that reads the keyboard
+
+        :param player_number: The number of the player that requested the turn
+        :param direction: The direction the player wants to move
+        :param timestamp: The time of the key press on the clock (None for now)
+        :return: True if the turn was buffered, False if the buffer of the player was full
+        """
+        turns = self.turns[player_number]
+        if len(turns) >= self.max_buffered_turns:
+            self.dropped_turns += 1
+            return False
+        turns.append((self.clock() if timestamp is None else timestamp, direction))
+        return True
+
+    def pop_turn(self, player_number, last_direction_moved):
+        """
+        Takes the next turn of a player that changes the direction of the snake, called from the game thread at the
+        start of a tick. Turns into the direction the snake already moves and reversals are skipped, the snake can't
+        make them on this tick and they would otherwise block the turn buffered after them
+
+        :param player_number: The number of the player
+        :param last_direction_moved: The direction the snake of the player moved on the last tick
+        :return: The direction to move or None if no turn is buffered
+        """
+        turns = self.turns.get(player_number)
+        while turns:
+            timestamp, direction = turns.popleft()
+            if direction == last_direction_moved or direction == Directions.OPPOSITE_DIRECTIONS[last_direction_moved]:
+                self.skipped_turns += 1
+                continue
+            now = self.clock()
+            self.latency.record(now - max(timestamp, self.paused_at) if self.paused_at else now - timestamp)
+            return direction
+        return None
+
+    def apply_turns(self, snakes):
+        """
+        Takes the next buffered turn of every player controlled snake, called by the game thread at the start of a tick
+
+        :param snakes: The snakes of the game
+        """
+        for snake in snakes:
+            if snake.player_number:
+                direction = self.pop_turn(snake.player_number, snake.last_direction_moved)
+                if direction:
+                    snake.direction_to_move = direction
+
+    def pause(self):
+        """
+        Records that the game is paused now, called on every iteration of the game loop while the game is paused. The
+        buffered turns are applied once the game resumes, their latency is measured from the last call so the time the
+        game spent paused isn't counted as time the game took to respond
+        """
+        self.paused_at = self.clock()
+
+    def clear(self):
+        """
+        Drops every buffered turn, used when the snakes are placed at their start positions
+        """
+        for turns in self.turns.values():
+            turns.clear()
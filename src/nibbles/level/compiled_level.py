@@ -0,0 +1,73 @@
+import struct
+import sys
+from array import array
+from nibbles.coordinate import Coordinate
+from nibbles.barrier import Barrier
+from nibbles.level.level import Level
+
+
+class CompiledLevel:
+    """
+    Represents the compact binary form of a level
+
+    A compiled level is a fixed size header followed by the barrier, food spawn and initial snake head spawn cells of
+    the level stored as arrays of cell indices (column + row * width) in the order they appear in the level. The arrays
+    are stored in the byte order of the machine that compiled them, a buffer with a different byte order is rejected
+    so it can be compiled again
+    """
+    MAGIC = b'NBLV'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHBxiHHIII')
+    INDEX_TYPECODE = 'I'
+    BYTE_ORDER = 0 if sys.byteorder == 'little' else 1
+
+    @staticmethod
+    def encode(level, width, height):
+        """
+        Compiles a level into its binary form
+
+        :param level: The Level to compile
+        :param width: The width of the level
+        :param height: The height of the level
+        :return: The bytes of the compiled level
+        """
+        index_arrays = [array(CompiledLevel.INDEX_TYPECODE, [coordinate.column + coordinate.row * width
+                                                            for coordinate in coordinates])
+                        for coordinates in (level.barriers, level.food_spawns, level.initial_snake_head_spawns)]
+        header = CompiledLevel.HEADER.pack(CompiledLevel.MAGIC, CompiledLevel.VERSION, CompiledLevel.BYTE_ORDER,
+                                           level.number, width, height, *[len(indices) for indices in index_arrays])
+        return b''.join([header] + [indices.tobytes() for indices in index_arrays])
+
+    @staticmethod
+    def decode(buffer, width, height):
+        """
+        Creates a Level from a compiled level without copying the index arrays out of the buffer
+
+        :param buffer: A bytes-like object (e.g. an mmap) containing a compiled level
+        :param width: The width the level is expected to have
+        :param height: The height the level is expected to have
+        :return: The decoded Level
+        """
+        header_size = CompiledLevel.HEADER.size
+        if len(buffer) < header_size:
+            raise ValueError("compiled level is truncated")
+        magic, version, byte_order, level_number, level_width, level_height, *counts = \
+            CompiledLevel.HEADER.unpack_from(buffer)
+        if magic != CompiledLevel.MAGIC or version != CompiledLevel.VERSION or byte_order != CompiledLevel.BYTE_ORDER:
+            raise ValueError("unsupported compiled level format")
+        if level_width != width or level_height != height:
+            raise ValueError("compiled level must be {0}x{1}".format(width, height))
+        item_size = array(CompiledLevel.INDEX_TYPECODE).itemsize
+        if len(buffer) != header_size + sum(counts) * item_size:
+            raise ValueError("compiled level is truncated")
+
+        coordinate_lists = []
+        offset = header_size
+        with memoryview(buffer) as view:
+            for count, coordinate_type in zip(counts, (Barrier, Coordinate, Coordinate)):
+                end = offset + count * item_size
+                with view[offset:end].cast(CompiledLevel.INDEX_TYPECODE) as indices:
+                    coordinate_lists.append([coordinate_type(index // width, index % width)
+                                             for index in indices])
+                offset = end
+        return Level(level_number, *coordinate_lists)
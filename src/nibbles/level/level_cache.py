@@ -0,0 +1,97 @@
+import hashlib
+import os
+import pathlib
+from nibbles.level.compiled_level import CompiledLevel
+
+
+class LevelCache:
+    """
+    Represents an on disk cache of compiled levels
+
+    Entries are keyed by the name and SHA-256 hash of the source file and the level dimensions, so editing a level
+    changes its key and the outdated entry is replaced the next time the level is loaded. An entry is only a few
+    kilobytes and every level is decoded in full when it is loaded, so entries are read with a single read
+    """
+    FILE_EXTENSION = 'lvl'
+
+    def __init__(self, cache_dir):
+        """
+        :param cache_dir: The directory to store compiled levels in (a 'levels' directory is created inside of it)
+        """
+        self.level_dir = pathlib.Path(cache_dir).joinpath('levels')
+
+    def get_cache_path(self, source_path, width, height):
+        """
+        Returns the path that a level is cached at
+
+        :param source_path: The path of the level source file
+        :param width: The width of the level
+        :param height: The height of the level
+        :return: The path of the cache file
+        """
+        source_hash = hashlib.sha256(source_path.read_bytes()).hexdigest()
+        file_name = '{0}_{1}x{2}_{3}.{4}'.format(source_path.stem, width, height, source_hash, self.FILE_EXTENSION)
+        return self.level_dir.joinpath(file_name)
+
+    def load_level(self, source_path, width, height, parse_level):
+        """
+        Loads a level from the cache, compiling and storing it first if it isn't cached yet or its entry is unreadable
+
+        :param source_path: The path of the level source file
+        :param width: The width of the level
+        :param height: The height of the level
+        :param parse_level: A function that parses the level from (source_path, width, height) on a cache miss
+        :return: The loaded Level
+        """
+        source_path = pathlib.Path(source_path)
+        cache_path = self.get_cache_path(source_path, width, height)
+        if cache_path.is_file():
+            try:
+                return self.read_level(cache_path, width, height)
+            except (OSError, ValueError):
+                pass  # unreadable or outdated format, compile it again
+        level = parse_level(source_path, width, height)
+        self.store_level(level, width, height, cache_path)
+        self.remove_stale_entries(source_path, width, height, cache_path)
+        return level
+
+    @staticmethod
+    def read_level(cache_path, width, height):
+        """
+        Reads a compiled level from its cache file
+
+        :param cache_path: The path of the cache file
+        :param width: The width of the level
+        :param height: The height of the level
+        :return: The decoded Level
+        """
+        return CompiledLevel.decode(cache_path.read_bytes(), width, height)
+
+    @staticmethod
+    def store_level(level, width, height, cache_path):
+        """
+        Stores a compiled level in the cache, replacing the file atomically so a partial file is never read
+
+        :param level: The Level to store
+        :param width: The width of the level
+        :param height: The height of the level
+        :param cache_path: The path of the cache file
+        """
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_name(cache_path.name + '.tmp')
+        temp_path.write_bytes(CompiledLevel.encode(level, width, height))
+        os.replace(temp_path, cache_path)
+
+    def remove_stale_entries(self, source_path, width, height, cache_path):
+        """
+        Removes the entries of older versions of a level source file
+
+        :param source_path: The path of the level source file
+        :param width: The width of the level
+        :param height: The height of the level
+        :param cache_path: The path of the current entry, which is kept
+        """
+        pattern = '{0}_{1}x{2}_*.{3}'.format(source_path.stem, width, height, self.FILE_EXTENSION)
+        for stale_path in self.level_dir.glob(pattern):
+            if stale_path != cache_path:
+                stale_path.unlink(missing_ok=True)
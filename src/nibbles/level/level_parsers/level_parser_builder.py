@@ -1,17 +1,20 @@
 from nibbles.level.level_parsers.level_parser_types import LevelParserTypes
 from nibbles.level.level_parsers.level_parser_interface import LevelParserInterface
 from nibbles.level.level_parsers.png_level_parser import PNGLevelParser
+from nibbles.level.level_parsers.pack_level_parser import PackLevelParser
 
 
 class LevelParserBuilder:
     """
     Represents a way to dynamically create a level parser based on some input parameters
     """
-    def __init__(self, level_parser_type: LevelParserTypes):
+    def __init__(self, level_parser_type: LevelParserTypes, cache_dir=None):
         """
         :param level_parser_type: The type of level parser to build
+        :param cache_dir: The directory to cache compiled levels in (None to disable the level cache)
         """
         self.level_parser_type = level_parser_type
+        self.cache_dir = cache_dir
 
     def build(self) -> LevelParserInterface:
         """
@@ -19,6 +22,8 @@ class LevelParserBuilder:
         :return: A level parser that matches the input parameters
         """
         if self.level_parser_type == LevelParserTypes.PNG_PARSER:
-            return PNGLevelParser()
+            return PNGLevelParser(self.cache_dir)
+        elif self.level_parser_type == LevelParserTypes.PACK_PARSER:
+            return PackLevelParser()
         else:
             raise RuntimeError("invalid level parser '{0}'".format(self.level_parser_type))
@@ -12,6 +12,23 @@ class LevelParserInterface:
         """
         pass
 
+    def index_levels(self) -> list:
+        """
+        Finds the levels in the current data source without parsing them
+
+        :returns: A list of level numbers
+        """
+        pass
+
+    def parse_level(self, level_number):
+        """
+        Parses a single level from the current data source
+
+        :param: level_number: The number of a level returned by index_levels
+        :returns: The parsed level
+        """
+        pass
+
     def parse_levels(self) -> list:
         """
         Parses the levels from the current data source
@@ -19,3 +36,9 @@ class LevelParserInterface:
         :returns: A list of levels
         """
         pass
+
+    def close(self):
+        """
+        Releases the resources held for the current data source
+        """
+        pass
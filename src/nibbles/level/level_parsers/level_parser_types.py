@@ -6,6 +6,7 @@ class LevelParserTypes(Enum):
     Represents different types of level parsers
     """
     PNG_PARSER = 'png_parser'
+    PACK_PARSER = 'pack_parser'
 
     def __str__(self):
         return self.value
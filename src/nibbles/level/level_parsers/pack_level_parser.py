@@ -0,0 +1,146 @@
+import mmap
+import pathlib
+import struct
+from nibbles.level.compiled_level import CompiledLevel
+from nibbles.level.level_parsers.level_parser_types import LevelParserTypes
+from nibbles.level.level_parsers.level_parser_interface import LevelParserInterface
+
+
+class PackLevelParser(LevelParserInterface):
+    """
+    Represents a level parser that reads levels from a single level pack file
+
+    A level pack starts with a header, followed by an offset table with an entry for every level sorted by level number
+    and the compiled data of each level (see CompiledLevel). The pack is memory-mapped for the lifetime of the parser,
+    so any level can be read without reading the rest of the pack until the parser is closed
+    """
+    PARSER_TYPE = LevelParserTypes.PACK_PARSER
+    MAGIC = b'NBLP'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHHHHI')
+    TABLE_ENTRY = struct.Struct('<iQI')
+
+    def __init__(self):
+        self.pack_path = None
+        self.level_width = None
+        self.level_height = None
+        self.level_entries = None
+        self.buffer = None
+
+    @staticmethod
+    def write_level_pack(levels, level_width, level_height, path):
+        """
+        Writes levels into a level pack file
+
+        :param levels: The Levels to write
+        :param level_width: The width of the levels
+        :param level_height: The height of the levels
+        :param path: The path of the level pack file to write
+        """
+        levels = sorted(levels, key=lambda level: level.number)
+        for previous_level, level in zip(levels, levels[1:]):
+            if previous_level.number == level.number:
+                raise RuntimeError("level {0} is defined more than once".format(level.number))
+        level_data = [CompiledLevel.encode(level, level_width, level_height) for level in levels]
+        header = PackLevelParser.HEADER.pack(PackLevelParser.MAGIC, PackLevelParser.VERSION, 0, level_width,
+                                             level_height, len(levels))
+        offset = PackLevelParser.HEADER.size + PackLevelParser.TABLE_ENTRY.size * len(levels)
+        table = []
+        for level, data in zip(levels, level_data):
+            table.append(PackLevelParser.TABLE_ENTRY.pack(level.number, offset, len(data)))
+            offset += len(data)
+        pathlib.Path(path).write_bytes(b''.join([header] + table + level_data))
+
+    def set_data_source(self, level_width, level_height, path):
+        """
+        Sets the path where the data source is located
+
+        :param: level_width: The width of the level
+        :param: level_height: The height of the level
+        :param: path: The path of the level pack file
+        """
+        pack_path = pathlib.Path(path)
+        if not pack_path.is_file():
+            raise RuntimeError("the data source is not a valid file")
+        self.level_width = level_width
+        self.level_height = level_height
+        self.close()
+        self.pack_path = pack_path
+
+    def index_levels(self) -> list:
+        """
+        Finds the levels in the current data source without parsing them
+
+        :returns: A list of level numbers
+        """
+        if not self.pack_path:
+            raise RuntimeError("no data source set")
+        if self.pack_path.stat().st_size < self.HEADER.size:
+            raise RuntimeError("the level pack is truncated")
+        self.close()
+        with open(self.pack_path, 'rb') as pack_file:
+            buffer = mmap.mmap(pack_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            level_entries = self.read_level_entries(buffer)
+        except Exception:
+            buffer.close()
+            raise
+        self.buffer = buffer
+        self.level_entries = level_entries
+        return list(level_entries)
+
+    def read_level_entries(self, buffer):
+        """
+        Validates the header of a level pack and reads its offset table
+
+        :param buffer: The contents of the level pack file
+        :return: A dictionary of the (offset, length) of every level by level number
+        """
+        magic, version, _, level_width, level_height, level_count = self.HEADER.unpack_from(buffer)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise RuntimeError("the data source is not a supported level pack")
+        if level_width != self.level_width or level_height != self.level_height:
+            raise RuntimeError("the level pack must contain {0}x{1} levels".format(self.level_width,
+                                                                                 self.level_height))
+        if len(buffer) < self.HEADER.size + self.TABLE_ENTRY.size * level_count:
+            raise RuntimeError("the level pack is truncated")
+        level_entries = {}
+        for level_number, offset, length in self.TABLE_ENTRY.iter_unpack(
+                buffer[self.HEADER.size:self.HEADER.size + self.TABLE_ENTRY.size * level_count]):
+            if offset + length > len(buffer):
+                raise RuntimeError("the level pack is truncated")
+            level_entries[level_number] = (offset, length)
+        return level_entries
+
+    def parse_level(self, level_number):
+        """
+        Parses a single level from the current data source
+
+        :param: level_number: The number of a level returned by index_levels
+        :returns: The parsed level
+        """
+        if self.level_entries is None:
+            self.index_levels()
+        entry = self.level_entries.get(level_number)
+        if not entry:
+            raise RuntimeError("level {0} is not in the data source".format(level_number))
+        offset, length = entry
+        with memoryview(self.buffer) as view, view[offset:offset + length] as level_view:
+            return CompiledLevel.decode(level_view, self.level_width, self.level_height)
+
+    def parse_levels(self) -> list:
+        """
+        Parses the levels from the current data source
+
+        :returns: A list of levels
+        """
+        return [self.parse_level(level_number) for level_number in self.index_levels()]
+
+    def close(self):
+        """
+        Unmaps the level pack, the next call that needs it indexes the data source again
+        """
+        if self.buffer is not None:
+            self.buffer.close()
+        self.buffer = None
+        self.level_entries = None
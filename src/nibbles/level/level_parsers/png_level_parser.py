@@ -1,9 +1,11 @@
 import pathlib
 import re
+import numpy as np
 from PIL import Image, ImageColor
 from nibbles.coordinate import Coordinate
 from nibbles.barrier import Barrier
 from nibbles.level.level import Level
+from nibbles.level.level_cache import LevelCache
 from nibbles.level.level_parsers.level_parser_types import LevelParserTypes
 from nibbles.level.level_parsers.level_parser_interface import LevelParserInterface
 
@@ -19,10 +21,40 @@ class PNGLevelParser(LevelParserInterface):
     FOOD_SPAWN_COLOR = ImageColor.getrgb("white")
     INITIAL_SNAKE_HEAD_SPAWN_COLOR = ImageColor.getrgb("lime")
 
-    def __init__(self):
+    def __init__(self, cache_dir=None):
+        """
+        :param cache_dir: The directory to cache compiled levels in (None to parse the images on every launch)
+        """
         self.level_dir = None
         self.level_width = None
         self.level_height = None
+        self.level_paths = None
+        self.level_cache = LevelCache(cache_dir) if cache_dir else None
+
+    @staticmethod
+    def create_coordinates(pixels, color, height, coordinate_type):
+        """
+        Creates a coordinate for every pixel that has the given color
+
+        :param pixels: The RGB values of every pixel in an array of shape (width, height, 3)
+        :param color: The RGB color to search for
+        :param height: The height of the level
+        :param coordinate_type: The Coordinate type to create
+        :return: A list of coordinates of the pixels that have the color in column major order
+        """
+        columns, rows = np.nonzero((pixels == color).all(axis=2))
+        return [coordinate_type(row=height - row - 1, column=column)
+                for column, row in zip(columns.tolist(), rows.tolist())]
+
+    @staticmethod
+    def get_level_number(file_path):
+        """
+        Returns the level number encoded in the file name of a PNG level
+
+        :param file_path: The file path of the PNG level
+        :return: The level number
+        """
+        return int(file_path.stem.split('_')[1])
 
     @staticmethod
     def parse_png_level(file_path, expected_width, expected_height):
@@ -34,27 +66,18 @@ class PNGLevelParser(LevelParserInterface):
         :param expected_height: The expected height of the level
         :return: A Level created from information stored inside the given PNG image
         """
-        def interpret_pixel(pixel, x, y):
-            pixel = (pixel[0], pixel[1], pixel[2])  # strip alpha channel
-            if pixel == PNGLevelParser.BARRIER_COLOR:
-                barriers.append(Barrier(row=expected_height-y-1, column=x))
-            elif pixel == PNGLevelParser.FOOD_SPAWN_COLOR:
-                food_spawns.append(Coordinate(row=expected_height-y-1, column=x))
-            elif pixel == PNGLevelParser.INITIAL_SNAKE_HEAD_SPAWN_COLOR:
-                initial_snake_head_spawns.append(Coordinate(row=expected_height-y-1, column=x))
-
-        level_number = int(file_path.stem.split('_')[1])
-        barriers = []
-        food_spawns = []
-        initial_snake_head_spawns = []
+        level_number = PNGLevelParser.get_level_number(file_path)
         with Image.open(file_path) as image:
             width, height = image.size
             if width != expected_width or height != expected_height:
                 raise ValueError("Level image must be {0}x{1}".format(expected_width, expected_height))
-            pixels = image.load()
-            for i in range(0, width):
-                for j in range(0, height):
-                    interpret_pixel(pixels[i, j], i, j)
+            pixel_data = image.convert('RGBA').tobytes()
+        # transposing makes the pixels column major, which is the order that the levels are read in
+        pixels = np.frombuffer(pixel_data, dtype=np.uint8).reshape(height, width, 4)[:, :, :3].transpose(1, 0, 2)
+        barriers = PNGLevelParser.create_coordinates(pixels, PNGLevelParser.BARRIER_COLOR, height, Barrier)
+        food_spawns = PNGLevelParser.create_coordinates(pixels, PNGLevelParser.FOOD_SPAWN_COLOR, height, Coordinate)
+        initial_snake_head_spawns = PNGLevelParser.create_coordinates(
+            pixels, PNGLevelParser.INITIAL_SNAKE_HEAD_SPAWN_COLOR, height, Coordinate)
         return Level(level_number, barriers, food_spawns, initial_snake_head_spawns)
 
     def set_data_source(self, level_width, level_height, path):
@@ -71,20 +94,48 @@ class PNGLevelParser(LevelParserInterface):
         if not level_dir.exists() or not level_dir.is_dir():
             raise RuntimeError("the data source is not a valid directory")
         self.level_dir = level_dir
-        pass
+        self.level_paths = None
 
-    def parse_levels(self) -> list:
+    def index_levels(self) -> list:
         """
-        Parses the levels from the current data source
+        Finds the levels in the current data source without parsing them
 
-        :returns: A list of levels
+        :returns: A list of level numbers
         """
         if not self.level_dir:
             raise RuntimeError("no data source set")
-        if not self.level_width or not self.level_height:
-            raise RuntimeError("level resolution not set")
-        parsed_levels = []
+        level_paths = {}
         for child in self.level_dir.iterdir():
             if child.is_file() and self.FILE_NAME_REGEX.fullmatch(child.name):
-                parsed_levels.append(self.parse_png_level(child, self.level_width, self.level_height))
-        return parsed_levels
+                level_number = self.get_level_number(child)
+                if level_number in level_paths:
+                    raise RuntimeError("level {0} is defined more than once".format(level_number))
+                level_paths[level_number] = child
+        self.level_paths = level_paths
+        return list(level_paths)
+
+    def parse_level(self, level_number):
+        """
+        Parses a single level from the current data source
+
+        :param: level_number: The number of a level returned by index_levels
+        :returns: The parsed level
+        """
+        if self.level_paths is None:
+            self.index_levels()
+        if not self.level_width or not self.level_height:
+            raise RuntimeError("level resolution not set")
+        level_path = self.level_paths.get(level_number)
+        if not level_path:
+            raise RuntimeError("level {0} is not in the data source".format(level_number))
+        if self.level_cache:
+            return self.level_cache.load_level(level_path, self.level_width, self.level_height, self.parse_png_level)
+        return self.parse_png_level(level_path, self.level_width, self.level_height)
+
+    def parse_levels(self) -> list:
+        """
+        Parses the levels from the current data source
+
+        :returns: A list of levels
+        """
+        return [self.parse_level(level_number) for level_number in self.index_levels()]
@@ -0,0 +1,127 @@
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+
+class LevelRegistry:
+    """
+    Represents the levels of a data source, which are only parsed when they are requested
+
+    The registry indexes the level numbers of the data source up front, parses levels on demand and keeps the most
+    recently used ones in memory. Levels that are about to be needed can be prefetched on a background thread, which is
+    only started by the first prefetch, a request for a level that is being prefetched waits for the prefetch instead
+    of parsing the level again
+    """
+    def __init__(self, level_parser, max_cached_levels=16, prefetch=True):
+        """
+        :param level_parser: A LevelParserInterface with its data source set
+        :param max_cached_levels: The maximum number of parsed levels to keep
+        :param prefetch: Determines whether levels can be parsed on a background thread
+        """
+        self.level_parser = level_parser
+        self.level_numbers = sorted(level_parser.index_levels())
+        self.max_cached_levels = max_cached_levels
+        self.levels = OrderedDict()
+        self.pending_levels = {}
+        self.lock = Lock()
+        self.prefetch = prefetch
+        self.executor = None  # started by the first prefetch
+
+    def __len__(self):
+        return len(self.level_numbers)
+
+    def __contains__(self, level_number):
+        index = bisect_right(self.level_numbers, level_number)
+        return index > 0 and self.level_numbers[index - 1] == level_number
+
+    @property
+    def max_cached_levels(self):
+        return self._max_cached_levels
+
+    @max_cached_levels.setter
+    def max_cached_levels(self, max_cached_levels):
+        if not isinstance(max_cached_levels, int):
+            raise ValueError("max cached levels must be an integer")
+        if max_cached_levels < 1:
+            raise ValueError("max cached levels must be greater than 0")
+        self._max_cached_levels = max_cached_levels
+
+    def get_level(self, level_number):
+        """
+        Returns a level, parsing it if it isn't in memory yet
+
+        :param level_number: The number of the level
+        :return: The Level or None if the data source doesn't contain the level
+        """
+        if level_number not in self:
+            return None
+        with self.lock:
+            level = self.levels.get(level_number)
+            if level:
+                self.levels.move_to_end(level_number)
+                return level
+            pending_level = self.pending_levels.get(level_number)
+        if pending_level and not pending_level.cancelled():
+            return pending_level.result()
+        return self.load_level(level_number)
+
+    def prefetch_level(self, level_number):
+        """
+        Starts parsing a level on the background thread if it isn't in memory or being parsed already
+
+        :param level_number: The number of the level
+        """
+        if not self.prefetch or level_number not in self:
+            return
+        with self.lock:
+            if level_number in self.levels or level_number in self.pending_levels:
+                return
+            if not self.executor:
+                self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='nibbles-levels')
+            self.pending_levels[level_number] = self.executor.submit(self.load_level, level_number)
+
+    def load_level(self, level_number):
+        """
+        Parses a level and keeps it in memory, evicting the least recently used levels when there are too many
+
+        :param level_number: The number of the level
+        :return: The parsed Level
+        """
+        try:
+            level = self.level_parser.parse_level(level_number)
+        except BaseException:
+            with self.lock:
+                self.pending_levels.pop(level_number, None)
+            raise
+        with self.lock:
+            self.pending_levels.pop(level_number, None)
+            self.levels[level_number] = level
+            self.levels.move_to_end(level_number)
+            while len(self.levels) > self.max_cached_levels:
+                self.levels.popitem(last=False)
+        return level
+
+    def next_level_number(self, level_number):
+        """
+        Returns the number of the level that follows a level, wrapping around to the first level
+
+        :param level_number: The number of the current level
+        :return: The number of the next level
+        """
+        index = bisect_right(self.level_numbers, level_number)
+        return self.level_numbers[index % len(self.level_numbers)]
+
+    def shutdown(self):
+        """
+        Stops the background thread, levels that haven't started parsing yet are not parsed and no more levels are
+        prefetched
+        """
+        with self.lock:
+            self.prefetch = False
+            if self.executor:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+            # a cancelled prefetch never runs load_level, forget it so the level is parsed when it is requested
+            for level_number, pending_level in list(self.pending_levels.items()):
+                if pending_level.cancelled():
+                    del self.pending_levels[level_number]
@@ -0,0 +1,5 @@
+from .protocol import Protocol
+from .frame_codec import FrameCodec
+from .client_connection import ClientConnection
+from .nibbles_server import NibblesServer
+from .nibbles_client import NibblesClient
@@ -0,0 +1,32 @@
+class ClientConnection:
+    """
+    Represents a client connected to the nibbles server
+    """
+    def __init__(self, writer, player_number=0):
+        """
+        :param writer: The asyncio StreamWriter of the connection
+        :param player_number: The player number of the snake the client controls (0 if it only watches the game)
+        """
+        self.writer = writer
+        self.player_number = player_number
+        self.needs_keyframe = True  # the client has no frame snapshot to apply the next delta to
+        self.sent_bytes = 0
+        self.skipped_frames = 0  # frames that weren't sent because the client didn't keep up
+
+    def send(self, message):
+        """
+        Queues a message on the connection without waiting for it to be sent
+
+        :param message: The bytes of the message
+        """
+        self.writer.write(message)
+        self.sent_bytes += len(message)
+
+    def is_congested(self, max_write_buffer_size):
+        """
+        Checks whether the client is reading slower than the game is sent to it
+
+        :param max_write_buffer_size: The number of unsent bytes above which the connection counts as congested
+        :return: True if more bytes are waiting to be sent than the limit
+        """
+        return self.writer.transport.get_write_buffer_size() > max_write_buffer_size
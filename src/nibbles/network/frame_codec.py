@@ -0,0 +1,318 @@
+import time
+from nibbles.directions import Directions
+from nibbles.replay.replay import Replay
+from nibbles.snapshot.frame_snapshot import FrameSnapshot
+
+
+class FrameCodec:
+    """
+    Represents the binary encoding of the frame snapshots the server streams to its clients
+
+    A keyframe contains a whole frame snapshot. A delta only contains what changed since the previous frame snapshot of
+    the stream: the tick, the paused flag, the food if it changed, the killed players and one flags byte per snake. A
+    snake that moved one cell and didn't grow costs just that byte, its head step is stored as a direction in the flags
+    and the dropped tail cell as a single flag. A delta can only describe frame snapshots of the same level with the
+    same snakes, anything else has to be sent as a keyframe
+    """
+    FRAME_PAUSED = 0x01
+    FRAME_FOOD_CHANGED = 0x02
+    FRAME_FOOD = 0x04
+
+    SNAKE_DIRECTION_MASK = 0x03
+    SNAKE_HEAD_STEP = 0x04  # the head moved to the neighbor in the direction of the direction bits
+    SNAKE_HEAD_CELL = 0x08  # the head moved to the cell that follows the flags
+    SNAKE_TAIL_STEP = 0x10  # the last cell of the body was dropped
+    SNAKE_TAIL_CHANGE = 0x20  # a number of cells were dropped from the tail and the cells that follow were appended
+    SNAKE_SCORE = 0x40
+    SNAKE_LIVES = 0x80
+
+    def __init__(self, board_width, board_height, get_level=None, tick_interval=0.0):
+        """
+        :param board_width: The width of the game board
+        :param board_height: The height of the game board
+        :param get_level: A function returning the Level of a level number, needed to decode keyframes
+        :param tick_interval: The tick interval of the decoded frame snapshots (0 to disable interpolation)
+        """
+        self.board_width = board_width
+        self.board_height = board_height
+        self.get_level = get_level
+        self.tick_interval = tick_interval
+
+    def step(self, cell, direction_index):
+        """
+        Returns the cell a snake moves to from a cell, wrapping around the edges of the board like the game does
+
+        :param cell: The index of the cell to move from
+        :param direction_index: The index of the direction in Directions.DIRECTIONS
+        :return: The index of the cell moved to
+        """
+        column_offset, row_offset = Directions.DIRECTIONS[direction_index]
+        column = (cell % self.board_width + column_offset) % self.board_width
+        row = (cell // self.board_width + row_offset) % self.board_height
+        return column + row * self.board_width
+
+    @staticmethod
+    def can_encode_delta(previous_frame, frame):
+        """
+        Checks whether a frame snapshot can be encoded as a delta of the previous frame snapshot of the stream
+
+        :param previous_frame: The previous FrameSnapshot of the stream or None
+        :param frame: The FrameSnapshot to encode
+        :return: True if a delta can describe the frame snapshot
+        """
+        return previous_frame is not None and previous_frame.level is frame.level and \
+            len(previous_frame.snakes) == len(frame.snakes) and \
+            all(previous_snake[:2] == snake[:2] for previous_snake, snake in zip(previous_frame.snakes, frame.snakes))
+
+    def write_food(self, buffer, food):
+        """
+        Appends the cell and the points of a food item
+
+        :param buffer: The bytearray to append to
+        :param food: The (column, row, points) tuple of the food item
+        """
+        column, row, points = food
+        Replay.write_varint(buffer, column + row * self.board_width)
+        buffer.append(points)
+
+    def read_food(self, buffer, offset):
+        """
+        Reads a food item written by write_food
+
+        :param buffer: The buffer to read from
+        :param offset: The offset of the food item in the buffer
+        :return: A ((column, row, points), offset after the food item) tuple
+        """
+        cell, offset = Replay.read_varint(buffer, offset)
+        return (cell % self.board_width, cell // self.board_width, buffer[offset]), offset + 1
+
+    @staticmethod
+    def write_killed_player_numbers(buffer, killed_player_numbers):
+        """
+        Appends the player numbers of the snakes that lost a life, 0 stands for an AI snake
+
+        :param buffer: The bytearray to append to
+        :param killed_player_numbers: A tuple of player numbers (None for AI snakes)
+        """
+        buffer.append(len(killed_player_numbers))
+        buffer += bytes(player_number or 0 for player_number in killed_player_numbers)
+
+    @staticmethod
+    def read_killed_player_numbers(buffer, offset):
+        """
+        Reads the player numbers written by write_killed_player_numbers
+
+        :param buffer: The buffer to read from
+        :param offset: The offset of the player numbers in the buffer
+        :return: A (tuple of player numbers, offset after the player numbers) tuple
+        """
+        count = buffer[offset]
+        offset += 1
+        if offset + count > len(buffer):
+            raise IndexError("killed player numbers are truncated")
+        return tuple(player_number or None for player_number in buffer[offset:offset + count]), offset + count
+
+    def encode_keyframe(self, frame):
+        """
+        Encodes a whole frame snapshot
+
+        :param frame: The FrameSnapshot to encode
+        :return: The bytes of the keyframe payload
+        """
+        buffer = bytearray()
+        Replay.write_varint(buffer, frame.tick)
+        Replay.write_varint(buffer, frame.level.number)
+        buffer.append((self.FRAME_PAUSED if frame.paused else 0) | (self.FRAME_FOOD if frame.food else 0))
+        if frame.food:
+            self.write_food(buffer, frame.food)
+        self.write_killed_player_numbers(buffer, frame.killed_player_numbers)
+        buffer.append(len(frame.snakes))
+        for color, player_number, score, lives, cells in frame.snakes:
+            buffer.append(len(color))
+            buffer += bytes(color)
+            buffer.append(player_number or 0)
+            Replay.write_varint(buffer, score)
+            Replay.write_varint(buffer, lives)
+            Replay.write_varint(buffer, len(cells))
+            for cell in cells:
+                Replay.write_varint(buffer, cell)
+        return bytes(buffer)
+
+    def decode_keyframe(self, payload, previous_frame=None):
+        """
+        Decodes a keyframe into a frame snapshot
+
+        :param payload: The keyframe payload
+        :param previous_frame: The previous FrameSnapshot of the stream, used to interpolate the movement of the tick
+        :return: The decoded FrameSnapshot
+        """
+        try:
+            tick, offset = Replay.read_varint(payload, 0)
+            level_number, offset = Replay.read_varint(payload, offset)
+            flags = payload[offset]
+            offset += 1
+            food = None
+            if flags & self.FRAME_FOOD:
+                food, offset = self.read_food(payload, offset)
+            killed_player_numbers, offset = self.read_killed_player_numbers(payload, offset)
+            snake_count = payload[offset]
+            offset += 1
+            snakes = []
+            for _ in range(snake_count):
+                color_length = payload[offset]
+                color = tuple(payload[offset + 1:offset + 1 + color_length])
+                offset += 1 + color_length
+                player_number = payload[offset] or None
+                score, offset = Replay.read_varint(payload, offset + 1)
+                lives, offset = Replay.read_varint(payload, offset)
+                length, offset = Replay.read_varint(payload, offset)
+                cells = []
+                for _ in range(length):
+                    cell, offset = Replay.read_varint(payload, offset)
+                    cells.append(cell)
+                snakes.append((color, player_number, score, lives, tuple(cells)))
+        except IndexError:
+            raise ValueError("keyframe is truncated")
+        if previous_frame and previous_frame.level.number == level_number:
+            level = previous_frame.level
+        else:
+            level = self.get_level(level_number)
+            if not level:
+                raise ValueError("keyframe references level {0} which doesn't exist".format(level_number))
+        previous_snakes = previous_frame.snakes if previous_frame and previous_frame.level is level else ()
+        return FrameSnapshot(level, tick, bool(flags & self.FRAME_PAUSED), food, tuple(snakes), killed_player_numbers,
+                             previous_snakes, time.perf_counter(), self.tick_interval)
+
+    def encode_snake_delta(self, buffer, previous_snake, snake):
+        """
+        Appends the changes of a snake between two frame snapshots
+
+        :param buffer: The bytearray to append to
+        :param previous_snake: The snake tuple of the previous frame snapshot
+        :param snake: The snake tuple of the frame snapshot
+        """
+        _, _, previous_score, previous_lives, previous_cells = previous_snake
+        _, _, score, lives, cells = snake
+        flags_offset = len(buffer)
+        buffer.append(0)
+        flags = 0
+        if cells != previous_cells:
+            # the new body is the new head, the previous body without its dropped tail cells and the appended cells
+            length = len(previous_cells)
+            if cells[1:length + 1] == previous_cells:
+                dropped_cells = 0
+            elif cells[1:length] == previous_cells[:-1]:
+                dropped_cells = 1
+            else:
+                dropped_cells = length  # the snake was reset, the body is replaced
+            appended_cells = cells[length + 1 - dropped_cells:]
+            head = cells[0]
+            for direction_index in range(len(Directions.DIRECTIONS)):
+                if self.step(previous_cells[0], direction_index) == head:
+                    flags |= self.SNAKE_HEAD_STEP | direction_index
+                    break
+            else:
+                flags |= self.SNAKE_HEAD_CELL
+                Replay.write_varint(buffer, head)
+            if dropped_cells == 1 and not appended_cells:
+                flags |= self.SNAKE_TAIL_STEP
+            elif dropped_cells or appended_cells:
+                flags |= self.SNAKE_TAIL_CHANGE
+                Replay.write_varint(buffer, dropped_cells)
+                Replay.write_varint(buffer, len(appended_cells))
+                for cell in appended_cells:
+                    Replay.write_varint(buffer, cell)
+        if score != previous_score:
+            flags |= self.SNAKE_SCORE
+            Replay.write_varint(buffer, score)
+        if lives != previous_lives:
+            flags |= self.SNAKE_LIVES
+            Replay.write_varint(buffer, lives)
+        buffer[flags_offset] = flags
+
+    def decode_snake_delta(self, payload, offset, previous_snake):
+        """
+        Applies the changes written by encode_snake_delta to a snake
+
+        :param payload: The delta payload
+        :param offset: The offset of the changes of the snake in the payload
+        :param previous_snake: The snake tuple of the previous frame snapshot
+        :return: A (snake tuple, offset after the changes) tuple
+        """
+        color, player_number, score, lives, cells = previous_snake
+        flags = payload[offset]
+        offset += 1
+        head = None
+        if flags & self.SNAKE_HEAD_STEP:
+            head = self.step(cells[0], flags & self.SNAKE_DIRECTION_MASK)
+        elif flags & self.SNAKE_HEAD_CELL:
+            head, offset = Replay.read_varint(payload, offset)
+        dropped_cells = 0
+        appended_cells = ()
+        if flags & self.SNAKE_TAIL_STEP:
+            dropped_cells = 1
+        elif flags & self.SNAKE_TAIL_CHANGE:
+            dropped_cells, offset = Replay.read_varint(payload, offset)
+            appended_count, offset = Replay.read_varint(payload, offset)
+            appended_cells = []
+            for _ in range(appended_count):
+                cell, offset = Replay.read_varint(payload, offset)
+                appended_cells.append(cell)
+            appended_cells = tuple(appended_cells)
+        if head is not None or dropped_cells or appended_cells:
+            cells = ((head,) if head is not None else ()) + cells[:len(cells) - dropped_cells] + appended_cells
+        if flags & self.SNAKE_SCORE:
+            score, offset = Replay.read_varint(payload, offset)
+        if flags & self.SNAKE_LIVES:
+            lives, offset = Replay.read_varint(payload, offset)
+        return (color, player_number, score, lives, cells), offset
+
+    def encode_delta(self, previous_frame, frame):
+        """
+        Encodes the changes between two frame snapshots, can_encode_delta has to be checked first
+
+        :param previous_frame: The previous FrameSnapshot of the stream
+        :param frame: The FrameSnapshot to encode
+        :return: The bytes of the delta payload
+        """
+        buffer = bytearray()
+        Replay.write_varint(buffer, frame.tick)
+        flags = self.FRAME_PAUSED if frame.paused else 0
+        if frame.food != previous_frame.food:
+            flags |= self.FRAME_FOOD_CHANGED | (self.FRAME_FOOD if frame.food else 0)
+        buffer.append(flags)
+        if flags & self.FRAME_FOOD:
+            self.write_food(buffer, frame.food)
+        self.write_killed_player_numbers(buffer, frame.killed_player_numbers)
+        for previous_snake, snake in zip(previous_frame.snakes, frame.snakes):
+            self.encode_snake_delta(buffer, previous_snake, snake)
+        return bytes(buffer)
+
+    def decode_delta(self, payload, previous_frame):
+        """
+        Applies a delta to the previous frame snapshot of the stream
+
+        :param payload: The delta payload
+        :param previous_frame: The previous FrameSnapshot of the stream
+        :return: The decoded FrameSnapshot
+        """
+        if previous_frame is None:
+            raise ValueError("received a delta before a keyframe")
+        try:
+            tick, offset = Replay.read_varint(payload, 0)
+            flags = payload[offset]
+            offset += 1
+            food = previous_frame.food
+            if flags & self.FRAME_FOOD_CHANGED:
+                food = None
+                if flags & self.FRAME_FOOD:
+                    food, offset = self.read_food(payload, offset)
+            killed_player_numbers, offset = self.read_killed_player_numbers(payload, offset)
+            snakes = []
+            for previous_snake in previous_frame.snakes:
+                snake, offset = self.decode_snake_delta(payload, offset, previous_snake)
+                snakes.append(snake)
+        except IndexError:
+            raise ValueError("delta is truncated")
+        return FrameSnapshot(previous_frame.level, tick, bool(flags & self.FRAME_PAUSED), food, tuple(snakes),
+                             killed_player_numbers, previous_frame.snakes, time.perf_counter(), self.tick_interval)
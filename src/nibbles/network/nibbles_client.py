@@ -0,0 +1,133 @@
+import asyncio
+import os
+import pathlib
+from nibbles.level.level_registry import LevelRegistry
+from nibbles.level.level_parsers.level_parser_builder import LevelParserBuilder
+from nibbles.level.level_parsers.level_parser_types import LevelParserTypes
+from nibbles.network.protocol import Protocol
+from nibbles.network.frame_codec import FrameCodec
+
+
+class NibblesClient:
+    """
+    Represents a client that follows a game played by a NibblesServer
+
+    The client rebuilds the frame snapshots of the server from the keyframes and deltas it receives and publishes them
+    the same way a Nibbles instance does, so a Display can draw the game from the client. The levels are loaded from
+    the local level data, which has to contain the levels the server plays
+    """
+    def __init__(self, host, port, play=True, level_dir=None, cache_dir=None, interpolation=False,
+                 level_registry=None):
+        """
+        :param host: The host name or address of the server
+        :param port: The port of the server
+        :param play: Whether to control a snake (False to only watch the game)
+        :param level_dir: The path of the level data (None to use the level data of the server if it exists locally or
+                          the bundled levels otherwise)
+        :param cache_dir: The directory to cache compiled levels in (None to parse the levels on every launch)
+        :param interpolation: Whether the frame snapshots should carry the tick interval needed to interpolate them
+        :param level_registry: A LevelRegistry to share between clients (None to create one when connecting)
+        """
+        self.host = host
+        self.port = port
+        self.play = play
+        self.level_dir = level_dir
+        self.cache_dir = cache_dir
+        self.interpolation = interpolation
+        self.level_registry = level_registry
+        self.owns_level_registry = level_registry is None
+        self.intro = False  # read by the Display, a remote game has no intro
+        self.frame = None  # the FrameSnapshot last received
+        self.board_width = None
+        self.board_height = None
+        self.player_number = 0
+        self.tick_rate = None
+        self.codec = None
+        self.reader = None
+        self.writer = None
+        self.received_bytes = 0
+        self.keyframes_received = 0
+        self.deltas_received = 0
+
+    def create_level_registry(self, level_parser_type, level_dir):
+        """
+        Indexes the local levels of the level data path using the level parser type of the server
+
+        :param level_parser_type: The LevelParserTypes of the server
+        :param level_dir: The path of the level data on the server (None for the bundled levels)
+        :return: A LevelRegistry that parses the levels when they are needed
+        """
+        level_dir = self.level_dir or (level_dir if level_dir and os.path.exists(level_dir) else None)
+        if not level_dir:
+            nibbles_file_path = pathlib.Path(os.path.abspath(__file__)).parent.parent
+            level_dir = nibbles_file_path.joinpath('resources/levels')
+        level_parser = LevelParserBuilder(level_parser_type, self.cache_dir).build()
+        level_parser.set_data_source(self.board_width, self.board_height, level_dir)
+        return LevelRegistry(level_parser, prefetch=False)
+
+    async def connect(self):
+        """
+        Connects to the server and waits until it welcomes the client
+        """
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(Protocol.encode_join(self.play))
+        message_type, payload = await Protocol.read_message(self.reader)
+        if message_type != Protocol.WELCOME:
+            raise ValueError("expected a welcome message")
+        self.board_width, self.board_height, self.player_number, self.tick_rate, level_parser_type, level_dir = \
+            Protocol.decode_welcome(payload)
+        self.received_bytes += Protocol.HEADER.size + len(payload)
+        if not self.level_registry:
+            self.level_registry = self.create_level_registry(LevelParserTypes(level_parser_type), level_dir)
+        self.codec = FrameCodec(self.board_width, self.board_height, self.level_registry.get_level,
+                                1 / self.tick_rate if self.interpolation else 0.0)
+
+    async def receive_frame(self):
+        """
+        Waits for the next keyframe or delta and publishes the frame snapshot it describes
+
+        :return: The received FrameSnapshot, raises asyncio.IncompleteReadError when the server closed the connection
+        """
+        while True:
+            message_type, payload = await Protocol.read_message(self.reader)
+            self.received_bytes += Protocol.HEADER.size + len(payload)
+            if message_type == Protocol.KEYFRAME:
+                self.frame = self.codec.decode_keyframe(payload, self.frame)
+                self.keyframes_received += 1
+                return self.frame
+            if message_type == Protocol.DELTA:
+                self.frame = self.codec.decode_delta(payload, self.frame)
+                self.deltas_received += 1
+                return self.frame
+
+    def send_turn(self, direction):
+        """
+        Asks the server to turn the snake of the client, must be called on the event loop of the client
+
+        :param direction: The direction the snake should move
+        """
+        if self.player_number:
+            self.writer.write(Protocol.encode_turn(direction))
+
+    async def run(self):
+        """
+        Receives frame snapshots until the server closes the connection
+        """
+        try:
+            while True:
+                await self.receive_frame()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    async def close(self):
+        """
+        Closes the connection and releases the level registry if the client created it
+        """
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+        if self.level_registry and self.owns_level_registry:
+            self.level_registry.shutdown()
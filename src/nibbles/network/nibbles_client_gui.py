@@ -0,0 +1,74 @@
+import asyncio
+from threading import Thread
+from nibbles.display import Display
+from nibbles.nibbles_gui import NibblesGUI
+from nibbles.network.nibbles_client import NibblesClient
+import pygame
+from pygame.locals import *
+
+
+class NibblesClientGUI:
+    """
+    Represents a gui that shows a game played by a NibblesServer and sends the turns of the local player to it
+
+    The client receives the game on an event loop running on a background thread, the main thread draws the frame
+    snapshot the client received last and forwards key presses to the event loop. The arrow keys and WASD both control
+    the snake of the client
+    """
+    def __init__(self, host, port, display_scale, refresh_rate, play=True, incremental_rendering=True, cache_dir=None,
+                 level_dir=None, interpolation=False):
+        """
+        :param host: The host name or address of the server
+        :param port: The port of the server
+        :param display_scale: The multiplier to apply to the game board resolution to obtain the display resolution
+        :param refresh_rate: How many times a second the display should be updated
+        :param play: Whether to control a snake (False to only watch the game)
+        :param incremental_rendering: Whether to only redraw the parts of the screen that changed while playing
+        :param cache_dir: The directory to cache compiled levels and scaled assets in
+        :param level_dir: The path of the level data (None to pick it like NibblesClient does)
+        :param interpolation: Whether to slide the heads and tails of the snakes between ticks
+        """
+        self.loop = asyncio.new_event_loop()
+        self.client = NibblesClient(host, port, play, level_dir, cache_dir, interpolation)
+        self.loop.run_until_complete(self.client.connect())
+        self.display = Display(self.client, display_scale, refresh_rate, incremental_rendering, cache_dir,
+                               interpolation)
+        self.stopped = False
+
+    def handle_keyboard(self, events):
+        """
+        Handles the input from the keyboard and sends the turns of the player to the server
+
+        :param: events: Array of pygame events
+        """
+        for event in events:
+            if event.type == QUIT or event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                self.stopped = True
+            elif event.type == pygame.KEYDOWN:
+                binding = NibblesGUI.KEY_BINDINGS.get(event.key)
+                if binding:
+                    self.loop.call_soon_threadsafe(self.client.send_turn, binding[1])
+
+    def network_loop(self):
+        """
+        Receives the game until the server closes the connection or the gui is closed
+        """
+        self.loop.run_until_complete(self.client.run())
+        self.stopped = True
+
+    def start(self):
+        """
+        Shows the game until the window is closed, escape is pressed or the server closes the connection
+        """
+        network_thread = Thread(target=self.network_loop)
+        network_thread.start()
+        clock = pygame.time.Clock()
+        while not self.stopped:
+            self.handle_keyboard(pygame.event.get())
+            self.display.draw_frame()
+            clock.tick(self.display.refresh_rate)
+        self.loop.call_soon_threadsafe(self.client.writer.close)
+        network_thread.join()
+        self.loop.run_until_complete(self.client.close())
+        self.loop.close()
+        pygame.quit()
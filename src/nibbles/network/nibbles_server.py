@@ -0,0 +1,212 @@
+import asyncio
+from nibbles.input_queue import InputQueue
+from nibbles.fixed_timestep_scheduler import FixedTimestepScheduler
+from nibbles.ai.ai_executors.inline_ai_executor import InlineAiExecutor
+from nibbles.network.protocol import Protocol
+from nibbles.network.frame_codec import FrameCodec
+from nibbles.network.client_connection import ClientConnection
+
+
+class NibblesServer:
+    """
+    Represents an asyncio server that plays the authoritative game and streams it to its clients
+
+    The game runs on the event loop at the tick rate of the game difficulty, only the AI directions are calculated in
+    the default executor of the loop, so connections and turns are still served while the AI thinks. After every tick
+    the frame snapshot of the game is encoded once and the same bytes are queued on every connection, as a delta of the
+    previous frame snapshot or, every keyframe_interval frames and whenever a delta can't describe the change, as a
+    keyframe. A client that joins or falls so far behind that its unsent bytes exceed max_write_buffer_size skips the
+    deltas until the next frame, which it receives as a keyframe. Clients that control a snake send turns, which are
+    buffered in an InputQueue and applied one per tick
+    """
+    def __init__(self, nibbles, ai_executor=None, host='127.0.0.1', port=0, keyframe_interval=60, resume_delay=2.0,
+                 max_buffered_turns=3, max_write_buffer_size=65536):
+        """
+        :param nibbles: The Nibbles instance to play, the intro must be skipped
+        :param ai_executor: The AI executor that calculates the directions of the AI snakes (None to run them inline)
+        :param host: The host name or address to listen on
+        :param port: The port to listen on (0 to pick a free port)
+        :param keyframe_interval: The number of frames between two keyframes
+        :param resume_delay: The number of seconds the game stays paused after a snake lost a life
+        :param max_buffered_turns: The maximum number of turns to buffer per player
+        :param max_write_buffer_size: The number of unsent bytes above which a client skips frames
+        """
+        self.nibbles = nibbles
+        self.ai_executor = ai_executor if ai_executor else InlineAiExecutor()
+        self.host = host
+        self.port = port
+        self.keyframe_interval = keyframe_interval
+        self.resume_delay = resume_delay
+        self.max_write_buffer_size = max_write_buffer_size
+        self.codec = FrameCodec(nibbles.board_width, nibbles.board_height)
+        self.input_queue = InputQueue(range(1, nibbles.number_of_players + 1), max_buffered_turns)
+        self.scheduler = FixedTimestepScheduler(self.calculate_tick_rate())
+        self.connections = []
+        self.server = None
+        self.stopped = False
+        self.frame = None  # the FrameSnapshot last sent, the next delta is encoded against it
+        self.frames_since_keyframe = 0
+        self.paused_at = None
+        self.keyframes_encoded = 0
+        self.deltas_encoded = 0
+
+    @property
+    def keyframe_interval(self):
+        return self._keyframe_interval
+
+    @keyframe_interval.setter
+    def keyframe_interval(self, keyframe_interval):
+        if not isinstance(keyframe_interval, int):
+            raise ValueError("keyframe interval must be an integer")
+        if keyframe_interval < 1:
+            raise ValueError("keyframe interval must be greater than 0")
+        self._keyframe_interval = keyframe_interval
+
+    def calculate_tick_rate(self):
+        """
+        Calculates the number of ticks per second of the current game difficulty
+
+        :return: The number of ticks per second
+        """
+        return 15 * ((1 + self.nibbles.game_difficulty) / 2)
+
+    async def start(self):
+        """
+        Loads the level and starts listening for connections, the port is updated with the port that was picked
+        """
+        if not self.nibbles.loaded_level:
+            self.nibbles.initialize_level()
+        self.frame = self.nibbles.create_frame()
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """
+        Stops the game, closes every connection and releases the workers of the game
+        """
+        self.stopped = True
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        for connection in self.connections:
+            connection.writer.close()
+        self.ai_executor.shutdown()
+        self.nibbles.level_registry.shutdown()
+
+    def reserve_player_number(self):
+        """
+        Returns the lowest player number that no connected client controls
+
+        :return: The player number or 0 if every player snake is controlled already
+        """
+        taken_player_numbers = {connection.player_number for connection in self.connections}
+        for player_number in range(1, self.nibbles.number_of_players + 1):
+            if player_number not in taken_player_numbers:
+                return player_number
+        return 0
+
+    async def handle_connection(self, reader, writer):
+        """
+        Welcomes a client, sends it a keyframe of the game and buffers its turns until it disconnects
+
+        :param reader: The asyncio StreamReader of the connection
+        :param writer: The asyncio StreamWriter of the connection
+        """
+        connection = None
+        try:
+            message_type, payload = await Protocol.read_message(reader)
+            if message_type != Protocol.JOIN:
+                raise ValueError("expected a join message")
+            play = Protocol.decode_join(payload)
+            connection = ClientConnection(writer, self.reserve_player_number() if play else 0)
+            connection.send(Protocol.encode_welcome(self.nibbles.board_width, self.nibbles.board_height,
+                                                    connection.player_number, self.scheduler.tick_rate,
+                                                    self.nibbles.level_parser_type, self.nibbles.level_dir))
+            connection.send(Protocol.encode_message(Protocol.KEYFRAME, self.codec.encode_keyframe(self.frame)))
+            connection.needs_keyframe = False
+            self.connections.append(connection)
+            while not self.stopped:
+                message_type, payload = await Protocol.read_message(reader)
+                if message_type == Protocol.TURN and connection.player_number:
+                    self.input_queue.push(connection.player_number, Protocol.decode_turn(payload))
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass  # the client disconnected or sent a message that isn't part of the protocol
+        finally:
+            if connection in self.connections:
+                self.connections.remove(connection)
+            writer.close()
+
+    def broadcast_frame(self):
+        """
+        Sends the current state of the game to every client
+        """
+        previous_frame = self.frame
+        frame = self.nibbles.create_frame()
+        delta = None
+        keyframe = None
+        keyframe_due = self.frames_since_keyframe >= self.keyframe_interval - 1
+        if not keyframe_due and self.codec.can_encode_delta(previous_frame, frame):
+            delta = Protocol.encode_message(Protocol.DELTA, self.codec.encode_delta(previous_frame, frame))
+            self.deltas_encoded += 1
+            self.frames_since_keyframe += 1
+        else:
+            self.frames_since_keyframe = 0
+        for connection in self.connections:
+            if connection.is_congested(self.max_write_buffer_size):
+                connection.needs_keyframe = True
+                connection.skipped_frames += 1
+            elif delta and not connection.needs_keyframe:
+                connection.send(delta)
+            else:
+                if not keyframe:
+                    keyframe = Protocol.encode_message(Protocol.KEYFRAME, self.codec.encode_keyframe(frame))
+                    self.keyframes_encoded += 1
+                connection.send(keyframe)
+                connection.needs_keyframe = False
+        self.frame = frame
+
+    async def play_tick(self):
+        """
+        Updates the game by one tick and sends the new state of the game to every client, nothing else modifies the
+        game while the AI reads it in the default executor
+        """
+        nibbles = self.nibbles
+        self.input_queue.apply_turns(nibbles.snakes)
+        await asyncio.get_running_loop().run_in_executor(None, self.ai_executor.calculate_ai_directions, nibbles)
+        nibbles.update()
+        if nibbles.snake_reset_needed:
+            nibbles.reset_snakes()
+            self.input_queue.clear()
+        if nibbles.stopped:
+            nibbles.restart_level()  # game over, the server keeps running with a new game
+            nibbles.paused = True
+            self.input_queue.clear()
+        self.broadcast_frame()
+
+    async def run(self):
+        """
+        Plays the game at the tick rate of the game difficulty until the server is stopped, the game resumes on its own
+        resume_delay seconds after it was paused
+        """
+        if not self.server:
+            await self.start()
+        loop = asyncio.get_running_loop()
+        scheduler = self.scheduler
+        scheduler.reset()
+        while not self.stopped:
+            scheduler.tick_rate = self.calculate_tick_rate()
+            if self.nibbles.paused:
+                scheduler.reset()  # don't catch up on the time spent paused
+                self.input_queue.pause()
+                if self.paused_at is None:
+                    self.paused_at = loop.time()
+                elif loop.time() - self.paused_at >= self.resume_delay:
+                    self.paused_at = None
+                    self.nibbles.paused = False
+                    self.broadcast_frame()
+            else:
+                for _ in range(scheduler.advance()):
+                    if self.nibbles.paused:
+                        break  # a snake died, the remaining ticks wait until the game resumes
+                    await self.play_tick()
+            await asyncio.sleep(scheduler.time_until_next_tick())
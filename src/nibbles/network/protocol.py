@@ -0,0 +1,141 @@
+import struct
+from nibbles.directions import Directions
+from nibbles.replay.replay import Replay
+
+
+class Protocol:
+    """
+    Represents the messages the nibbles server and its clients exchange over a stream
+
+    Every message is a header with the length of its payload and its type followed by the payload. A client sends a
+    join message, the server answers with a welcome message and then streams a keyframe or a delta for every tick. A
+    client that controls a snake sends a turn message for every key press
+    """
+    MAGIC = b'NBNP'
+    VERSION = 2
+    HEADER = struct.Struct('<IB')
+    JOIN_FORMAT = struct.Struct('<4sHB')
+    WELCOME_FORMAT = struct.Struct('<HHBd')
+    MAX_PAYLOAD_SIZE = 0xFFFFFFFF
+
+    JOIN = 1
+    WELCOME = 2
+    KEYFRAME = 3
+    DELTA = 4
+    TURN = 5
+
+    @staticmethod
+    def encode_message(message_type, payload=b''):
+        """
+        Prefixes a payload with the message header
+
+        :param message_type: The type of the message
+        :param payload: The bytes of the payload
+        :return: The bytes of the message
+        """
+        if len(payload) > Protocol.MAX_PAYLOAD_SIZE:
+            raise ValueError("message payload is too large")
+        return Protocol.HEADER.pack(len(payload), message_type) + payload
+
+    @staticmethod
+    async def read_message(reader):
+        """
+        Reads the next message from a stream
+
+        :param reader: The asyncio StreamReader to read from
+        :return: A (message type, payload) tuple, raises asyncio.IncompleteReadError when the stream ends
+        """
+        payload_size, message_type = Protocol.HEADER.unpack(await reader.readexactly(Protocol.HEADER.size))
+        payload = await reader.readexactly(payload_size) if payload_size else b''
+        return message_type, payload
+
+    @staticmethod
+    def encode_join(play):
+        """
+        Encodes the message a client starts the connection with
+
+        :param play: Whether the client wants to control a snake (False to only watch the game)
+        :return: The bytes of the message
+        """
+        return Protocol.encode_message(Protocol.JOIN, Protocol.JOIN_FORMAT.pack(Protocol.MAGIC, Protocol.VERSION, play))
+
+    @staticmethod
+    def decode_join(payload):
+        """
+        Decodes the payload of a join message
+
+        :param payload: The payload of the message
+        :return: Whether the client wants to control a snake
+        """
+        if len(payload) != Protocol.JOIN_FORMAT.size:
+            raise ValueError("join message is truncated")
+        magic, version, play = Protocol.JOIN_FORMAT.unpack(payload)
+        if magic != Protocol.MAGIC or version != Protocol.VERSION:
+            raise ValueError("unsupported protocol version")
+        return bool(play)
+
+    @staticmethod
+    def encode_welcome(board_width, board_height, player_number, tick_rate, level_parser_type, level_dir=None):
+        """
+        Encodes the message the server accepts a connection with
+
+        :param board_width: The width of the game board
+        :param board_height: The height of the game board
+        :param player_number: The player number of the snake the client controls (0 if it only watches the game)
+        :param tick_rate: The number of ticks per second of the game
+        :param level_parser_type: The LevelParserTypes the levels are loaded with
+        :param level_dir: The path of the level data on the server (None for the bundled levels)
+        :return: The bytes of the message
+        """
+        buffer = bytearray(Protocol.WELCOME_FORMAT.pack(board_width, board_height, player_number, tick_rate))
+        for text in (str(level_parser_type), str(level_dir or '')):
+            encoded_text = text.encode('utf-8')
+            Replay.write_varint(buffer, len(encoded_text))
+            buffer += encoded_text
+        return Protocol.encode_message(Protocol.WELCOME, bytes(buffer))
+
+    @staticmethod
+    def decode_welcome(payload):
+        """
+        Decodes the payload of a welcome message
+
+        :param payload: The payload of the message
+        :return: A (board width, board height, player number, tick rate, level parser type, level dir) tuple, the
+                 level parser type is a string and the level dir is None for the bundled levels
+        """
+        if len(payload) < Protocol.WELCOME_FORMAT.size:
+            raise ValueError("welcome message is truncated")
+        board_width, board_height, player_number, tick_rate = Protocol.WELCOME_FORMAT.unpack_from(payload)
+        try:
+            offset = Protocol.WELCOME_FORMAT.size
+            texts = []
+            for _ in range(2):
+                length, offset = Replay.read_varint(payload, offset)
+                texts.append(bytes(payload[offset:offset + length]).decode('utf-8'))
+                offset += length
+        except IndexError:
+            raise ValueError("welcome message is truncated")
+        level_parser_type, level_dir = texts
+        return board_width, board_height, player_number, tick_rate, level_parser_type, level_dir or None
+
+    @staticmethod
+    def encode_turn(direction):
+        """
+        Encodes the message a client requests a turn of its snake with
+
+        :param direction: The direction the snake should move
+        :return: The bytes of the message
+        """
+        return Protocol.encode_message(Protocol.TURN, bytes((Directions.DIRECTIONS.index(direction),)))
+
+    @staticmethod
+    def decode_turn(payload):
+        """
+        Decodes the payload of a turn message
+
+        :param payload: The payload of the message
+        :return: The direction the snake should move
+        """
+        if len(payload) != 1 or payload[0] >= len(Directions.DIRECTIONS):
+            raise ValueError("invalid turn message")
+        return Directions.DIRECTIONS[payload[0]]
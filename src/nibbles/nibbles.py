@@ -1,18 +1,26 @@
 import os
 import pathlib
+import time
+from array import array
 from random import Random
 from nibbles.level.level_parsers.level_parser_builder import LevelParserBuilder
+from nibbles.coordinate import Coordinate
 from nibbles.directions import Directions
 from nibbles.snake_body import SnakeBody
 from nibbles.snake import Snake
+from nibbles.collision_map import CollisionMap
 from nibbles.ai import Ai
 from nibbles.food import Food
-from nibbles.level import Level
+from nibbles.level.level_registry import LevelRegistry
+from nibbles.snapshot.game_snapshot import GameSnapshot
+from nibbles.snapshot.snake_snapshot import SnakeSnapshot
+from nibbles.snapshot.frame_snapshot import FrameSnapshot
 
 
 class Nibbles:
     def __init__(self, snake_colors: list, board_width, board_height, initial_game_difficulty, number_of_players,
-                 number_of_ai, ai_difficulty_level, level_parser_type, initial_level_number, skip_intro):
+                 number_of_ai, ai_difficulty_level, level_parser_type, initial_level_number, skip_intro, cache_dir=None,
+                 level_dir=None, seed=None, prefetch=True):
         """
         :param: snake_colors: A list of unique colors that the snakes can be, must be 8
         :param: board_width: The width of the game board
@@ -24,6 +32,12 @@ class Nibbles:
         :param: level_parser_type: The type of the level parser to use when parsing levels
         :param: initial_level_number: The index of the level to play
         :param: skip_intro: Determines whether the intro should be played
+        :param: cache_dir: The directory to cache compiled levels in (None to parse the levels on every launch)
+        :param: level_dir: The path of the level data to parse (None to use the bundled levels)
+        :param: seed: The seed of the random number generator, games with the same seed and inputs play out the same
+                      (None to pick a random seed)
+        :param: prefetch: Determines whether levels are parsed on a background thread before they are needed (False for
+                          headless games that never leave their level)
         """
         self.stopped = False
         self.paused = True  # Start paused to give the players some time to figure out where they are
@@ -42,12 +56,20 @@ class Nibbles:
         self.number_of_players = number_of_players
         self.number_of_ai = number_of_ai
         self.ai_difficulty_level = ai_difficulty_level
-        self.collision_map = []
+        self.collision_map = None
         self.snakes = []
         self.killed_snakes = []
-        self.levels = self.parse_levels(level_parser_type)
+        self.level_parser_type = level_parser_type
+        self.level_dir = level_dir
+        self.level_registry = self.create_level_registry(level_parser_type, cache_dir, level_dir, prefetch)
         self.level_number = initial_level_number
-        self.food = None
+        self.level_registry.prefetch_level(self.level_number)
+        self.food = None  # None while the level is not loaded or there is no free food spawn
+        self.seed = seed if seed is not None else Random().getrandbits(64)
+        self.random = Random(self.seed)
+        self.tick = 0  # the number of updates since the level was loaded
+        self.snapshot_history = None  # set to a SnapshotHistory to take a snapshot before every update
+        self.frame = None  # the FrameSnapshot last published by publish_frame, the only state the renderer reads
 
     @property
     def snake_colors(self):
@@ -60,14 +82,24 @@ class Nibbles:
         self._snake_colors = snake_colors
 
     @property
-    def levels(self):
-        return self._levels
+    def seed(self):
+        return self._seed
+
+    @seed.setter
+    def seed(self, seed):
+        if not isinstance(seed, int) or not 0 <= seed < 2 ** 64:
+            raise ValueError("seed must be an integer between 0 and 2^64 - 1")
+        self._seed = seed
+
+    @property
+    def level_registry(self):
+        return self._level_registry
 
-    @levels.setter
-    def levels(self, levels):
-        if len(levels) == 0 or not isinstance(levels[0], Level):
+    @level_registry.setter
+    def level_registry(self, level_registry):
+        if len(level_registry) == 0:
             raise ValueError("levels must contain at least one level")
-        self._levels = levels
+        self._level_registry = level_registry
 
     @property
     def board_width(self):
@@ -131,42 +163,48 @@ class Nibbles:
 
     def create_collision_map(self):
         """
-        Creates a 3D collision map
+        Creates a collision map the size of the game board
 
-        :return: A 3D collision map
+        :return: A collision map the size of the game board
         """
-        return [[[] for _ in range(self.board_height)] for _ in range(self.board_width)]
+        return CollisionMap(self.board_width, self.board_height)
 
-    def parse_levels(self, level_parser_type):
+    def create_level_registry(self, level_parser_type, cache_dir=None, level_dir=None, prefetch=True):
         """
-        Parses levels from level resource folder using the specified level parser type
+        Indexes the levels in the level data path using the specified level parser type
 
         :param level_parser_type: The level parser type to use
-        :return: Parsed levels
+        :param cache_dir: The directory to cache compiled levels in (None to disable the level cache)
+        :param level_dir: The path of the level data (None to use the level resource folder)
+        :param prefetch: Determines whether the registry can parse levels on a background thread
+        :return: A LevelRegistry that parses the levels when they are needed
         """
-        level_parser_builder = LevelParserBuilder(level_parser_type)
+        level_parser_builder = LevelParserBuilder(level_parser_type, cache_dir)
         level_parser = level_parser_builder.build()
-        nibbles_file_path = pathlib.Path(os.path.abspath(__file__)).parent
-        nibbles_file_path.resolve()
-        level_dir = nibbles_file_path.joinpath('resources/levels')
+        if not level_dir:
+            nibbles_file_path = pathlib.Path(os.path.abspath(__file__)).parent
+            nibbles_file_path.resolve()
+            level_dir = nibbles_file_path.joinpath('resources/levels')
         level_parser.set_data_source(self.board_width, self.board_height, level_dir)
-        return level_parser.parse_levels()
+        return LevelRegistry(level_parser, prefetch=prefetch)
 
-    def place_coordinate_into_collision_map(self, coordinate):
+    def place_coordinate_into_collision_map(self, coordinate, owner=CollisionMap.NO_OWNER):
         """
         Places a coordinate into the collision map
 
         :param coordinate: The coordinate to place into to the collision map
+        :param owner: The id of the snake that owns the coordinate
         """
-        self.collision_map[coordinate.column][coordinate.row].append(coordinate)
+        self.collision_map.place(coordinate, owner)
 
-    def remove_coordinate_from_collision_map(self, coordinate):
+    def remove_coordinate_from_collision_map(self, coordinate, owner=CollisionMap.NO_OWNER):
         """
         Removes a coordinate from the collision map
 
         :param coordinate: The coordinate to remove from the collision map
+        :param owner: The id of the snake that owns the coordinate
         """
-        self.collision_map[coordinate.column][coordinate.row].remove(coordinate)
+        self.collision_map.remove(coordinate, owner)
 
     def initialize_barriers(self):
         """
@@ -179,38 +217,43 @@ class Nibbles:
         """
         Finds a random food spawn location that is not taken by any other game object
 
-        :return: A random food spawn coordinate that is not taken by any other game object
+        :return: A random food spawn coordinate that is not taken by any other game object or None if the board is full
         """
-        random = Random()
-        food_spawns = []
-        for spawn in self.loaded_level.food_spawns:
-            if len(self.collision_map[spawn.column][spawn.row]) == 0:
-                food_spawns.append(spawn)
-        if len(food_spawns) == 0:
-            raise RuntimeError("Can't locate a valid spawn")
-        return random.choice(food_spawns)
+        spawn_index = self.collision_map.free_cells.choice(self.random)
+        if spawn_index is None:
+            return None
+        column, row = self.collision_map.position(spawn_index)
+        return Coordinate(row, column)
 
     def create_food(self):
         """
         Creates a new food item
 
-        :return: The new food item
+        :return: The new food item or None if the board is full
         """
-        random = Random()
-        food = Food(points=random.randint(1, 9))
+        food = Food(points=self.random.randint(1, 9))
         temp_coord = self.find_random_food_spawn()
+        if temp_coord is None:
+            return None
         food.row = temp_coord.row
         food.column = temp_coord.column
         return food
 
+    def spawn_food(self):
+        """
+        Creates a new food item and places it into the collision map, the food stays None while the board is full
+        """
+        self.food = self.create_food()
+        if self.food:
+            self.place_coordinate_into_collision_map(self.food)
+
     def reserve_random_color(self):
         """
         Returns a random choice from the available colors list and removes it from the list
 
         :return: A random choice from the available colors list and removes it from the list
         """
-        random = Random()
-        return self.available_colors.pop(random.randint(0, len(self.available_colors) - 1))
+        return self.available_colors.pop(self.random.randint(0, len(self.available_colors) - 1))
 
     def initialize_snakes(self):
         """
@@ -226,19 +269,21 @@ class Nibbles:
         for i in range(number_of_snakes_to_spawn):
             head_spawn_coord = self.loaded_level.initial_snake_head_spawns[i]
             head = SnakeBody(head_spawn_coord.row, head_spawn_coord.column)
-            self.snakes.append(Snake(head, self.reserve_random_color()))
-            self.place_coordinate_into_collision_map(head)
+            self.snakes.append(Snake(head, self.reserve_random_color(), snake_id=i + 1))
+            self.place_coordinate_into_collision_map(head, i + 1)
 
     def initialize_level(self):
         """
         Loads the currently selected level number into the game
         """
-        self.collision_map = self.create_collision_map()
-        for level in self.levels:
-            if level.number == self.level_number:
-                self.loaded_level = level
-        if not self.loaded_level:
+        level = self.level_registry.get_level(self.level_number)
+        if not level:
             raise RuntimeError("tried to load level {0} which doesn't exist".format(self.level_number))
+        self.loaded_level = level
+        self.tick = 0
+        self.level_registry.prefetch_level(self.level_registry.next_level_number(self.level_number))
+        self.collision_map = self.create_collision_map()
+        self.collision_map.track_free_cells(self.loaded_level.food_spawns)
         self.initialize_barriers()
         self.initialize_snakes()
         for x in range(len(self.snakes)):
@@ -248,8 +293,23 @@ class Nibbles:
             else:
                 self.snakes[x].on_update_direction = Ai.resolve_difficulty_level(self.ai_difficulty_level)
                 self.snakes[x].lives = 2  # these guys are hard, give them less chances to make me cry
-        self.food = self.create_food()
-        self.place_coordinate_into_collision_map(self.food)
+        self.spawn_food()
+
+    def restart_level(self, seed=None):
+        """
+        Throws away the current game and loads the currently selected level number again with a new seed
+
+        :param seed: The seed of the random number generator for the new game (None to draw one from the current one)
+        """
+        self.seed = seed if seed is not None else self.random.getrandbits(64)
+        self.random = Random(self.seed)
+        self.available_colors = self.snake_colors.copy()
+        self.snakes = []
+        self.killed_snakes = []
+        self.food = None
+        self.stopped = False
+        self.snake_reset_needed = False
+        self.initialize_level()
 
     def reset_snakes(self):
         """
@@ -263,7 +323,8 @@ class Nibbles:
             head_spawn_coord = self.loaded_level.initial_snake_head_spawns[snake_index]
             self.snakes[snake_index].head.row = head_spawn_coord.row
             self.snakes[snake_index].head.column = head_spawn_coord.column
-            self.place_coordinate_into_collision_map(self.snakes[snake_index].head)
+            self.place_coordinate_into_collision_map(self.snakes[snake_index].head,
+                                                     self.snakes[snake_index].snake_id)
 
     def update_snake_position(self, snake):
         """
@@ -273,17 +334,17 @@ class Nibbles:
         """
         if snake.direction_to_move == Directions.OPPOSITE_DIRECTIONS[snake.last_direction_moved]:
             snake.direction_to_move = snake.last_direction_moved
-        end_piece = snake.body.pop(-1)
-        self.remove_coordinate_from_collision_map(end_piece)
+        end_piece = snake.body.pop()
+        self.remove_coordinate_from_collision_map(end_piece, snake.snake_id)
         end_piece.row = snake.head.row
         end_piece.column = snake.head.column
-        snake.body.insert(0, end_piece)
+        snake.body.appendleft(end_piece)
         snake.head = end_piece
         snake.head.row += snake.direction_to_move[1]
         snake.head.row = self.board_height - 1 if snake.head.row < 0 else snake.head.row % self.board_height
         snake.head.column += snake.direction_to_move[0]
         snake.head.column = self.board_width - 1 if snake.head.column < 0 else snake.head.column % self.board_width
-        self.place_coordinate_into_collision_map(snake.head)
+        self.place_coordinate_into_collision_map(snake.head, snake.snake_id)
         snake.last_direction_moved = snake.direction_to_move
 
     def increase_snake_length(self, snake):
@@ -294,7 +355,7 @@ class Nibbles:
         """
         new_tail = SnakeBody(snake.body[-1].row, snake.body[-1].column)
         snake.body.append(new_tail)
-        self.place_coordinate_into_collision_map(new_tail)
+        self.place_coordinate_into_collision_map(new_tail, snake.snake_id)
 
     def remove_snake_from_collision_map(self, snake):
         """
@@ -303,7 +364,7 @@ class Nibbles:
         :param snake: The snake to remove from the collision map
         """
         for body_piece in snake.body:
-            self.remove_coordinate_from_collision_map(body_piece)
+            self.remove_coordinate_from_collision_map(body_piece, snake.snake_id)
 
     def should_snake_lose_life(self, snake):
         """
@@ -312,18 +373,17 @@ class Nibbles:
         :param: snake: The snake to check for death
         :return: A boolean representing if the snake should lose a life
         """
-        head_playable_space = self.collision_map[snake.head.column][snake.head.row]
-        if len(head_playable_space) > 1:
-            for coord in head_playable_space:
-                if coord != self.food and coord != snake.head:
-                    return True
-        return False
+        return self.collision_map.count(snake.head.column, snake.head.row) > 1
 
     def update(self):
         """
         The main game logic that updates each frame
         """
+        if self.snapshot_history is not None:
+            self.snapshot_history.append(self.create_snapshot())
         self.killed_snakes.clear()
+        if not self.food:
+            self.spawn_food()  # the board was full, try again now that the snakes have moved
         for snake in self.snakes:
             self.update_snake_position(snake)
             if self.should_snake_lose_life(snake):
@@ -335,10 +395,169 @@ class Nibbles:
                     self.increase_snake_length(snake)
                 snake.score += self.food.points
                 self.remove_coordinate_from_collision_map(self.food)
-                self.food = self.create_food()
-                self.place_coordinate_into_collision_map(self.food)
+                self.spawn_food()
         for snake in self.killed_snakes:
             if not snake.alive:
                 self.remove_snake_from_collision_map(snake)
                 self.snakes.remove(snake)
                 self.stopped = len(self.snakes) == 0  # game over
+        self.tick += 1
+
+    def create_snapshot(self):
+        """
+        Captures the state of the game so it can be restored later
+
+        :return: A GameSnapshot of the current state of the game
+        """
+        width = self.board_width
+        food = (self.food.column + self.food.row * width, self.food.points) if self.food else None
+        snakes = tuple(SnakeSnapshot(snake.snake_id, snake.color, snake.lives, snake.score, snake.player_number,
+                                     snake.on_update_direction, snake.last_direction_moved, snake.direction_to_move,
+                                     snake.resets,
+                                     array('i', [chunk.column + chunk.row * width for chunk in snake.body]))
+                       for snake in self.snakes)
+        return GameSnapshot(self.loaded_level.number, self.tick, self.stopped, self.snake_reset_needed,
+                            self.random.getstate(), tuple(self.available_colors), food, snakes)
+
+    def create_frame(self, tick_interval=0.0):
+        """
+        Captures what the renderer needs to draw the current state of the game
+
+        :param tick_interval: The number of seconds until the next tick is due (0 to disable interpolation)
+        :return: A FrameSnapshot of the current state of the game
+        """
+        width = self.board_width
+        food = (self.food.column, self.food.row, self.food.points) if self.food else None
+        snakes = tuple((snake.color, snake.player_number, snake.score, snake.lives,
+                        tuple([chunk.column + chunk.row * width for chunk in snake.body]))
+                       for snake in self.snakes)
+        previous_snakes = self.frame.snakes if self.frame and self.frame.level is self.loaded_level else ()
+        return FrameSnapshot(self.loaded_level, self.tick, self.paused, food, snakes,
+                             tuple(snake.player_number for snake in self.killed_snakes), previous_snakes,
+                             time.perf_counter(), tick_interval)
+
+    def publish_frame(self, tick_interval=0.0):
+        """
+        Replaces the published frame with a frame of the current state of the game, must be called by the thread that
+        updates the game. Assigning the attribute is atomic, so the renderer sees either the previous or the new frame
+        and never has to wait for the game thread
+
+        :param tick_interval: The number of seconds until the next tick is due (0 to disable interpolation)
+        """
+        self.frame = self.create_frame(tick_interval)
+
+    def restore_snapshot(self, snapshot):
+        """
+        Restores the state of the game from a snapshot taken on the currently loaded level, only the snake body chunks
+        and the collision map cells that differ from the snapshot are updated
+
+        :param snapshot: The GameSnapshot to restore
+        """
+        if not self.loaded_level or snapshot.level_number != self.loaded_level.number:
+            raise ValueError("the snapshot was taken on another level")
+        width = self.board_width
+        collision_map = self.collision_map
+        current_snakes = {snake.snake_id: snake for snake in self.snakes}
+        for snake_snapshot in snapshot.snakes:
+            current_snakes.pop(snake_snapshot.snake_id, None)
+        for snake in current_snakes.values():
+            self.remove_snake_from_collision_map(snake)
+
+        food_index = self.food.column + self.food.row * width if self.food else None
+        snapshot_food_index = snapshot.food[0] if snapshot.food else None
+        if food_index != snapshot_food_index:
+            if food_index is not None:
+                collision_map.remove_index(food_index, CollisionMap.CELL_FOOD)
+            if snapshot_food_index is not None:
+                collision_map.place_index(snapshot_food_index, CollisionMap.CELL_FOOD)
+        self.food = Food(snapshot_food_index // width, snapshot_food_index % width, snapshot.food[1]) \
+            if snapshot.food else None
+
+        current_snakes = {snake.snake_id: snake for snake in self.snakes}
+        snakes = []
+        for snake_snapshot in snapshot.snakes:
+            snake = current_snakes.get(snake_snapshot.snake_id)
+            # a snake moves one cell every tick, so its body is a window of the cells its head went through that only
+            # starts over when the snake is reset
+            if snake and snake.resets == snake_snapshot.resets:
+                self.restore_snake_body(snake, snake_snapshot.body, self.tick - snapshot.tick)
+            else:
+                if not snake:
+                    snake = Snake(SnakeBody(), snake_snapshot.color, snake_id=snake_snapshot.snake_id)
+                    snake.body.clear()
+                self.restore_snake_body(snake, snake_snapshot.body, None)
+            snake.color = snake_snapshot.color
+            snake.lives = snake_snapshot.lives
+            snake.resets = snake_snapshot.resets
+            snake.alive = snake.calculate_alive()
+            snake.score = snake_snapshot.score
+            snake.player_number = snake_snapshot.player_number
+            snake.on_update_direction = snake_snapshot.on_update_direction
+            snake.last_direction_moved = snake_snapshot.last_direction_moved
+            snake.direction_to_move = snake_snapshot.direction_to_move
+            snakes.append(snake)
+        self.snakes = snakes
+        self.killed_snakes.clear()
+        self.available_colors = list(snapshot.available_colors)
+        self.random.setstate(snapshot.random_state)
+        self.tick = snapshot.tick
+        self.stopped = snapshot.stopped
+        self.snake_reset_needed = snapshot.snake_reset_needed
+
+    def restore_snake_body(self, snake, cells, shift):
+        """
+        Moves the body of a snake to the cells it covered in a snapshot, the body is aligned to the snapshot by the
+        number of ticks in between, so only the chunks at the head and at the tail that differ are moved, added or
+        removed
+
+        :param snake: The Snake to restore the body of
+        :param cells: The cell indices of the body in the snapshot, ordered from head to tail
+        :param shift: The number of ticks the snake moved since the snapshot was taken (negative for a later snapshot)
+                      or None to replace the whole body
+        """
+        width = self.board_width
+        collision_map = self.collision_map
+        body = snake.body
+        snake_id = snake.snake_id
+        if shift is not None and body and -len(cells) < shift < len(body):
+            if shift >= 0:
+                chunk = body[shift]
+                aligned = chunk.column + chunk.row * width == cells[0]
+            else:
+                aligned = snake.head.column + snake.head.row * width == cells[-shift]
+        else:
+            aligned = False
+        if not aligned:
+            shift = 0
+            while body:
+                chunk = body.pop()
+                collision_map.remove_index(chunk.column + chunk.row * width, CollisionMap.CELL_SNAKE, snake_id)
+        for _ in range(shift):
+            chunk = body.popleft()
+            collision_map.remove_index(chunk.column + chunk.row * width, CollisionMap.CELL_SNAKE, snake_id)
+        for position in range(-shift - 1, -1, -1):
+            row, column = divmod(cells[position], width)
+            body.appendleft(SnakeBody(row, column))
+            collision_map.place_index(cells[position], CollisionMap.CELL_SNAKE, snake_id)
+
+        # the heads match now, walk back from the end of the shorter body until a cell matches that isn't one of the
+        # chunks stacked on the tail by growing, both bodies are the same from there to the head
+        position = min(len(body), len(cells)) - 1
+        while position > 0:
+            chunk = body[position]
+            index = chunk.column + chunk.row * width
+            if index != cells[position]:
+                collision_map.remove_index(index, CollisionMap.CELL_SNAKE, snake_id)
+                chunk.row, chunk.column = divmod(cells[position], width)
+                collision_map.place_index(cells[position], CollisionMap.CELL_SNAKE, snake_id)
+            elif not body[position - 1].coordinates_equal(chunk) and cells[position - 1] != index:
+                break
+            position -= 1
+        while len(body) > len(cells):
+            chunk = body.pop()
+            collision_map.remove_index(chunk.column + chunk.row * width, CollisionMap.CELL_SNAKE, snake_id)
+        for position in range(len(body), len(cells)):
+            row, column = divmod(cells[position], width)
+            body.append(SnakeBody(row, column))
+            collision_map.place_index(cells[position], CollisionMap.CELL_SNAKE, snake_id)
+        snake.head = body[0]
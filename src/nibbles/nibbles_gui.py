@@ -2,6 +2,12 @@ from threading import Thread
 from nibbles import Nibbles
 from nibbles.directions import Directions
 from nibbles.display import Display
+from nibbles.input_queue import InputQueue
+from nibbles.replay.replay_recorder import ReplayRecorder
+from nibbles.profiling.profiler import Profiler
+from nibbles.fixed_timestep_scheduler import FixedTimestepScheduler
+from nibbles.ai.ai_executors.ai_executor_builder import AiExecutorBuilder
+from nibbles.ai.ai_executors.ai_executor_types import AiExecutorTypes
 import pygame
 from pygame.locals import *
 from pygame.color import THECOLORS
@@ -26,6 +32,9 @@ class NibblesGUI:
             pygame.K_a: Directions.VECTOR_LEFT
         }
     }
+    # Maps a key to the (player number, direction) it controls
+    KEY_BINDINGS = {key: (player_number, direction) for player_number, controls in PLAYER_CONTROLS.items()
+                    for key, direction in controls.items()}
 
     SNAKE_COLORS = [
         THECOLORS['white'],
@@ -39,12 +48,30 @@ class NibblesGUI:
     ]
 
     def __init__(self, board_width, board_height, initial_game_difficulty, number_of_players, number_of_ai,
-                 ai_difficulty_level, display_scale, refresh_rate, level_parser_type, initial_level_number, skip_intro):
+                 ai_difficulty_level, display_scale, refresh_rate, level_parser_type, initial_level_number, skip_intro,
+                 ai_executor_type=AiExecutorTypes.AUTO, incremental_rendering=True, cache_dir=None,
+                 level_dir=None, seed=None, replay_path=None, profile=False, profile_path=None, interpolation=False,
+                 max_buffered_turns=3):
+        self.replay_path = replay_path
+        self.profile_path = profile_path
+        self.replay_recorder = None
+        self.profiler = Profiler() if profile else None
+        latency_histogram = self.profiler.get_histogram('input.latency') if profile else None
+        self.input_queue = InputQueue(self.PLAYER_CONTROLS.keys(), max_buffered_turns, latency_histogram)
         self.nibbles = Nibbles(self.SNAKE_COLORS, board_width, board_height, initial_game_difficulty, number_of_players,
-                               number_of_ai, ai_difficulty_level, level_parser_type, initial_level_number, skip_intro)
+                               number_of_ai, ai_difficulty_level, level_parser_type, initial_level_number, skip_intro,
+                               cache_dir, level_dir, seed)
         if not self.nibbles.intro:
             self.initialize_nibbles()
-        self.display = Display(self.nibbles, display_scale, refresh_rate)
+        self.display = Display(self.nibbles, display_scale, refresh_rate, incremental_rendering, cache_dir,
+                               interpolation)
+        self.scheduler = FixedTimestepScheduler(self.calculate_tick_rate())
+        self.ai_executor = AiExecutorBuilder(ai_executor_type, ai_difficulty_level).build()
+        if profile:
+            self.profiler.watch_counter('scheduler.missed_deadlines', self.scheduler, 'missed_deadlines')
+            self.profiler.watch_counter('scheduler.dropped_ticks', self.scheduler, 'dropped_ticks')
+            self.profiler.enable(self.nibbles, self.ai_executor, self.display)
+            self.display.profiler = self.profiler
 
     def initialize_nibbles(self):
         """
@@ -52,55 +79,30 @@ class NibblesGUI:
         :return:
         """
         self.nibbles.initialize_level()
-        self.hook_player_controls()
-
-    @staticmethod
-    def set_snake_direction(snake, update_data):
-        """Sets the direction that the player controlled snake should move
-
-        :param: snake: The snake that the player is controlling
-        :param: update_data: A dictionary of data used to update the snake direction
-        """
-        key = update_data['key']
-        controls = NibblesGUI.PLAYER_CONTROLS[snake.player_number]
-        if key in controls.keys():
-            snake.direction_to_move = controls[key]
-
-    def hook_player_controls(self):
-        """
-        Hooks the update direction event so the player can control the direction of the snake
-        """
-        for snake in self.nibbles.snakes:
-            if snake.player_number:
-                snake.on_update_direction = self.set_snake_direction
+        self.nibbles.publish_frame()
+        self.input_queue.clear()
+        if self.replay_path:
+            self.replay_recorder = ReplayRecorder(self.nibbles)
 
     def calculate_ai_directions(self):
         """
         Calculates the movement direction for the ai players in the nibbles instance
-        Note: Uses multi-threading because the hard ai difficulty level really needs the extra horse power
+        Note: Uses the AI executor so the hard ai difficulty level can get the extra horse power it needs
         """
-        threads = []
-        update_data = {'food': self.nibbles.food, 'collision_map': self.nibbles.collision_map}
-        for snake in self.nibbles.snakes:
-            if not snake.player_number:
-                ai_update_thread = Thread(target=snake.update_direction, args=(update_data, ))
-                ai_update_thread.start()
-                threads.append(ai_update_thread)
-        for thread in threads:
-            thread.join()
+        self.ai_executor.calculate_ai_directions(self.nibbles)
 
     def handle_keyboard(self, events):
         """
-        Handles the input from the keyboard and adjusts the direction of player controlled snakes
+        Handles the input from the keyboard and buffers the turns of the players for the game thread
 
         :param: events: Array of pygame events
         """
         for event in events:
             if event.type == pygame.KEYDOWN:
                 key = event.key
-                for snake in self.nibbles.snakes:
-                    if snake.player_number:
-                        snake.update_direction({"key": key})
+                binding = self.KEY_BINDINGS.get(key)
+                if binding and not self.nibbles.intro and binding[0] <= self.nibbles.number_of_players:
+                    self.input_queue.push(*binding)
                 if self.nibbles.intro:
                     if self.nibbles.intro_1:
                         self.nibbles.intro_1 = False
@@ -124,20 +126,53 @@ class NibblesGUI:
                 elif key == pygame.K_ESCAPE:
                     self.nibbles.paused = not self.nibbles.paused
 
+    def update_nibbles(self):
+        """
+        Updates the game by one tick and records the moves of the snakes when a replay is being recorded
+        """
+        if not self.replay_recorder:
+            self.nibbles.update()
+            return
+        tick = self.nibbles.tick
+        snakes = self.nibbles.snakes.copy()  # snakes that die during the update are removed from the game
+        self.nibbles.update()
+        self.replay_recorder.record_tick(tick, snakes)
+
+    def calculate_tick_rate(self):
+        """
+        Calculates the number of ticks per second of the current game difficulty
+
+        :return: The number of ticks per second
+        """
+        return 15 * ((1 + self.nibbles.game_difficulty) / 2)
+
     def game_loop(self):
         """
-        The main game loop that calls the update methods
+        The main game loop that calls the update methods at the tick rate of the game difficulty
         """
-        clock = pygame.time.Clock()
-        while True:
-            if self.nibbles.stopped:
-                break
-            if not self.nibbles.paused:
-                self.calculate_ai_directions()
-                self.nibbles.update()
-                if self.nibbles.snake_reset_needed:
-                    self.nibbles.reset_snakes()
-            clock.tick(15 * ((1 + self.nibbles.game_difficulty) / 2))
+        scheduler = self.scheduler
+        scheduler.reset()
+        while not self.nibbles.stopped:
+            scheduler.tick_rate = self.calculate_tick_rate()
+            if self.nibbles.paused:
+                scheduler.reset()  # don't catch up on the time spent paused
+                self.input_queue.pause()
+                if self.nibbles.frame and not self.nibbles.frame.paused:
+                    self.nibbles.publish_frame()  # show that the game was paused from the keyboard
+            else:
+                due_ticks = scheduler.advance()
+                for _ in range(due_ticks):
+                    if self.nibbles.paused:
+                        break  # a snake died, the remaining ticks wait until the players resume the game
+                    self.input_queue.apply_turns(self.nibbles.snakes)
+                    self.calculate_ai_directions()
+                    self.update_nibbles()
+                    if self.nibbles.snake_reset_needed:
+                        self.nibbles.reset_snakes()
+                        self.input_queue.clear()
+                if due_ticks:
+                    self.nibbles.publish_frame(scheduler.time_until_next_tick())
+            scheduler.wait_for_next_tick()
 
     def start_nibbles(self):
         """
@@ -156,4 +191,12 @@ class NibblesGUI:
             self.display.draw_frame()
             clock.tick(self.display.refresh_rate)
         game_thread.join()
+        self.ai_executor.shutdown()
+        self.nibbles.level_registry.shutdown()
+        if self.replay_recorder:
+            self.replay_recorder.save(self.replay_path)
+        if self.profiler:
+            self.profiler.disable()
+            if self.profile_path:
+                self.profiler.export(self.profile_path)
         pygame.quit()
@@ -0,0 +1,2 @@
+from .span_histogram import SpanHistogram
+from .profiler import Profiler
@@ -0,0 +1,188 @@
+import json
+import time
+from nibbles.ai import Ai
+from nibbles.profiling.span_histogram import SpanHistogram
+
+
+class Profiler:
+    """
+    Represents the instrumentation that times named spans of the game loop and the renderer
+
+    Nothing is instrumented while the profiler is disabled. Enabling it replaces the instrumented methods of the given
+    instances with wrappers that time each call, other instances and the classes are left alone. Disabling it puts the
+    original methods back, so a disabled profiler costs nothing. Counters kept by other objects (e.g. the missed
+    deadlines of the scheduler) can be watched, they are read when the overlay is updated and when the spans are
+    exported
+    """
+    AI_STRATEGY_SPANS = {
+        Ai.easy_calculate_snake_direction: 'ai.easy',
+        Ai.intermediate_calculate_snake_direction: 'ai.intermediate',
+        Ai.hard_calculate_snake_direction: 'ai.hard'
+    }
+    NIBBLES_SPANS = ('update', 'update_snake_position', 'should_snake_lose_life', 'create_food')
+    OVERLAY_SPANS = (('update', 'nibbles.update'), ('ai', 'ai.calculate_ai_directions'),
+                     ('draw', 'display.draw_frame'))
+    OVERLAY_COUNTERS = (('missed', 'scheduler.missed_deadlines'), ('dropped', 'scheduler.dropped_ticks'))
+
+    def __init__(self, window=1024, overlay_interval=0.5):
+        """
+        :param window: The number of recent calls of each span the percentiles are computed from
+        :param overlay_interval: The number of seconds between updates of the overlay text
+        """
+        self.window = window
+        self.overlay_interval = overlay_interval
+        self.histograms = {}
+        self.instrumented = []  # (owner, attribute name, original value or None if it was inherited)
+        self.counters = {}  # counter name -> (owner, attribute name)
+        self.overlay_lines = ()
+        self.overlay_time = 0.0
+
+    @property
+    def enabled(self):
+        return bool(self.instrumented)
+
+    def get_histogram(self, span):
+        """
+        Returns the histogram of a span, creating it the first time it is requested
+
+        :param span: The name of the span
+        :return: The SpanHistogram of the span
+        """
+        histogram = self.histograms.get(span)
+        if not histogram:
+            histogram = self.histograms.setdefault(span, SpanHistogram(self.window))
+        return histogram
+
+    def watch_counter(self, counter, owner, attribute_name):
+        """
+        Reports an integer attribute of an object as a counter in the overlay and the exported spans
+
+        :param counter: The name of the counter
+        :param owner: The object that keeps the count
+        :param attribute_name: The name of the attribute that holds the count
+        """
+        self.counters[counter] = (owner, attribute_name)
+
+    def read_counters(self):
+        """
+        Reads the current value of every watched counter
+
+        :return: A dictionary of counter name to its value
+        """
+        return {counter: getattr(owner, attribute_name) for counter, (owner, attribute_name) in self.counters.items()}
+
+    def instrument(self, owner, attribute_name, wrapper):
+        """
+        Replaces an attribute of a class or an instance with a wrapper until the profiler is disabled
+
+        :param owner: The class or instance that owns the attribute
+        :param attribute_name: The name of the attribute to replace
+        :param wrapper: The value to replace the attribute with
+        """
+        self.instrumented.append((owner, attribute_name, vars(owner).get(attribute_name)))
+        setattr(owner, attribute_name, wrapper)
+
+    def instrument_span(self, owner, attribute_name, span):
+        """
+        Times every call of a method
+
+        :param owner: The class or instance that owns the method
+        :param attribute_name: The name of the method
+        :param span: The name of the span to record the calls in
+        """
+        function = getattr(owner, attribute_name)
+        histogram = self.get_histogram(span)
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start_time = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                histogram.record(perf_counter() - start_time)
+        self.instrument(owner, attribute_name, timed)
+
+    def instrument_ai_strategies(self, ai_executor):
+        """
+        Times every call of an AI strategy run by an AI executor, the strategies themselves are left alone because they
+        are compared by identity and sent to AI worker processes by name. The executor times them instead, including
+        the ones it runs in other processes
+
+        :param ai_executor: The AI executor of the game
+        """
+        self.instrument(ai_executor, 'strategy_histograms',
+                        {strategy: self.get_histogram(span) for strategy, span in self.AI_STRATEGY_SPANS.items()})
+
+    def enable(self, nibbles, ai_executor=None, display=None):
+        """
+        Instruments a game, its AI executor and its display
+
+        :param nibbles: The Nibbles instance to instrument
+        :param ai_executor: The AI executor of the game (None to skip)
+        :param display: The Display of the game, every draw method is instrumented (None to skip)
+        """
+        if self.enabled:
+            raise RuntimeError("profiler is already enabled")
+        for attribute_name in self.NIBBLES_SPANS:
+            self.instrument_span(nibbles, attribute_name, 'nibbles.' + attribute_name)
+        if ai_executor:
+            self.instrument_span(ai_executor, 'calculate_ai_directions', 'ai.calculate_ai_directions')
+            self.instrument_ai_strategies(ai_executor)
+        if display:
+            for attribute_name in dir(type(display)):
+                if attribute_name.startswith('draw_'):
+                    self.instrument_span(display, attribute_name, 'display.' + attribute_name)
+
+    def disable(self):
+        """
+        Puts back every instrumented method, the recorded histograms are kept
+        """
+        for owner, attribute_name, original in reversed(self.instrumented):
+            if original is None:
+                delattr(owner, attribute_name)
+            else:
+                setattr(owner, attribute_name, original)
+        self.instrumented = []
+
+    def get_overlay_lines(self):
+        """
+        Returns the text of the timing overlay, the text is only updated every overlay_interval seconds so it can be
+        read and compared every frame
+
+        :return: A tuple of lines of text with the p50, p95 and p99 of the main spans in milliseconds and the watched
+                 scheduler counters
+        """
+        now = time.perf_counter()
+        if now - self.overlay_time >= self.overlay_interval:
+            self.overlay_time = now
+            spans = []
+            for label, span in self.OVERLAY_SPANS:
+                p50, p95, p99 = self.get_histogram(span).percentiles((50, 95, 99))
+                spans.append('{0} {1:.2f}/{2:.2f}/{3:.2f}'.format(label, p50 * 1e3, p95 * 1e3, p99 * 1e3))
+            lines = ['  '.join(spans[:-1]), spans[-1] + ' ms p50/p95/p99']
+            counters = self.read_counters()
+            for line_number, (label, counter) in enumerate(self.OVERLAY_COUNTERS):
+                if counter in counters:
+                    lines[line_number] += '  {0} {1}'.format(label, counters[counter])
+            # two short lines fit between the stats of player 1 and player 2
+            self.overlay_lines = tuple(lines)
+        return self.overlay_lines
+
+    def to_dict(self):
+        """
+        Converts the recorded spans and the watched counters into a dictionary that can be serialized as JSON
+
+        :return: A dictionary of span name to its statistics and of counter name to its value
+        """
+        spans = {span: histogram.to_dict() for span, histogram in self.histograms.items() if histogram.count}
+        spans.update(self.read_counters())
+        return dict(sorted(spans.items()))
+
+    def export(self, path):
+        """
+        Writes the recorded spans and the watched counters to a JSON file
+
+        :param path: The path of the file to write
+        """
+        with open(path, 'w') as json_file:
+            json.dump(self.to_dict(), json_file, indent=2)
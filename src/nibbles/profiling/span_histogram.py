@@ -0,0 +1,61 @@
+from collections import deque
+from threading import Lock
+
+
+class SpanHistogram:
+    """
+    Represents the durations of the most recent calls of a span
+
+    Durations can be recorded from several threads at once (e.g. the threads of the AI executor), a lock keeps the
+    deque and the totals consistent. The percentiles are computed from a copy of the recent durations when they are
+    requested
+    """
+    def __init__(self, window=1024):
+        """
+        :param window: The number of recent durations the percentiles are computed from
+        """
+        self.durations = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.lock = Lock()
+
+    def record(self, duration):
+        """
+        Adds the duration of a call
+
+        :param duration: The time the call took in seconds
+        """
+        with self.lock:
+            self.durations.append(duration)
+            self.count += 1
+            self.total += duration
+
+    def percentiles(self, percentiles):
+        """
+        Returns percentiles of the recent durations using the nearest rank
+
+        :param percentiles: An iterable of percentiles between 0 and 100
+        :return: A list of the durations of the percentiles in seconds (0 for each if nothing was recorded)
+        """
+        with self.lock:
+            durations = list(self.durations)
+        durations.sort()
+        if not durations:
+            return [0.0 for _ in percentiles]
+        return [durations[max(0, int(-(-percentile * len(durations) // 100)) - 1)] for percentile in percentiles]
+
+    def to_dict(self):
+        """
+        Converts the histogram into a dictionary that can be serialized as JSON
+
+        :return: A dictionary of the call count, total and mean time and the recent percentiles
+        """
+        p50, p95, p99 = self.percentiles((50, 95, 99))
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': p50,
+            'p95': p95,
+            'p99': p99
+        }
@@ -0,0 +1,3 @@
+from .replay import Replay
+from .replay_recorder import ReplayRecorder
+from .replay_engine import ReplayEngine
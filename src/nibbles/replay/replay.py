@@ -0,0 +1,154 @@
+import pathlib
+import struct
+from nibbles.directions import Directions
+from nibbles.ai.ai_difficulty_levels import AiDifficultyLevel
+from nibbles.level.level_parsers.level_parser_types import LevelParserTypes
+
+
+class Replay:
+    """
+    Represents the recording of a game, which is everything needed to play the game out again
+
+    A replay stores the seed and configuration of the game and the direction changes of the snakes. Events are
+    (tick, snake_id, direction) tuples ordered by tick, a snake's direction only has to be recorded on the ticks that it
+    changes. The binary form is a header followed by the configuration strings and one variable length tick delta and
+    one byte containing the snake id and direction per event
+    """
+    MAGIC = b'NBRP'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHQHHBBidII')
+
+    def __init__(self, seed, board_width, board_height, number_of_players, number_of_ai, ai_difficulty_level,
+                 game_difficulty, level_parser_type, level_number, level_dir=None, tick_count=0, events=None):
+        """
+        :param seed: The seed of the game's random number generator
+        :param board_width: The width of the game board
+        :param board_height: The height of the game board
+        :param number_of_players: The number of human players
+        :param number_of_ai: The number of AI players
+        :param ai_difficulty_level: The AiDifficultyLevel of the AI
+        :param game_difficulty: The game difficulty (only affects the speed of the game)
+        :param level_parser_type: The LevelParserTypes used to load the level
+        :param level_number: The number of the level that was played
+        :param level_dir: The path of the level data (None for the bundled levels)
+        :param tick_count: The number of ticks that were recorded
+        :param events: A list of (tick, snake_id, direction) tuples ordered by tick
+        """
+        self.seed = seed
+        self.board_width = board_width
+        self.board_height = board_height
+        self.number_of_players = number_of_players
+        self.number_of_ai = number_of_ai
+        self.ai_difficulty_level = ai_difficulty_level
+        self.game_difficulty = game_difficulty
+        self.level_parser_type = level_parser_type
+        self.level_number = level_number
+        self.level_dir = level_dir
+        self.tick_count = tick_count
+        self.events = events if events is not None else []
+
+    @staticmethod
+    def write_varint(buffer, value):
+        """
+        Appends an unsigned integer to a buffer using 7 bits per byte
+
+        :param buffer: The bytearray to append to
+        :param value: The unsigned integer to append
+        """
+        while value > 0x7F:
+            buffer.append(value & 0x7F | 0x80)
+            value >>= 7
+        buffer.append(value)
+
+    @staticmethod
+    def read_varint(buffer, offset):
+        """
+        Reads an unsigned integer written by write_varint
+
+        :param buffer: The buffer to read from
+        :param offset: The offset of the integer in the buffer
+        :return: A (value, offset after the integer) tuple
+        """
+        value = 0
+        shift = 0
+        while True:
+            byte = buffer[offset]
+            offset += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value, offset
+            shift += 7
+
+    def encode(self):
+        """
+        Encodes the replay into its binary form
+
+        :return: The bytes of the replay
+        """
+        buffer = bytearray(self.HEADER.pack(self.MAGIC, self.VERSION, self.seed, self.board_width, self.board_height,
+                                            self.number_of_players, self.number_of_ai, self.level_number,
+                                            self.game_difficulty, self.tick_count, len(self.events)))
+        for text in (str(self.ai_difficulty_level), str(self.level_parser_type), str(self.level_dir or '')):
+            encoded_text = text.encode('utf-8')
+            self.write_varint(buffer, len(encoded_text))
+            buffer += encoded_text
+        previous_tick = 0
+        for tick, snake_id, direction in self.events:
+            self.write_varint(buffer, tick - previous_tick)
+            buffer.append(snake_id << 2 | Directions.DIRECTIONS.index(direction))
+            previous_tick = tick
+        return bytes(buffer)
+
+    @staticmethod
+    def decode(buffer):
+        """
+        Creates a replay from its binary form
+
+        :param buffer: A bytes-like object containing an encoded replay
+        :return: The decoded Replay
+        """
+        if len(buffer) < Replay.HEADER.size:
+            raise ValueError("replay is truncated")
+        magic, version, seed, board_width, board_height, number_of_players, number_of_ai, level_number, \
+            game_difficulty, tick_count, event_count = Replay.HEADER.unpack_from(buffer)
+        if magic != Replay.MAGIC or version != Replay.VERSION:
+            raise ValueError("unsupported replay format")
+        try:
+            offset = Replay.HEADER.size
+            texts = []
+            for _ in range(3):
+                length, offset = Replay.read_varint(buffer, offset)
+                texts.append(bytes(buffer[offset:offset + length]).decode('utf-8'))
+                offset += length
+            events = []
+            tick = 0
+            for _ in range(event_count):
+                tick_delta, offset = Replay.read_varint(buffer, offset)
+                tick += tick_delta
+                event = buffer[offset]
+                offset += 1
+                events.append((tick, event >> 2, Directions.DIRECTIONS[event & 0x3]))
+        except IndexError:
+            raise ValueError("replay is truncated")
+        ai_difficulty_level, level_parser_type, level_dir = texts
+        return Replay(seed, board_width, board_height, number_of_players, number_of_ai,
+                      AiDifficultyLevel(ai_difficulty_level), game_difficulty, LevelParserTypes(level_parser_type),
+                      level_number, level_dir or None, tick_count, events)
+
+    def save(self, path):
+        """
+        Writes the replay to a file
+
+        :param path: The path of the file to write
+        """
+        pathlib.Path(path).write_bytes(self.encode())
+
+    @staticmethod
+    def load(path):
+        """
+        Reads a replay from a file
+
+        :param path: The path of the file to read
+        :return: The loaded Replay
+        """
+        return Replay.decode(pathlib.Path(path).read_bytes())
@@ -0,0 +1,117 @@
+from bisect import bisect_left, bisect_right
+from nibbles.nibbles import Nibbles
+
+
+class ReplayEngine:
+    """
+    Represents a headless simulation that plays a Replay out again as fast as possible
+
+    The AI is not run again, every snake moves in the directions stored in the replay. Keyframes of the game state are
+    kept in memory every keyframe_interval ticks so seeking only has to simulate the ticks after the closest keyframe
+    """
+    REPLAY_COLORS = [(index, index, index) for index in range(8)]
+
+    def __init__(self, replay, snake_colors=None, keyframe_interval=256, cache_dir=None):
+        """
+        :param replay: The Replay to play
+        :param snake_colors: A list of 8 unique snake colors (None for placeholder colors)
+        :param keyframe_interval: The number of ticks between keyframes
+        :param cache_dir: The directory to cache compiled levels in (None to disable the level cache)
+        """
+        self.replay = replay
+        self.keyframe_interval = keyframe_interval
+        self.nibbles = Nibbles(snake_colors or self.REPLAY_COLORS, replay.board_width, replay.board_height,
+                               replay.game_difficulty, replay.number_of_players, replay.number_of_ai,
+                               replay.ai_difficulty_level, replay.level_parser_type, replay.level_number, True,
+                               cache_dir, replay.level_dir, replay.seed, prefetch=False)
+        self.nibbles.initialize_level()
+        for snake in self.nibbles.snakes:
+            snake.on_update_direction = None
+        self.event_ticks = [tick for tick, _, _ in replay.events]
+        self.event_index = 0
+        self.keyframes = {}
+        self.keyframe_ticks = []
+        self.capture_keyframe()
+
+    @property
+    def keyframe_interval(self):
+        return self._keyframe_interval
+
+    @keyframe_interval.setter
+    def keyframe_interval(self, keyframe_interval):
+        if not isinstance(keyframe_interval, int):
+            raise ValueError("keyframe interval must be an integer")
+        if keyframe_interval < 1:
+            raise ValueError("keyframe interval must be greater than 0")
+        self._keyframe_interval = keyframe_interval
+
+    @property
+    def tick(self):
+        return self.nibbles.tick
+
+    @property
+    def finished(self):
+        return self.nibbles.tick >= self.replay.tick_count or self.nibbles.stopped
+
+    def capture_keyframe(self):
+        """
+        Stores a snapshot of the current game state as the keyframe of the current tick
+        """
+        tick = self.nibbles.tick
+        if tick in self.keyframes:
+            return
+        self.keyframes[tick] = self.nibbles.create_snapshot()
+        self.keyframe_ticks.insert(bisect_left(self.keyframe_ticks, tick), tick)
+
+    def restore_keyframe(self, tick):
+        """
+        Restores the game state of a keyframe
+
+        :param tick: The tick of the keyframe to restore
+        """
+        self.nibbles.restore_snapshot(self.keyframes[tick])
+        self.event_index = bisect_left(self.event_ticks, tick)
+
+    def step(self):
+        """
+        Plays the next tick of the replay
+
+        :return: False if the replay was already finished otherwise True
+        """
+        if self.finished:
+            return False
+        nibbles = self.nibbles
+        events = self.replay.events
+        while self.event_index < len(events) and self.event_ticks[self.event_index] == nibbles.tick:
+            _, snake_id, direction = events[self.event_index]
+            for snake in nibbles.snakes:
+                if snake.snake_id == snake_id:
+                    snake.direction_to_move = direction
+            self.event_index += 1
+        nibbles.update()
+        if nibbles.snake_reset_needed:
+            nibbles.reset_snakes()
+        if nibbles.tick % self.keyframe_interval == 0:
+            self.capture_keyframe()
+        return True
+
+    def run(self, until_tick=None):
+        """
+        Plays the replay until it is finished or reaches a tick
+
+        :param until_tick: The tick to stop at (None to play the whole replay)
+        """
+        while (until_tick is None or self.nibbles.tick < until_tick) and self.step():
+            pass
+
+    def seek(self, tick):
+        """
+        Moves the game to the state it was in at the start of a tick, restoring the closest earlier keyframe first when
+        it is closer than the current state
+
+        :param tick: The tick to seek to
+        """
+        keyframe_tick = self.keyframe_ticks[bisect_right(self.keyframe_ticks, tick) - 1]
+        if tick < self.nibbles.tick or keyframe_tick > self.nibbles.tick:
+            self.restore_keyframe(keyframe_tick)
+        self.run(tick)
@@ -0,0 +1,37 @@
+from nibbles.replay.replay import Replay
+
+
+class ReplayRecorder:
+    """
+    Represents a recorder that captures the configuration and the moves of a game into a Replay
+    """
+    def __init__(self, nibbles):
+        """
+        :param nibbles: The Nibbles instance to record, its level must already be initialized
+        """
+        self.replay = Replay(nibbles.seed, nibbles.board_width, nibbles.board_height, nibbles.number_of_players,
+                             nibbles.number_of_ai, nibbles.ai_difficulty_level, nibbles.game_difficulty,
+                             nibbles.level_parser_type, nibbles.level_number, nibbles.level_dir, nibbles.tick)
+        self.last_directions = {}
+
+    def record_tick(self, tick, snakes):
+        """
+        Records the directions the snakes moved in during a tick, only the directions that changed are stored
+
+        :param tick: The tick that was played
+        :param snakes: The snakes that were playing at the start of the tick (snakes that die are removed by the update)
+        """
+        for snake in snakes:
+            direction = snake.last_direction_moved
+            if self.last_directions.get(snake.snake_id) != direction:
+                self.last_directions[snake.snake_id] = direction
+                self.replay.events.append((tick, snake.snake_id, direction))
+        self.replay.tick_count = tick + 1
+
+    def save(self, path):
+        """
+        Writes the recorded replay to a file
+
+        :param path: The path of the file to write
+        """
+        self.replay.save(path)
@@ -0,0 +1,3 @@
+from .match_result import MatchResult
+from .self_play_summary import SelfPlaySummary
+from .self_play_runner import SelfPlayRunner
@@ -0,0 +1,52 @@
+import math
+
+
+class MatchResult:
+    """
+    Represents the outcome of one headless AI vs AI match
+    """
+    BUCKETS_PER_DOUBLING = 8
+
+    def __init__(self, seed, ai_difficulty_levels, ticks, scores, ticks_survived, winner, duration, tick_time,
+                 tick_time_histogram):
+        """
+        :param seed: The seed the match was played with
+        :param ai_difficulty_levels: A tuple of the AiDifficultyLevel of each snake
+        :param ticks: The number of ticks the match lasted
+        :param scores: A tuple of the final score of each snake
+        :param ticks_survived: A tuple of the number of ticks each snake stayed in the game
+        :param winner: The index of the winning snake or None if the match was a draw
+        :param duration: The number of seconds it took to set up and play the match
+        :param tick_time: The number of seconds spent playing ticks
+        :param tick_time_histogram: A dictionary of the number of ticks per tick time bucket (see tick_time_bucket)
+        """
+        self.seed = seed
+        self.ai_difficulty_levels = ai_difficulty_levels
+        self.ticks = ticks
+        self.scores = scores
+        self.ticks_survived = ticks_survived
+        self.winner = winner
+        self.duration = duration
+        self.tick_time = tick_time
+        self.tick_time_histogram = tick_time_histogram
+
+    @staticmethod
+    def tick_time_bucket(seconds):
+        """
+        Returns the histogram bucket of a tick time, buckets grow exponentially so they can be merged across matches
+        while keeping a relative precision of about 9%
+
+        :param seconds: The time the tick took
+        :return: The bucket of the tick time
+        """
+        return int(math.log2(max(seconds * 1e6, 1.0)) * MatchResult.BUCKETS_PER_DOUBLING)
+
+    @staticmethod
+    def bucket_upper_bound(bucket):
+        """
+        Returns the largest tick time that falls into a histogram bucket
+
+        :param bucket: The histogram bucket
+        :return: The upper bound of the bucket in seconds
+        """
+        return 2 ** ((bucket + 1) / MatchResult.BUCKETS_PER_DOUBLING) / 1e6
@@ -0,0 +1,158 @@
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from nibbles.nibbles import Nibbles
+from nibbles.ai import Ai
+from nibbles.ai.ai_executors.inline_ai_executor import InlineAiExecutor
+from nibbles.self_play.match_result import MatchResult
+from nibbles.self_play.self_play_summary import SelfPlaySummary
+
+
+class SelfPlayRunner:
+    """
+    Represents a runner that plays headless AI vs AI matches as fast as possible on a pool of processes
+
+    Every match is played by a single process without frame pacing, the AI runs inline, so matches are spread over the
+    pool to use every core
+    """
+    SELF_PLAY_COLORS = [(index, index, index) for index in range(8)]
+
+    def __init__(self, level_number, ai_difficulty_levels, seeds, level_parser_type, board_width, board_height,
+                 max_ticks=10000, level_dir=None, cache_dir=None, max_workers=None):
+        """
+        :param level_number: The number of the level to play
+        :param ai_difficulty_levels: A list of the AiDifficultyLevel of each snake, between 1 and 8 snakes
+        :param seeds: An iterable of the seeds to play a match with, one match is played per seed
+        :param level_parser_type: The type of the level parser to use when parsing levels
+        :param board_width: The width of the game board
+        :param board_height: The height of the game board
+        :param max_ticks: The number of ticks after which a match is stopped
+        :param level_dir: The path of the level data to parse (None to use the bundled levels)
+        :param cache_dir: The directory to cache compiled levels in (None to disable the level cache)
+        :param max_workers: The number of processes to play matches on (None to use every core)
+        """
+        self.level_number = level_number
+        self.ai_difficulty_levels = ai_difficulty_levels
+        self.seeds = list(seeds)
+        self.level_parser_type = level_parser_type
+        self.board_width = board_width
+        self.board_height = board_height
+        self.max_ticks = max_ticks
+        self.level_dir = level_dir
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    @property
+    def ai_difficulty_levels(self):
+        return self._ai_difficulty_levels
+
+    @ai_difficulty_levels.setter
+    def ai_difficulty_levels(self, ai_difficulty_levels):
+        if not 1 <= len(ai_difficulty_levels) <= 8:
+            raise ValueError("ai difficulty levels must contain between 1 and 8 levels")
+        self._ai_difficulty_levels = tuple(ai_difficulty_levels)
+
+    @property
+    def max_ticks(self):
+        return self._max_ticks
+
+    @max_ticks.setter
+    def max_ticks(self, max_ticks):
+        if not isinstance(max_ticks, int):
+            raise ValueError("max ticks must be an integer")
+        if max_ticks < 1:
+            raise ValueError("max ticks must be greater than 0")
+        self._max_ticks = max_ticks
+
+    @staticmethod
+    def play_match(level_number, ai_difficulty_levels, level_parser_type, board_width, board_height, max_ticks,
+                   level_dir, cache_dir, seed):
+        """
+        Plays one match until every snake is dead or the tick limit is reached (runs in a worker process)
+
+        :param level_number: The number of the level to play
+        :param ai_difficulty_levels: A tuple of the AiDifficultyLevel of each snake
+        :param level_parser_type: The type of the level parser to use when parsing levels
+        :param board_width: The width of the game board
+        :param board_height: The height of the game board
+        :param max_ticks: The number of ticks after which the match is stopped
+        :param level_dir: The path of the level data to parse (None to use the bundled levels)
+        :param cache_dir: The directory to cache compiled levels in (None to disable the level cache)
+        :param seed: The seed to play the match with
+        :return: The MatchResult of the match
+        """
+        start_time = time.perf_counter()
+        nibbles = Nibbles(SelfPlayRunner.SELF_PLAY_COLORS, board_width, board_height, 1.0, 0,
+                          len(ai_difficulty_levels), ai_difficulty_levels[0], level_parser_type, level_number, True,
+                          cache_dir, level_dir, seed, prefetch=False)
+        nibbles.initialize_level()
+        snakes = list(nibbles.snakes)
+        for snake, ai_difficulty_level in zip(snakes, ai_difficulty_levels):
+            snake.on_update_direction = Ai.resolve_difficulty_level(ai_difficulty_level)
+        ai_executor = InlineAiExecutor()
+        ticks_survived = {}
+        tick_time = 0.0
+        tick_time_histogram = Counter()
+        while not nibbles.stopped and nibbles.tick < max_ticks:
+            tick_start_time = time.perf_counter()
+            ai_executor.calculate_ai_directions(nibbles)
+            nibbles.update()
+            if nibbles.snake_reset_needed:
+                nibbles.reset_snakes()
+            tick_duration = time.perf_counter() - tick_start_time
+            tick_time += tick_duration
+            tick_time_histogram[MatchResult.tick_time_bucket(tick_duration)] += 1
+            for snake in nibbles.killed_snakes:
+                if not snake.alive:
+                    ticks_survived[snake.snake_id] = nibbles.tick
+
+        ticks_survived = tuple(ticks_survived.get(snake.snake_id, nibbles.tick) for snake in snakes)
+        scores = tuple(snake.score for snake in snakes)
+        # the snake that stays in the game the longest wins, snakes that are still alive at the end are ranked by score
+        rankings = sorted(((survived, score, index) for index, (survived, score)
+                           in enumerate(zip(ticks_survived, scores))), reverse=True)
+        winner = rankings[0][2]
+        if len(rankings) > 1 and rankings[0][:2] == rankings[1][:2]:
+            winner = None
+        return MatchResult(seed, tuple(ai_difficulty_levels), nibbles.tick, scores, ticks_survived, winner,
+                           time.perf_counter() - start_time, tick_time, dict(tick_time_histogram))
+
+    def run(self, on_match_result=None):
+        """
+        Plays a match for every seed
+
+        :param on_match_result: A function that is called with each MatchResult as soon as it is available
+        :return: A SelfPlaySummary of the matches
+        """
+        summary = SelfPlaySummary(self.ai_difficulty_levels)
+        play_match = partial(SelfPlayRunner.play_match, self.level_number, self.ai_difficulty_levels,
+                             self.level_parser_type, self.board_width, self.board_height, self.max_ticks,
+                             self.level_dir, self.cache_dir)
+        start_time = time.perf_counter()
+        if self.max_workers == 1:
+            match_results = map(play_match, self.seeds)
+            self.collect_results(match_results, summary, on_match_result)
+        else:
+            # hand out seeds in chunks to keep the inter process overhead low without leaving workers idle at the end
+            chunk_size = max(1, len(self.seeds) // (self.max_workers * 8))
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                match_results = executor.map(play_match, self.seeds, chunksize=chunk_size)
+                self.collect_results(match_results, summary, on_match_result)
+        summary.wall_time = time.perf_counter() - start_time
+        return summary
+
+    @staticmethod
+    def collect_results(match_results, summary, on_match_result):
+        """
+        Adds match results to a summary
+
+        :param match_results: An iterable of MatchResults
+        :param summary: The SelfPlaySummary to add the results to
+        :param on_match_result: A function that is called with each MatchResult (or None)
+        """
+        for match_result in match_results:
+            summary.add(match_result)
+            if on_match_result:
+                on_match_result(match_result)
@@ -0,0 +1,90 @@
+from collections import Counter
+from nibbles.self_play.match_result import MatchResult
+
+
+class SelfPlaySummary:
+    """
+    Represents the aggregated results of a batch of self play matches, snakes are compared by their position in the
+    difficulty mix
+    """
+    def __init__(self, ai_difficulty_levels):
+        """
+        :param ai_difficulty_levels: A tuple of the AiDifficultyLevel of each snake
+        """
+        self.ai_difficulty_levels = tuple(ai_difficulty_levels)
+        snake_count = len(self.ai_difficulty_levels)
+        self.matches = 0
+        self.draws = 0
+        self.wins = [0] * snake_count
+        self.total_scores = [0] * snake_count
+        self.total_ticks_survived = [0] * snake_count
+        self.total_ticks = 0
+        self.match_time = 0.0
+        self.tick_time = 0.0
+        self.wall_time = 0.0
+        self.tick_time_histogram = Counter()
+
+    def add(self, match_result):
+        """
+        Adds the result of a match to the summary
+
+        :param match_result: The MatchResult to add
+        """
+        self.matches += 1
+        if match_result.winner is None:
+            self.draws += 1
+        else:
+            self.wins[match_result.winner] += 1
+        for index, (score, ticks_survived) in enumerate(zip(match_result.scores, match_result.ticks_survived)):
+            self.total_scores[index] += score
+            self.total_ticks_survived[index] += ticks_survived
+        self.total_ticks += match_result.ticks
+        self.match_time += match_result.duration
+        self.tick_time += match_result.tick_time
+        self.tick_time_histogram.update(match_result.tick_time_histogram)
+
+    def tick_time_percentile(self, percentile):
+        """
+        Returns a percentile of the time it took to play a tick across every match
+
+        :param percentile: The percentile between 0 and 100
+        :return: The upper bound of the histogram bucket containing the percentile in seconds (0 if nothing was played)
+        """
+        tick_count = sum(self.tick_time_histogram.values())
+        if not tick_count:
+            return 0.0
+        rank = percentile / 100 * tick_count
+        seen = 0
+        for bucket in sorted(self.tick_time_histogram):
+            seen += self.tick_time_histogram[bucket]
+            if seen >= rank:
+                return MatchResult.bucket_upper_bound(bucket)
+        return MatchResult.bucket_upper_bound(max(self.tick_time_histogram))
+
+    def to_dict(self):
+        """
+        Converts the summary into a dictionary that can be serialized as JSON
+
+        :return: A dictionary of the aggregated results
+        """
+        matches = max(self.matches, 1)
+        return {
+            'matches': self.matches,
+            'draws': self.draws,
+            'snakes': [{
+                'ai_difficulty_level': str(ai_difficulty_level),
+                'win_rate': self.wins[index] / matches,
+                'average_score': self.total_scores[index] / matches,
+                'average_ticks_survived': self.total_ticks_survived[index] / matches
+            } for index, ai_difficulty_level in enumerate(self.ai_difficulty_levels)],
+            'average_match_ticks': self.total_ticks / matches,
+            'tick_time': {
+                'mean': self.tick_time / max(self.total_ticks, 1),
+                'p50': self.tick_time_percentile(50),
+                'p95': self.tick_time_percentile(95),
+                'p99': self.tick_time_percentile(99)
+            },
+            'average_match_time': self.match_time / matches,
+            'ticks_per_second': self.total_ticks / self.wall_time if self.wall_time else 0.0,
+            'wall_time': self.wall_time
+        }
@@ -1,32 +1,36 @@
+from collections import deque
 from nibbles.directions import Directions
 
 
 class Snake:
     """
-    Represents a snake containing a list of snake chunks
+    Represents a snake containing a deque of snake chunks ordered from head to tail
     """
     def __init__(self, head, color, lives=1, body=None, direction_to_move=Directions.VECTOR_LEFT, score=0,
-                 player_number=None, on_update_direction=None):
+                 player_number=None, on_update_direction=None, snake_id=0):
         """
         :param: head: A SnakeBody representing where to place the snake's head
         :param: color: Color of the snake
         :param: lives: Number of lives to give the snake
-        :param: body: A list of snake body chunks
+        :param: body: An iterable of snake body chunks ordered from head to tail
         :param: direction_to_move: The direction to the snake wants to move
         :param: score: The current score of the snake
         :param: player_number: the player number of the snake (None if not player controlled)
         :param: update_direction_callback: The method that is called when the snakes direction should update
+        :param: snake_id: The id of the snake used to mark its body chunks in the collision map
         """
         self.head = head
         self.color = color
         self.lives = lives
-        self.body = body if body else [self.head]
+        self.body = deque(body) if body else deque([self.head])
         self.last_direction_moved = direction_to_move
         self.direction_to_move = direction_to_move
         self.score = score
         self.player_number = player_number
         self.alive = self.calculate_alive()
         self.on_update_direction = on_update_direction
+        self.snake_id = snake_id
+        self.resets = 0  # the number of times the body was reset
 
     def lose_life(self):
         """
@@ -49,6 +53,7 @@ class Snake:
         """
         self.body.clear()
         self.body.append(self.head)
+        self.resets += 1
 
     def update_direction(self, update_data: dict):
         """
@@ -1,10 +1,13 @@
 from nibbles.coordinate import Coordinate
+from nibbles.collision_map import CollisionMap
 
 
 class SnakeBody(Coordinate):
     """
     Represents a snake body chunk
     """
+    CELL_TYPE = CollisionMap.CELL_SNAKE
+
     def __init__(self, row=0, column=0):
         """
         :param row: The row of the body chunk
@@ -0,0 +1,4 @@
+from .game_snapshot import GameSnapshot
+from .snake_snapshot import SnakeSnapshot
+from .snapshot_history import SnapshotHistory
+from .frame_snapshot import FrameSnapshot
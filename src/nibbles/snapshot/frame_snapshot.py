@@ -0,0 +1,44 @@
+class FrameSnapshot:
+    """
+    Represents what the renderer needs to draw one tick of a game, created by Nibbles.create_frame
+
+    The game thread publishes a new frame snapshot after every tick by swapping a single reference, a frame snapshot is
+    never modified after it is created, so the render thread can draw it without taking a lock while the next tick is
+    being played
+    """
+    def __init__(self, level, tick, paused, food, snakes, killed_player_numbers, previous_snakes=(), published_at=0.0,
+                 tick_interval=0.0):
+        """
+        :param level: The Level that was loaded
+        :param tick: The tick of the game
+        :param paused: Whether the game was paused
+        :param food: A (column, row, points) tuple of the food item or None if there was no food
+        :param snakes: A tuple with a (color, player number, score, lives, body cells) tuple of every snake in the
+                       order of the game's snakes, the body cells are a tuple of cell indices ordered from head to tail
+        :param killed_player_numbers: A tuple of the player number of every snake that lost a life during the tick
+                                      (None for AI snakes)
+        :param previous_snakes: The snakes of the previous frame snapshot, used to interpolate the movement of the tick
+        :param published_at: The time on the perf_counter clock the frame snapshot was published at
+        :param tick_interval: The number of seconds until the next tick is due (0 to disable interpolation)
+        """
+        self.level = level
+        self.tick = tick
+        self.paused = paused
+        self.food = food
+        self.snakes = snakes
+        self.killed_player_numbers = killed_player_numbers
+        self.previous_snakes = previous_snakes
+        self.published_at = published_at
+        self.tick_interval = tick_interval
+
+    def interpolation_progress(self, now):
+        """
+        Returns how far the movement from the previous snakes to the snakes of this frame snapshot has progressed, the
+        movement is spread over the tick interval that follows the time the frame snapshot was published at
+
+        :param now: The current time on the perf_counter clock
+        :return: The progress between 0 and 1 (1 when interpolation is disabled)
+        """
+        if self.tick_interval <= 0:
+            return 1.0
+        return min(max((now - self.published_at) / self.tick_interval, 0.0), 1.0)
@@ -0,0 +1,26 @@
+class GameSnapshot:
+    """
+    Represents the state of a game at one point in time, created by Nibbles.create_snapshot
+
+    Positions are stored as collision map cell indices instead of coordinate objects, so a snapshot only holds a few
+    small arrays and tuples and is never modified after it is created
+    """
+    def __init__(self, level_number, tick, stopped, snake_reset_needed, random_state, available_colors, food, snakes):
+        """
+        :param level_number: The number of the level the snapshot was taken on
+        :param tick: The tick of the game
+        :param stopped: Whether the game was over
+        :param snake_reset_needed: Whether the snakes were waiting to be reset after a death
+        :param random_state: The state of the game's random number generator
+        :param available_colors: A tuple of the snake colors that were not taken
+        :param food: A (cell index, points) tuple of the food item or None if there was no food
+        :param snakes: A tuple of SnakeSnapshots in the order of the game's snakes
+        """
+        self.level_number = level_number
+        self.tick = tick
+        self.stopped = stopped
+        self.snake_reset_needed = snake_reset_needed
+        self.random_state = random_state
+        self.available_colors = available_colors
+        self.food = food
+        self.snakes = snakes
@@ -0,0 +1,28 @@
+class SnakeSnapshot:
+    """
+    Represents the state of a snake at one point in a game
+    """
+    def __init__(self, snake_id, color, lives, score, player_number, on_update_direction, last_direction_moved,
+                 direction_to_move, resets, body):
+        """
+        :param snake_id: The id of the snake
+        :param color: The color of the snake
+        :param lives: The number of lives the snake had
+        :param score: The score of the snake
+        :param player_number: The player number of the snake (None if not player controlled)
+        :param on_update_direction: The method that is called when the snake's direction should update
+        :param last_direction_moved: The direction the snake last moved in
+        :param direction_to_move: The direction the snake wanted to move in
+        :param resets: The number of times the snake was reset
+        :param body: An array of the cell indices of the snake's body chunks ordered from head to tail
+        """
+        self.snake_id = snake_id
+        self.color = color
+        self.lives = lives
+        self.score = score
+        self.player_number = player_number
+        self.on_update_direction = on_update_direction
+        self.last_direction_moved = last_direction_moved
+        self.direction_to_move = direction_to_move
+        self.resets = resets
+        self.body = body
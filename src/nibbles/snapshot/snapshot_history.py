@@ -0,0 +1,76 @@
+from collections import deque
+
+
+class SnapshotHistory:
+    """
+    Represents a ring buffer of the most recent game snapshots ordered by tick, the oldest snapshot is dropped when a
+    snapshot is added to a full history
+    """
+    def __init__(self, max_snapshots):
+        """
+        :param max_snapshots: The maximum number of snapshots to keep
+        """
+        self.max_snapshots = max_snapshots
+        self.snapshots = deque(maxlen=max_snapshots)
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def __iter__(self):
+        return iter(self.snapshots)
+
+    @property
+    def max_snapshots(self):
+        return self._max_snapshots
+
+    @max_snapshots.setter
+    def max_snapshots(self, max_snapshots):
+        if not isinstance(max_snapshots, int):
+            raise ValueError("max snapshots must be an integer")
+        if max_snapshots < 1:
+            raise ValueError("max snapshots must be greater than 0")
+        self._max_snapshots = max_snapshots
+
+    def append(self, snapshot):
+        """
+        Adds a snapshot to the history, snapshots of the same or later ticks are replaced (e.g. after a rewind)
+
+        :param snapshot: The GameSnapshot to add
+        """
+        while self.snapshots and self.snapshots[-1].tick >= snapshot.tick:
+            self.snapshots.pop()
+        self.snapshots.append(snapshot)
+
+    def find(self, tick):
+        """
+        Returns the latest snapshot that was taken at or before a tick
+
+        :param tick: The tick to find the snapshot of
+        :return: The GameSnapshot or None if the history doesn't go back far enough
+        """
+        for snapshot in reversed(self.snapshots):
+            if snapshot.tick <= tick:
+                return snapshot
+        return None
+
+    def rewind(self, nibbles, ticks=1):
+        """
+        Restores the game to the snapshot of an earlier tick and forgets the snapshots after it
+
+        :param nibbles: The Nibbles instance to restore
+        :param ticks: The number of ticks to go back
+        :return: The restored GameSnapshot or None if the history doesn't go back far enough
+        """
+        snapshot = self.find(nibbles.tick - ticks)
+        if not snapshot:
+            return None
+        while self.snapshots[-1] is not snapshot:
+            self.snapshots.pop()
+        nibbles.restore_snapshot(snapshot)
+        return snapshot
+
+    def clear(self):
+        """
+        Removes every snapshot from the history
+        """
+        self.snapshots.clear()
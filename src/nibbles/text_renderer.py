@@ -0,0 +1,72 @@
+from collections import OrderedDict
+import pygame
+
+
+class TextRenderer:
+    """
+    Represents a cache of fonts and rendered text surfaces
+
+    Fonts are kept for every size that was requested, rendered text surfaces are kept in a bounded least recently used
+    cache so text that doesn't change between frames is only rendered once
+    """
+    FONT_NAME = 'freesansbold.ttf'
+
+    def __init__(self, max_cached_surfaces=256):
+        """
+        :param max_cached_surfaces: The maximum number of rendered text surfaces to keep
+        """
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.max_cached_surfaces = max_cached_surfaces
+
+    @property
+    def max_cached_surfaces(self):
+        return self._max_cached_surfaces
+
+    @max_cached_surfaces.setter
+    def max_cached_surfaces(self, max_cached_surfaces):
+        if not isinstance(max_cached_surfaces, int):
+            raise ValueError("max cached surfaces must be an integer")
+        if max_cached_surfaces < 1:
+            raise ValueError("max cached surfaces must be greater than 0")
+        self._max_cached_surfaces = max_cached_surfaces
+
+    def get_font(self, size):
+        """
+        Returns the font of the given size, loading it the first time it is requested
+
+        :param size: The size of the font
+        :return: The font of the given size
+        """
+        font = self.fonts.get(size)
+        if not font:
+            font = pygame.font.Font(self.FONT_NAME, size)
+            self.fonts[size] = font
+        return font
+
+    def render(self, text, size, color, background=None):
+        """
+        Returns the given text rendered with antialiasing, rendering it only if it isn't cached
+
+        :param text: The text to render
+        :param size: The size of the font to render the text with
+        :param color: The color of the text
+        :param background: The background color of the text (None for a transparent background)
+        :return: A surface containing the rendered text
+        """
+        key = (text, size, tuple(color), tuple(background) if background else None)
+        surface = self.surfaces.get(key)
+        if surface:
+            self.surfaces.move_to_end(key)
+            return surface
+        surface = self.get_font(size).render(text, True, color, background)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_cached_surfaces:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """
+        Drops every rendered text surface, the fonts are kept
+        """
+        self.surfaces.clear()
@@ -0,0 +1 @@
+from .vector_nibbles import VectorNibbles
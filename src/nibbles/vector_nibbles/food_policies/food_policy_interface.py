@@ -0,0 +1,21 @@
+class FoodPolicyInterface:
+    """
+    Represents a basic policy that decides where and how valuable the food of a VectorNibbles board is
+    """
+    def reset(self, boards):
+        """
+        Called when boards are reset to the start of their level, before their first food item is spawned
+
+        :param: boards: An array of the indices of the boards that were reset
+        """
+        pass
+
+    def spawn_food(self, free_cells, boards):
+        """
+        Chooses a food item for each of the given boards
+
+        :param: free_cells: A boolean array of shape (len(boards), cells) marking the food spawns that are empty
+        :param: boards: An array of the indices of the boards to spawn food on
+        :returns: A (cells, points) tuple of integer arrays, the cell is -1 for boards without an empty food spawn
+        """
+        pass
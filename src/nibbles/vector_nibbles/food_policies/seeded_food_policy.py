@@ -0,0 +1,52 @@
+from random import Random
+import numpy as np
+from nibbles.vector_nibbles.food_policies.food_policy_interface import FoodPolicyInterface
+
+
+class SeededFoodPolicy(FoodPolicyInterface):
+    """
+    Represents a food policy that places food exactly like Nibbles does for a given seed
+
+    Each board has its own Random seeded like a Nibbles game, which first spends one draw per snake on picking the snake
+    colors. A board then plays out the same as a Nibbles game with the same seed when the snakes move the same way
+    """
+    NUMBER_OF_COLORS = 8
+
+    def __init__(self, seeds, number_of_snakes):
+        """
+        :param seeds: A list with the seed of each board
+        :param number_of_snakes: The number of snakes on each board
+        """
+        self.seeds = list(seeds)
+        self.number_of_snakes = number_of_snakes
+        self.randoms = [Random() for _ in self.seeds]
+
+    def reset(self, boards):
+        """
+        Restarts the random number generators of boards from their seeds
+
+        :param: boards: An array of the indices of the boards that were reset
+        """
+        for board in boards:
+            random = self.randoms[board]
+            random.seed(self.seeds[board])
+            for available_colors in range(self.NUMBER_OF_COLORS, self.NUMBER_OF_COLORS - self.number_of_snakes, -1):
+                random.randint(0, available_colors - 1)
+
+    def spawn_food(self, free_cells, boards):
+        """
+        Chooses a food item for each of the given boards
+
+        :param: free_cells: A boolean array of shape (len(boards), cells) marking the food spawns that are empty
+        :param: boards: An array of the indices of the boards to spawn food on
+        :returns: A (cells, points) tuple of integer arrays, the cell is -1 for boards without an empty food spawn
+        """
+        cells = np.full(len(boards), -1, dtype=np.int64)
+        points = np.zeros(len(boards), dtype=np.int64)
+        for i, board in enumerate(boards):
+            random = self.randoms[board]
+            points[i] = random.randint(1, 9)
+            free_indices = np.flatnonzero(free_cells[i])
+            if len(free_indices):
+                cells[i] = free_indices[random.randrange(len(free_indices))]
+        return cells, points
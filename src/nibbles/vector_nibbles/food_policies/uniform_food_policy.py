@@ -0,0 +1,30 @@
+import numpy as np
+from nibbles.vector_nibbles.food_policies.food_policy_interface import FoodPolicyInterface
+
+
+class UniformFoodPolicy(FoodPolicyInterface):
+    """
+    Represents a food policy that spawns food on a uniformly random empty food spawn with 1 to 9 points, all boards
+    draw from one NumPy generator
+    """
+    def __init__(self, seed=None):
+        """
+        :param seed: The seed of the random number generator (None to pick a random seed)
+        """
+        self.generator = np.random.default_rng(seed)
+
+    def spawn_food(self, free_cells, boards):
+        """
+        Chooses a food item for each of the given boards
+
+        :param: free_cells: A boolean array of shape (len(boards), cells) marking the food spawns that are empty
+        :param: boards: An array of the indices of the boards to spawn food on
+        :returns: A (cells, points) tuple of integer arrays, the cell is -1 for boards without an empty food spawn
+        """
+        points = self.generator.integers(1, 10, size=len(boards))
+        free_counts = free_cells.sum(axis=1)
+        # pick the nth free cell of each board by finding where the running count of free cells passes n
+        targets = (self.generator.random(len(boards)) * free_counts).astype(np.int64)
+        cells = np.argmax(free_cells.cumsum(axis=1) > targets[:, None], axis=1)
+        cells[free_counts == 0] = -1
+        return cells, points
@@ -0,0 +1,248 @@
+import numpy as np
+from nibbles.directions import Directions
+from nibbles.ai.grid_a_star import GridAStar
+from nibbles.vector_nibbles.food_policies.uniform_food_policy import UniformFoodPolicy
+
+
+class VectorNibbles:
+    """
+    Represents a batch of independent nibbles boards of one level that are advanced in lockstep
+
+    The rules are the same as Nibbles.update followed by Nibbles.reset_snakes whenever a snake died. Snakes are still
+    moved one after another like Nibbles does, but each move is applied to every board at once with array operations.
+    Cells are addressed by their collision map index (column + row * width) and directions by their index in
+    Directions.DIRECTIONS. Snake bodies are stored in ring buffers ordered from head to tail, starting at the head
+    position of the snake
+    """
+    NUMBER_OF_SPAWNS = 8
+    NO_FOOD = -1
+    NO_DIRECTION = -1
+    INITIAL_DIRECTION = Directions.DIRECTIONS.index(Directions.VECTOR_LEFT)
+    OPPOSITE_DIRECTIONS = np.array([Directions.DIRECTIONS.index(Directions.OPPOSITE_DIRECTIONS[direction])
+                                    for direction in Directions.DIRECTIONS])
+    MAX_FOOD_POINTS = 9
+    PLAYER_LIVES = 5
+    AI_LIVES = 2
+    BODY_SLACK = 64  # room for food that was eaten while the tail still holds stacked chunks
+
+    def __init__(self, number_of_boards, level, board_width, board_height, number_of_players, number_of_ai,
+                 food_policy=None):
+        """
+        :param number_of_boards: The number of boards to play at once
+        :param level: The Level to play on every board
+        :param board_width: The width of the game board
+        :param board_height: The height of the game board
+        :param number_of_players: The number of snakes that get the lives of a human player
+        :param number_of_ai: The number of snakes that get the lives of an AI player
+        :param food_policy: The FoodPolicyInterface that places food (None for a UniformFoodPolicy)
+        """
+        if number_of_boards < 1:
+            raise ValueError("number of boards must be greater than 0")
+        if not 1 <= number_of_players + number_of_ai <= self.NUMBER_OF_SPAWNS:
+            raise ValueError("number of snakes must be between 1 and 8")
+        if len(level.initial_snake_head_spawns) != self.NUMBER_OF_SPAWNS:
+            raise RuntimeError("Level does not contain 8 snake spawns")
+        self.number_of_boards = number_of_boards
+        self.board_width = board_width
+        self.board_height = board_height
+        self.size = board_width * board_height
+        self.number_of_snakes = number_of_players + number_of_ai
+        self.food_policy = food_policy if food_policy else UniformFoodPolicy()
+        self.neighbors = np.array(GridAStar.build_neighbor_table(board_width, board_height), dtype=np.int64)
+        self.barrier_counts = np.zeros(self.size, dtype=np.int16)
+        np.add.at(self.barrier_counts, [barrier.column + barrier.row * board_width for barrier in level.barriers], 1)
+        self.food_spawns = np.zeros(self.size, dtype=bool)
+        self.food_spawns[[spawn.column + spawn.row * board_width for spawn in level.food_spawns]] = True
+        self.head_spawns = np.array([spawn.column + spawn.row * board_width
+                                     for spawn in level.initial_snake_head_spawns], dtype=np.int64)
+        self.initial_lives = np.array([self.PLAYER_LIVES] * number_of_players + [self.AI_LIVES] * number_of_ai,
+                                      dtype=np.int16)
+
+        shape = (number_of_boards, self.number_of_snakes)
+        self.body_capacity = self.size + self.BODY_SLACK
+        self.counts = np.zeros((number_of_boards, self.size), dtype=np.int16)
+        self.bodies = np.zeros(shape + (self.body_capacity, ), dtype=np.int32)
+        self.head_positions = np.zeros(shape, dtype=np.int64)
+        self.lengths = np.zeros(shape, dtype=np.int64)
+        self.directions = np.zeros(shape, dtype=np.int8)
+        self.last_directions = np.zeros(shape, dtype=np.int8)
+        self.lives = np.zeros(shape, dtype=np.int16)
+        self.scores = np.zeros(shape, dtype=np.int64)
+        self.present = np.zeros(shape, dtype=bool)
+        self.killed = np.zeros(shape, dtype=bool)
+        self.food_cells = np.full(number_of_boards, self.NO_FOOD, dtype=np.int64)
+        self.food_points = np.zeros(number_of_boards, dtype=np.int64)
+        self.ticks = np.zeros(number_of_boards, dtype=np.int64)
+        self.stopped = np.zeros(number_of_boards, dtype=bool)
+        self.reset()
+
+    @property
+    def occupancy(self):
+        """
+        A read only (boards, height, width) view of the number of barriers and snake body chunks inside of each cell
+        """
+        occupancy = self.counts.reshape((self.number_of_boards, self.board_height, self.board_width))
+        occupancy.flags.writeable = False
+        return occupancy
+
+    def body_cells(self, board, snake):
+        """
+        Returns the cells of a snake's body
+
+        :param board: The index of the board
+        :param snake: The index of the snake
+        :return: An array of the cell indices of the snake's body chunks ordered from head to tail
+        """
+        positions = (self.head_positions[board, snake] + np.arange(self.lengths[board, snake])) % self.body_capacity
+        return self.bodies[board, snake, positions]
+
+    def reset(self, boards=None):
+        """
+        Restarts boards at the beginning of the level
+
+        :param boards: An array of the indices of the boards to restart (None for every board)
+        """
+        boards = np.arange(self.number_of_boards) if boards is None else np.asarray(boards, dtype=np.int64)
+        head_spawns = self.head_spawns[:self.number_of_snakes]
+        self.counts[boards] = self.barrier_counts
+        self.counts[np.ix_(boards, head_spawns)] += 1
+        self.bodies[boards, :, 0] = head_spawns
+        self.head_positions[boards] = 0
+        self.lengths[boards] = 1
+        self.directions[boards] = self.INITIAL_DIRECTION
+        self.last_directions[boards] = self.INITIAL_DIRECTION
+        self.lives[boards] = self.initial_lives
+        self.scores[boards] = 0
+        self.present[boards] = True
+        self.killed[boards] = False
+        self.ticks[boards] = 0
+        self.stopped[boards] = False
+        self.food_cells[boards] = self.NO_FOOD
+        self.food_policy.reset(boards)
+        self.spawn_food(boards)
+
+    def spawn_food(self, boards):
+        """
+        Asks the food policy for a new food item on boards that don't have one
+
+        :param boards: An array of the indices of the boards to spawn food on
+        """
+        if not len(boards):
+            return
+        free_cells = self.food_spawns & (self.counts[boards] == 0)
+        cells, points = self.food_policy.spawn_food(free_cells, boards)
+        self.food_cells[boards] = cells
+        self.food_points[boards] = np.where(cells != self.NO_FOOD, points, 0)
+
+    def move_snake(self, snake, boards, reset_needed):
+        """
+        Moves one snake on every given board, then lets it lose a life and eat like Nibbles.update does
+
+        :param snake: The index of the snake to move
+        :param boards: An array of the indices of the boards the snake is playing on
+        :param reset_needed: A boolean array of the boards whose snakes must be reset, updated in place
+        """
+        capacity = self.body_capacity
+        last_directions = self.last_directions[boards, snake]
+        directions = self.directions[boards, snake]
+        directions = np.where(directions == self.OPPOSITE_DIRECTIONS[last_directions], last_directions, directions)
+        self.directions[boards, snake] = directions
+        head_positions = self.head_positions[boards, snake]
+        lengths = self.lengths[boards, snake]
+        tails = self.bodies[boards, snake, (head_positions + lengths - 1) % capacity]
+        self.counts[boards, tails] -= 1
+        heads = self.neighbors[self.bodies[boards, snake, head_positions], directions]
+        head_positions = (head_positions - 1) % capacity
+        self.bodies[boards, snake, head_positions] = heads
+        self.head_positions[boards, snake] = head_positions
+        self.counts[boards, heads] += 1
+        self.last_directions[boards, snake] = directions
+
+        died = self.counts[boards, heads] > 1
+        if died.any():
+            dead_boards = boards[died]
+            self.lives[dead_boards, snake] -= 1
+            self.killed[dead_boards, snake] = True
+            reset_needed[dead_boards] = True
+
+        ate = heads == self.food_cells[boards]
+        if ate.any():
+            eating_boards = boards[ate]
+            points = self.food_points[eating_boards]
+            tail_positions = (head_positions[ate] + lengths[ate] - 1) % capacity
+            tails = self.bodies[eating_boards, snake, tail_positions]
+            for chunk in range(1, self.MAX_FOOD_POINTS + 1):
+                growing = points >= chunk
+                self.bodies[eating_boards[growing], snake, (tail_positions[growing] + chunk) % capacity] = \
+                    tails[growing]
+            self.counts[eating_boards, tails] += points.astype(np.int16)
+            self.lengths[eating_boards, snake] += points
+            self.scores[eating_boards, snake] += points
+            if (self.lengths[eating_boards, snake] > capacity).any():
+                raise RuntimeError("snake body exceeds the body buffer")
+            self.food_cells[eating_boards] = self.NO_FOOD
+            self.spawn_food(eating_boards)
+
+    def remove_bodies(self, boards, snakes):
+        """
+        Removes the body chunks of snakes from the occupancy counts
+
+        :param boards: An array of the board index of each snake
+        :param snakes: An array of the index of each snake
+        """
+        lengths = self.lengths[boards, snakes]
+        chunk_boards = np.repeat(boards, lengths)
+        # number the chunks of each snake from 0 by subtracting the index of the snake's first chunk
+        chunk_numbers = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        positions = (np.repeat(self.head_positions[boards, snakes], lengths) + chunk_numbers) % self.body_capacity
+        cells = self.bodies[chunk_boards, np.repeat(snakes, lengths), positions]
+        np.subtract.at(self.counts, (chunk_boards, cells), 1)
+
+    def reset_snakes(self, boards):
+        """
+        Shrinks the snakes of boards back to their heads at the level's spawns, like Nibbles.reset_snakes the n-th
+        remaining snake of a board is moved to the n-th spawn
+
+        :param boards: An array of the indices of the boards
+        """
+        present = self.present[boards]
+        spawn_numbers = np.cumsum(present, axis=1) - 1
+        board_numbers, snakes = np.nonzero(present)
+        boards = boards[board_numbers]
+        self.remove_bodies(boards, snakes)
+        heads = self.head_spawns[spawn_numbers[board_numbers, snakes]]
+        self.bodies[boards, snakes, 0] = heads
+        self.head_positions[boards, snakes] = 0
+        self.lengths[boards, snakes] = 1
+        self.counts[boards, heads] += 1
+
+    def step(self, directions=None):
+        """
+        Advances every board that isn't stopped by one tick
+
+        :param directions: An integer array of shape (boards, snakes) with the direction each snake should move in or
+                           NO_DIRECTION to keep its current direction (None to keep every direction)
+        :return: A boolean array of shape (boards, snakes) marking the snakes that lost a life during the tick
+        """
+        if directions is not None:
+            directions = np.asarray(directions)
+            changed = directions != self.NO_DIRECTION
+            self.directions[changed] = directions[changed]
+        self.killed[:] = False
+        reset_needed = np.zeros(self.number_of_boards, dtype=bool)
+        active = ~self.stopped
+        self.spawn_food(np.flatnonzero(active & (self.food_cells == self.NO_FOOD)))
+        for snake in range(self.number_of_snakes):
+            boards = np.flatnonzero(active & self.present[:, snake])
+            if len(boards):
+                self.move_snake(snake, boards, reset_needed)
+
+        dead_boards, dead_snakes = np.nonzero(self.killed & (self.lives <= 0))
+        if len(dead_boards):
+            self.remove_bodies(dead_boards, dead_snakes)
+            self.present[dead_boards, dead_snakes] = False
+            self.stopped[dead_boards] = ~self.present[dead_boards].any(axis=1)
+        self.ticks[active] += 1
+        if reset_needed.any():
+            self.reset_snakes(np.flatnonzero(reset_needed))
+        return self.killed
@@ -0,0 +1,40 @@
+import time
+from argparse import ArgumentParser
+from nibbles.replay.replay import Replay
+from nibbles.replay.replay_engine import ReplayEngine
+
+
+def print_game_state(nibbles):
+    """
+    Prints the state of the snakes and the food of a game
+
+    :param nibbles: The Nibbles instance to print the state of
+    """
+    print("tick {0}".format(nibbles.tick))
+    for snake in nibbles.snakes:
+        print("  snake {0}: score {1}, lives {2}, length {3}, head (column {4}, row {5}), moving {6}".format(
+            snake.snake_id, snake.score, snake.lives, len(snake.body), snake.head.column, snake.head.row,
+            snake.last_direction_moved))
+    if nibbles.food:
+        print("  food: column {0}, row {1}, points {2}".format(nibbles.food.column, nibbles.food.row,
+                                                               nibbles.food.points))
+
+
+if __name__ == "__main__":
+    arg_parser = ArgumentParser(description="Play a nibbles replay headlessly and print the game state")
+    arg_parser.add_argument('replay_path', type=str, help='The path of the replay to play')
+    arg_parser.add_argument('--tick', metavar='-t', type=int, action='append',
+                            help='A tick to print the game state at (may be repeated, defaults to the end)')
+    arg_parser.add_argument('--cache_dir', metavar='-cd', type=str,
+                            help='The directory to cache processed resources in between launches', default=None)
+    args = arg_parser.parse_args()
+    replay = Replay.load(args.replay_path)
+    print("seed {0}, level {1}, {2} players, {3} ai, {4} ticks".format(replay.seed, replay.level_number,
+                                                                      replay.number_of_players, replay.number_of_ai,
+                                                                      replay.tick_count))
+    start_time = time.perf_counter()
+    replay_engine = ReplayEngine(replay, cache_dir=args.cache_dir)
+    for tick in args.tick or [replay.tick_count]:
+        replay_engine.seek(tick)
+        print_game_state(replay_engine.nibbles)
+    print("simulated in {0:.3f}s".format(time.perf_counter() - start_time))
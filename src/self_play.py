@@ -0,0 +1,60 @@
+import json
+from argparse import ArgumentParser
+from nibbles.level.level_parsers.level_parser_types import LevelParserTypes
+from nibbles.ai.ai_difficulty_levels import AiDifficultyLevel
+from nibbles.self_play.self_play_runner import SelfPlayRunner
+BOARD_WIDTH = 80
+BOARD_HEIGHT = 50
+
+
+def parse_difficulty_mix(difficulty_mix):
+    """
+    Parses a comma separated list of AI difficulty levels
+
+    :param difficulty_mix: The difficulty levels of the snakes, e.g. 'easy,hard,hard'
+    :return: A list of AiDifficultyLevels
+    """
+    return [AiDifficultyLevel(difficulty.strip()) for difficulty in difficulty_mix.split(',')]
+
+
+if __name__ == "__main__":
+    arg_parser = ArgumentParser(description="Play headless AI vs AI nibbles matches and summarize the results")
+    arg_parser.add_argument('--ai', metavar='-a', type=parse_difficulty_mix,
+                            help='The comma separated difficulty levels of the snakes (easy, intermediate, hard)',
+                            default="intermediate,hard")
+    arg_parser.add_argument('--level_number', metavar='-ln', type=int, help='The level number to play', default=0)
+    arg_parser.add_argument('--first_seed', metavar='-fs', type=int, help='The seed of the first match', default=0)
+    arg_parser.add_argument('--matches', metavar='-m', type=int, help='The number of matches to play, one per seed',
+                            default=100)
+    arg_parser.add_argument('--max_ticks', metavar='-mt', type=int, help='The number of ticks after which a match '
+                            'is stopped', default=10000)
+    arg_parser.add_argument('--workers', metavar='-w', type=int, help='The number of processes to use (every core '
+                            'by default)', default=None)
+    arg_parser.add_argument('--level_dir', metavar='-ld', type=str,
+                            help='The path to the level data (a level directory or a level pack file)', default=None)
+    arg_parser.add_argument('--level_parser', metavar='-lp', type=LevelParserTypes,
+                            help='The level parser to use (png_parser, pack_parser)', default="png_parser",
+                            choices=[LevelParserTypes.PNG_PARSER, LevelParserTypes.PACK_PARSER])
+    arg_parser.add_argument('--cache_dir', metavar='-cd', type=str,
+                            help='The directory to cache processed resources in between launches', default=None)
+    arg_parser.add_argument('--json', metavar='-j', type=str, help='The path to write the summary to as JSON',
+                            default=None)
+    args = arg_parser.parse_args()
+    self_play_runner = SelfPlayRunner(args.level_number, args.ai, range(args.first_seed,
+                                                                         args.first_seed + args.matches),
+                                      args.level_parser, BOARD_WIDTH, BOARD_HEIGHT, args.max_ticks, args.level_dir,
+                                      args.cache_dir, args.workers)
+    summary = self_play_runner.run().to_dict()
+    print("{0} matches, {1} draws, {2:.0f} ticks per match on average".format(
+        summary['matches'], summary['draws'], summary['average_match_ticks']))
+    for index, snake in enumerate(summary['snakes']):
+        print("snake {0} ({1}): win rate {2:.1%}, average score {3:.1f}, average ticks survived {4:.0f}".format(
+            index + 1, snake['ai_difficulty_level'], snake['win_rate'], snake['average_score'],
+            snake['average_ticks_survived']))
+    tick_time = summary['tick_time']
+    print("tick time: mean {0:.3f}ms, p50 {1:.3f}ms, p95 {2:.3f}ms, p99 {3:.3f}ms".format(
+        tick_time['mean'] * 1e3, tick_time['p50'] * 1e3, tick_time['p95'] * 1e3, tick_time['p99'] * 1e3))
+    print("{0:.0f} ticks per second over {1:.1f}s".format(summary['ticks_per_second'], summary['wall_time']))
+    if args.json:
+        with open(args.json, 'w') as json_file:
+            json.dump(summary, json_file, indent=2)
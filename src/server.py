@@ -0,0 +1,73 @@
+import asyncio
+from argparse import ArgumentParser
+from nibbles import Nibbles
+from nibbles.level.level_parsers.level_parser_types import LevelParserTypes
+from nibbles.ai.ai_difficulty_levels import AiDifficultyLevel
+from nibbles.ai.ai_executors.ai_executor_types import AiExecutorTypes
+from nibbles.ai.ai_executors.ai_executor_builder import AiExecutorBuilder
+from nibbles.network.nibbles_server import NibblesServer
+from nibbles.nibbles_gui import NibblesGUI
+BOARD_WIDTH = 80
+BOARD_HEIGHT = 50
+
+
+async def serve(nibbles_server):
+    """
+    Plays the game of a server until the process is interrupted
+
+    :param nibbles_server: The NibblesServer to run
+    """
+    await nibbles_server.start()
+    print("serving level {0} on {1}:{2}".format(nibbles_server.nibbles.level_number, nibbles_server.host,
+                                               nibbles_server.port))
+    try:
+        await nibbles_server.run()
+    finally:
+        await nibbles_server.stop()
+
+
+if __name__ == "__main__":
+    arg_parser = ArgumentParser(description="Host a nibbles game for remote players")
+    arg_parser.add_argument('--host', metavar='-ho', type=str, help='The address to listen on', default='0.0.0.0')
+    arg_parser.add_argument('--port', metavar='-p', type=int, help='The port to listen on', default=7777)
+    arg_parser.add_argument('--level_dir', metavar='-ld', type=str,
+                            help='The path to the level data (a level directory or a level pack file)', default=None)
+    arg_parser.add_argument('--level_parser', metavar='-lp', type=LevelParserTypes,
+                            help='The level parser to use (png_parser, pack_parser)', default="png_parser",
+                            choices=[LevelParserTypes.PNG_PARSER, LevelParserTypes.PACK_PARSER])
+    arg_parser.add_argument('--initial_level_number', metavar='-ln', type=int, help='The level number to play',
+                            default=0)
+    arg_parser.add_argument('--initial_game_difficulty', metavar='-d', type=float, help='The initial game difficulty',
+                            default=1.0)
+    arg_parser.add_argument('--number_of_players', metavar='-np', type=int,
+                            help='The number of snakes remote players can control', default=2)
+    arg_parser.add_argument('--number_of_ai', metavar='-na', type=int, help='The number of AI players',
+                            default=0)
+    arg_parser.add_argument('--ai_difficulty_level', metavar='-adl', type=AiDifficultyLevel,
+                            help='The difficulty level of the ai (easy, intermediate, hard)', default="intermediate",
+                            choices=[AiDifficultyLevel.EASY, AiDifficultyLevel.INTERMEDIATE, AiDifficultyLevel.HARD])
+    arg_parser.add_argument('--ai_executor', metavar='-ae', type=AiExecutorTypes,
+                            help='How to run the ai (auto, inline, thread_pool, process_pool)', default="auto",
+                            choices=[AiExecutorTypes.AUTO, AiExecutorTypes.INLINE, AiExecutorTypes.THREAD_POOL,
+                                     AiExecutorTypes.PROCESS_POOL])
+    arg_parser.add_argument('--keyframe_interval', metavar='-ki', type=int,
+                            help='The number of ticks between two keyframes', default=60)
+    arg_parser.add_argument('--resume_delay', metavar='-rd', type=float,
+                            help='The number of seconds the game stays paused after a snake lost a life', default=2.0)
+    arg_parser.add_argument('--buffered_turns', metavar='-bt', type=int,
+                            help='The number of turns to remember per player between ticks', default=3)
+    arg_parser.add_argument('--cache_dir', metavar='-cd', type=str,
+                            help='The directory to cache processed resources in between launches', default=None)
+    arg_parser.add_argument('--seed', metavar='-s', type=int,
+                            help='The seed of the random number generator (random by default)', default=None)
+    args = arg_parser.parse_args()
+    nibbles = Nibbles(NibblesGUI.SNAKE_COLORS, BOARD_WIDTH, BOARD_HEIGHT, args.initial_game_difficulty,
+                      args.number_of_players, args.number_of_ai, args.ai_difficulty_level, args.level_parser,
+                      args.initial_level_number, True, args.cache_dir, args.level_dir, args.seed, prefetch=False)
+    ai_executor = AiExecutorBuilder(args.ai_executor, args.ai_difficulty_level).build()
+    nibbles_server = NibblesServer(nibbles, ai_executor, args.host, args.port, args.keyframe_interval,
+                                   args.resume_delay, args.buffered_turns)
+    try:
+        asyncio.run(serve(nibbles_server))
+    except KeyboardInterrupt:
+        pass
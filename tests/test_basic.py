@@ -1 +1,812 @@
-# this should include some basic tests
\ No newline at end of file
+# this should include some basic tests
+import os
+import pathlib
+import shutil
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import asyncio
+from array import array
+from collections import deque
+from random import Random
+from types import SimpleNamespace
+from threading import Event
+import numpy as np
+import pygame
+from PIL import Image
+from nibbles.nibbles import Nibbles
+from nibbles.snake import Snake
+from nibbles.display import Display
+from nibbles.directions import Directions
+from nibbles.fixed_timestep_scheduler import FixedTimestepScheduler
+from nibbles.input_queue import InputQueue
+from nibbles.free_cell_index import FreeCellIndex
+from nibbles.collision_map import CollisionMap
+from nibbles.profiling.profiler import Profiler
+from nibbles.ai.ai_difficulty_levels import AiDifficultyLevel
+from nibbles.ai.ai import Ai
+from nibbles.ai.ai_executors.inline_ai_executor import InlineAiExecutor
+from nibbles.ai.ai_executors.thread_pool_ai_executor import ThreadPoolAiExecutor
+from nibbles.ai.ai_executors.process_pool_ai_executor import ProcessPoolAiExecutor
+from nibbles.ai.grid_a_star import GridAStar
+from nibbles.ai.distance_field import DistanceField
+from nibbles.level.level_parsers.level_parser_types import LevelParserTypes
+from nibbles.vector_nibbles import VectorNibbles
+from nibbles.environment import NibblesEnvironment
+from nibbles.vector_nibbles.food_policies.seeded_food_policy import SeededFoodPolicy
+from nibbles.level.level import Level
+from nibbles.level.level_registry import LevelRegistry
+from nibbles.level.level_parsers.level_parser_builder import LevelParserBuilder
+from nibbles.level.level_parsers.png_level_parser import PNGLevelParser
+from nibbles.snapshot.frame_snapshot import FrameSnapshot
+from nibbles.replay import Replay, ReplayRecorder, ReplayEngine
+from nibbles.network.protocol import Protocol
+from nibbles.network.frame_codec import FrameCodec
+from nibbles.network.nibbles_client import NibblesClient
+from nibbles.network.nibbles_server import NibblesServer
+from level_pack_converter import convert_levels
+
+BOARD_WIDTH = 80
+BOARD_HEIGHT = 50
+TEST_COLORS = [(index, index, index) for index in range(8)]
+LEVEL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'nibbles', 'resources',
+                         'levels')
+
+
+def create_level_parser(level_parser_type=LevelParserTypes.PNG_PARSER, level_dir=LEVEL_DIR, cache_dir=None):
+    """
+    Builds a level parser reading the given level data on the test board size
+    """
+    level_parser = LevelParserBuilder(level_parser_type, cache_dir).build()
+    level_parser.set_data_source(BOARD_WIDTH, BOARD_HEIGHT, level_dir)
+    return level_parser
+
+
+def assert_boards_match(vector_nibbles, board, nibbles):
+    """
+    Asserts that a board of a VectorNibbles is in the same state as a Nibbles game
+    """
+    assert np.array_equal(vector_nibbles.counts[board], np.frombuffer(nibbles.collision_map.counts, dtype=np.uint16))
+    food_cell = nibbles.food.column + nibbles.food.row * BOARD_WIDTH if nibbles.food else VectorNibbles.NO_FOOD
+    assert vector_nibbles.food_cells[board] == food_cell
+    if nibbles.food:
+        assert vector_nibbles.food_points[board] == nibbles.food.points
+    assert vector_nibbles.ticks[board] == nibbles.tick
+    assert vector_nibbles.stopped[board] == nibbles.stopped
+    assert sorted(snake.snake_id - 1 for snake in nibbles.snakes) == list(np.flatnonzero(vector_nibbles.present[board]))
+    for snake in nibbles.snakes:
+        index = snake.snake_id - 1
+        assert vector_nibbles.scores[board, index] == snake.score
+        assert vector_nibbles.lives[board, index] == snake.lives
+        assert list(vector_nibbles.body_cells(board, index)) == \
+            [chunk.column + chunk.row * BOARD_WIDTH for chunk in snake.body]
+
+
+def test_vector_nibbles_matches_nibbles():
+    """
+    Plays seeded AI games with Nibbles and feeds the same directions to a VectorNibbles, every board has to stay in the
+    same state as its game, including lost lives, removed snakes and stopped boards
+    """
+    seeds = [11, 12, 13, 14]
+    for level_number, number_of_ai in ((1, 2), (2, 1)):
+        games = []
+        for seed in seeds:
+            nibbles = Nibbles(TEST_COLORS, BOARD_WIDTH, BOARD_HEIGHT, 1.0, 0, number_of_ai, AiDifficultyLevel.EASY,
+                              LevelParserTypes.PNG_PARSER, level_number, True, seed=seed)
+            nibbles.initialize_level()
+            nibbles.level_registry.shutdown()
+            games.append(nibbles)
+        vector_nibbles = VectorNibbles(len(seeds), games[0].loaded_level, BOARD_WIDTH, BOARD_HEIGHT, 0, number_of_ai,
+                                       SeededFoodPolicy(seeds, number_of_ai))
+        ai_executor = InlineAiExecutor()
+        for _ in range(300):
+            directions = np.full((len(seeds), number_of_ai), VectorNibbles.NO_DIRECTION)
+            for board, nibbles in enumerate(games):
+                if nibbles.stopped:
+                    continue
+                ai_executor.calculate_ai_directions(nibbles)
+                for snake in nibbles.snakes:
+                    directions[board, snake.snake_id - 1] = Directions.DIRECTIONS.index(snake.direction_to_move)
+                nibbles.update()
+                if nibbles.snake_reset_needed:
+                    nibbles.reset_snakes()
+            vector_nibbles.step(directions)
+            for board, nibbles in enumerate(games):
+                assert_boards_match(vector_nibbles, board, nibbles)
+
+
+def capture_board(nibbles):
+    """
+    Returns the collision map, food, snakes and random number generator state of a game
+    """
+    collision_map = nibbles.collision_map
+    food = (nibbles.food.column, nibbles.food.row, nibbles.food.points) if nibbles.food else None
+    snakes = [(snake.snake_id, snake.lives, snake.score, [(chunk.column, chunk.row) for chunk in snake.body])
+              for snake in nibbles.snakes]
+    return (bytes(collision_map.cell_types), collision_map.counts.tobytes(), collision_map.owner_counts.tobytes(),
+            len(collision_map.free_cells), food, snakes, nibbles.tick, nibbles.random.getstate())
+
+
+def test_restore_snapshot_matches_game():
+    """
+    Plays a seeded AI game with lost lives and removed snakes while taking snapshots, restoring the snapshots out of
+    order has to bring back the collision map, food and random number generator state of the tick they were taken on,
+    and the game has to play on from a restored snapshot the same way it did before
+    """
+    nibbles = Nibbles(TEST_COLORS, BOARD_WIDTH, BOARD_HEIGHT, 1.0, 0, 4, AiDifficultyLevel.EASY,
+                      LevelParserTypes.PNG_PARSER, 1, True, seed=31)
+    nibbles.initialize_level()
+    nibbles.level_registry.shutdown()
+    ai_executor = InlineAiExecutor()
+    snapshots = []
+    boards = {}
+    for tick in range(500):
+        if nibbles.stopped:
+            break
+        if tick % 7 == 0 or nibbles.snake_reset_needed:
+            snapshots.append(nibbles.create_snapshot())
+            boards[id(snapshots[-1])] = capture_board(nibbles)
+        if nibbles.snake_reset_needed:
+            nibbles.reset_snakes()
+        ai_executor.calculate_ai_directions(nibbles)
+        nibbles.update()
+    assert any(snapshot.snake_reset_needed for snapshot in snapshots)
+    assert len({len(snapshot.snakes) for snapshot in snapshots}) > 1
+
+    for snapshot in Random(3).sample(snapshots, len(snapshots)):
+        nibbles.restore_snapshot(snapshot)
+        assert capture_board(nibbles) == boards[id(snapshot)]
+    for snapshot, next_snapshot in zip(snapshots, snapshots[1:]):
+        nibbles.restore_snapshot(snapshot)
+        while nibbles.tick < next_snapshot.tick:
+            if nibbles.snake_reset_needed:
+                nibbles.reset_snakes()
+            ai_executor.calculate_ai_directions(nibbles)
+            nibbles.update()
+        assert capture_board(nibbles) == boards[id(next_snapshot)]
+
+
+def test_replay_plays_recorded_game_again(tmp_path):
+    """
+    Records a seeded AI game with lost lives and removed snakes, the saved replay has to play out into the same board on
+    every tick, also when seeking back and forth through the keyframes
+    """
+    nibbles = Nibbles(TEST_COLORS, BOARD_WIDTH, BOARD_HEIGHT, 1.0, 0, 6, AiDifficultyLevel.INTERMEDIATE,
+                      LevelParserTypes.PNG_PARSER, 2, True, seed=1234, prefetch=False)
+    nibbles.initialize_level()
+    replay_recorder = ReplayRecorder(nibbles)
+    ai_executor = InlineAiExecutor()
+    boards = {}
+    while not nibbles.stopped and nibbles.tick < 600:
+        boards[nibbles.tick] = capture_board(nibbles)
+        ai_executor.calculate_ai_directions(nibbles)
+        tick = nibbles.tick
+        snakes = nibbles.snakes.copy()
+        nibbles.update()
+        replay_recorder.record_tick(tick, snakes)
+        if nibbles.snake_reset_needed:
+            nibbles.reset_snakes()
+    boards[nibbles.tick] = capture_board(nibbles)
+    assert len(boards[0][5]) > len(boards[nibbles.tick][5])
+    replay_path = tmp_path / 'game.nbr'
+    replay_recorder.save(replay_path)
+
+    replay_engine = ReplayEngine(Replay.load(replay_path), keyframe_interval=64)
+    replay_engine.run()
+    assert replay_engine.finished and capture_board(replay_engine.nibbles) == boards[nibbles.tick]
+    assert len(replay_engine.keyframe_ticks) > 2
+    for tick in [0, 5, 450, 10, 449, 65, 64, 63, nibbles.tick, 1] + Random(8).sample(sorted(boards), 20):
+        replay_engine.seek(tick)
+        assert capture_board(replay_engine.nibbles) == boards[tick]
+
+
+def test_network_clients_follow_server():
+    """
+    Plays a seeded game on a NibblesServer over localhost with a player and a spectator, after every tick both clients
+    have to have rebuilt the frame snapshot of the server from the keyframes and deltas they received
+    """
+    async def play():
+        nibbles = Nibbles(TEST_COLORS, BOARD_WIDTH, BOARD_HEIGHT, 1.0, 1, 3, AiDifficultyLevel.EASY,
+                          LevelParserTypes.PNG_PARSER, 1, True, seed=21)
+        nibbles_server = NibblesServer(nibbles, keyframe_interval=25)
+        await nibbles_server.start()
+        player = NibblesClient('127.0.0.1', nibbles_server.port)
+        await player.connect()
+        spectator = NibblesClient('127.0.0.1', nibbles_server.port, play=False, level_registry=player.level_registry)
+        await spectator.connect()
+        clients = (player, spectator)
+        assert (player.player_number, spectator.player_number) == (1, 0)
+        turn_random = Random(5)
+        for tick in range(400):
+            for client in clients:
+                frame = await client.receive_frame()
+                server_frame = nibbles_server.frame
+                assert (frame.level.number, frame.tick, frame.paused, frame.food, frame.killed_player_numbers) == \
+                    (server_frame.level.number, server_frame.tick, server_frame.paused, server_frame.food,
+                     server_frame.killed_player_numbers)
+                assert frame.snakes == server_frame.snakes
+            if nibbles.paused:
+                nibbles.paused = False
+                nibbles_server.broadcast_frame()
+            else:
+                if tick % 5 == 0:
+                    player.send_turn(turn_random.choice(Directions.DIRECTIONS))
+                    await asyncio.sleep(0.01)  # let the server read the turn before the tick
+                await nibbles_server.play_tick()
+        assert nibbles_server.input_queue.latency.count > 0
+        assert spectator.keyframes_received >= 400 // 25
+        assert spectator.deltas_received > 10 * spectator.keyframes_received
+        for client in (spectator, player):
+            await client.close()
+        await nibbles_server.stop()
+
+    asyncio.run(asyncio.wait_for(play(), 60))
+
+
+def test_frame_codec_round_trips_large_boards():
+    """
+    Sends a keyframe and a delta of a 500x500 board with long snakes and hundreds of lives through the message framing,
+    the keyframe doesn't fit a 16 bit payload length and both messages have to decode to the frames they were encoded
+    from
+    """
+    width = height = 500
+    level = Level(3)
+    snakes = []
+    for snake_index in range(6):
+        cells = tuple(range(40000 * (snake_index + 1), 40000 * snake_index + 36000, -1))
+        snakes.append((TEST_COLORS[snake_index], snake_index + 1, 70000 * snake_index, 300 + snake_index, cells))
+    frame = FrameSnapshot(level, 100000, False, (499, 499, 9), tuple(snakes), ())
+    moved_snakes = tuple((color, player_number, score + 9, lives - 1, (cells[0] + 1,) + cells[:-1] + cells[-1:] * 2)
+                         for color, player_number, score, lives, cells in snakes)
+    next_frame = FrameSnapshot(level, 100001, False, (0, 0, 1), moved_snakes, (1, 2), snakes)
+    codec = FrameCodec(width, height, lambda level_number: level if level_number == 3 else None)
+    assert codec.can_encode_delta(frame, next_frame)
+    keyframe = Protocol.encode_message(Protocol.KEYFRAME, codec.encode_keyframe(frame))
+    assert len(keyframe) > 0xFFFF
+    delta = Protocol.encode_message(Protocol.DELTA, codec.encode_delta(frame, next_frame))
+
+    async def receive():
+        reader = asyncio.StreamReader()
+        reader.feed_data(keyframe + delta)
+        reader.feed_eof()
+        return [await Protocol.read_message(reader) for _ in range(2)]
+
+    (keyframe_type, keyframe_payload), (delta_type, delta_payload) = asyncio.run(receive())
+    assert (keyframe_type, delta_type) == (Protocol.KEYFRAME, Protocol.DELTA)
+    decoded_frame = codec.decode_keyframe(keyframe_payload)
+    assert (decoded_frame.level, decoded_frame.tick, decoded_frame.food, decoded_frame.snakes) == \
+        (level, frame.tick, frame.food, frame.snakes)
+    decoded_next_frame = codec.decode_delta(delta_payload, decoded_frame)
+    assert (decoded_next_frame.tick, decoded_next_frame.food, decoded_next_frame.killed_player_numbers,
+            decoded_next_frame.snakes) == (next_frame.tick, next_frame.food, (1, 2), moved_snakes)
+
+
+def test_level_registry_parses_cancelled_prefetches():
+    """
+    Shuts a level registry down while its prefetches are queued behind a level that is being parsed, the cancelled
+    prefetches have to be forgotten so every level can still be requested afterwards
+    """
+    level_registry = LevelRegistry(create_level_parser())
+    parse_level = level_registry.level_parser.parse_level
+    parsing = Event()
+    release = Event()
+
+    def blocked_parse_level(level_number):
+        parsing.set()
+        release.wait(10)
+        return parse_level(level_number)
+    level_registry.level_parser.parse_level = blocked_parse_level
+    for level_number in level_registry.level_numbers:
+        level_registry.prefetch_level(level_number)
+    assert parsing.wait(10)
+    level_registry.shutdown()
+    release.set()
+    level_registry.prefetch_level(0)
+    for level_number in level_registry.level_numbers:
+        assert level_registry.get_level(level_number).number == level_number
+    assert not level_registry.pending_levels
+
+
+def breadth_first_distance(grid_a_star, counts, start, goal):
+    """
+    Counts the moves of the shortest path between two cells with a plain breadth first search
+    """
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        if current == goal:
+            return distances[current]
+        for neighbor in grid_a_star.neighbors[current]:
+            if neighbor not in distances and not counts[neighbor]:
+                distances[neighbor] = distances[current] + 1
+                queue.append(neighbor)
+    return None
+
+
+def test_grid_a_star_finds_shortest_paths_across_the_wrap_edge():
+    """
+    Walls off the middle column of the board so the shortest paths between the two halves wrap around the left and
+    right edges, the A* paths guided by the distances around the barriers have to be as short as a breadth first search
+    """
+    grid_a_star = GridAStar(BOARD_WIDTH, BOARD_HEIGHT)
+    barriers = array('H', [0]) * (BOARD_WIDTH * BOARD_HEIGHT)
+    for row in range(BOARD_HEIGHT):
+        barriers[row * BOARD_WIDTH + BOARD_WIDTH // 2] = 1
+    counts = array('H', barriers)
+    random = Random(4)
+    for index in random.sample(range(len(counts)), 600):
+        counts[index] = 1
+    free_cells = [index for index, count in enumerate(counts) if not count]
+    barrier_distance_field = DistanceField(BOARD_WIDTH, BOARD_HEIGHT)
+    wrapped_paths = 0
+    for _ in range(100):
+        start, goal = random.sample(free_cells, 2)
+        barrier_distance_field.compute(barriers, goal)
+        path = grid_a_star.find_path(counts, start, goal, goal_distances=barrier_distance_field.distances)
+        distance = breadth_first_distance(grid_a_star, counts, start, goal)
+        if distance is None:
+            assert path is None
+            continue
+        assert len(path) - 1 == distance
+        assert (path[0], path[-1]) == (start, goal)
+        for cell, next_cell in zip(path, path[1:]):
+            assert next_cell in grid_a_star.neighbors[cell] and not counts[next_cell]
+        wrapped_paths += any(abs(cell % BOARD_WIDTH - next_cell % BOARD_WIDTH) == BOARD_WIDTH - 1
+                             for cell, next_cell in zip(path, path[1:]))
+    assert wrapped_paths
+    start = 10 * BOARD_WIDTH + 2
+    goal = 10 * BOARD_WIDTH + BOARD_WIDTH - 3
+    barrier_distance_field.compute(barriers, goal)
+    assert len(grid_a_star.find_path(barriers, start, goal, goal_distances=barrier_distance_field.distances)) == 6
+    assert len(grid_a_star.find_path(barriers, start, goal)) == 6
+
+
+def describe_level(level):
+    """
+    Lists the number and the cell positions of a level so levels from different parsers can be compared
+    """
+    return (level.number,) + tuple(sorted((coordinate.column, coordinate.row) for coordinate in coordinates)
+                                   for coordinates in (level.barriers, level.food_spawns,
+                                                       level.initial_snake_head_spawns))
+
+
+def test_level_pack_round_trips_png_levels(tmp_path):
+    """
+    Converts the bundled levels into a level pack, which has to parse into the same levels as the PNG parser and keep
+    at most one mapping of the pack open
+    """
+    pack_path = tmp_path / 'levels.nblp'
+    assert convert_levels(LEVEL_DIR, pack_path, BOARD_WIDTH, BOARD_HEIGHT) == 4
+    png_levels = sorted(describe_level(level) for level in create_level_parser().parse_levels())
+    pack_parser = create_level_parser(LevelParserTypes.PACK_PARSER, pack_path)
+    assert sorted(pack_parser.index_levels()) == [level[0] for level in png_levels]
+    buffer = pack_parser.buffer
+    assert sorted(describe_level(level) for level in pack_parser.parse_levels()) == png_levels
+    assert buffer.closed and not pack_parser.buffer.closed
+    pack_parser.close()
+    assert pack_parser.buffer is None and buffer.closed
+    assert [describe_level(pack_parser.parse_level(level[0])) for level in png_levels] == png_levels
+    pack_parser.close()
+    pack_path.write_bytes(pack_path.read_bytes()[:-1])
+    try:
+        pack_parser.index_levels()
+        assert False, "a truncated level pack was indexed"
+    except RuntimeError:
+        pass
+    assert pack_parser.buffer is None
+
+
+def parse_png_level_per_pixel(file_path):
+    """
+    Reads the cells of a PNG level one pixel at a time, in column major order from the top of each column
+    """
+    cells = {PNGLevelParser.BARRIER_COLOR: [], PNGLevelParser.FOOD_SPAWN_COLOR: [],
+             PNGLevelParser.INITIAL_SNAKE_HEAD_SPAWN_COLOR: []}
+    with Image.open(file_path) as image:
+        pixels = image.load()
+        for column in range(image.width):
+            for y in range(image.height):
+                pixel = pixels[column, y][:3]
+                if pixel in cells:
+                    cells[pixel].append((column, image.height - y - 1))
+    return [cells[color] for color in (PNGLevelParser.BARRIER_COLOR, PNGLevelParser.FOOD_SPAWN_COLOR,
+                                       PNGLevelParser.INITIAL_SNAKE_HEAD_SPAWN_COLOR)]
+
+
+def test_png_level_parser_matches_per_pixel_parsing():
+    """
+    Parses every bundled level, which has to find the same cells in the same order as reading the pixels one by one
+    """
+    for file_name in sorted(os.listdir(LEVEL_DIR)):
+        file_path = pathlib.Path(LEVEL_DIR, file_name)
+        level = PNGLevelParser.parse_png_level(file_path, BOARD_WIDTH, BOARD_HEIGHT)
+        assert [[(coordinate.column, coordinate.row) for coordinate in coordinates]
+                for coordinates in (level.barriers, level.food_spawns, level.initial_snake_head_spawns)] == \
+            parse_png_level_per_pixel(file_path)
+
+
+def test_fixed_timestep_scheduler_catches_up_on_a_fake_clock():
+    """
+    Drives a scheduler with a fake clock whose times are exact in binary, late ticks have to be caught up to the catch
+    up limit and counted as missed deadlines, the rest dropped, and the interpolation of the frame published after a
+    tick has to follow the time left until the next tick
+    """
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+    scheduler = FixedTimestepScheduler(4, max_catch_up_ticks=3, clock=lambda: now[0], sleep=sleep)
+    assert scheduler.advance() == 0
+    now[0] = 0.375
+    assert scheduler.advance() == 1
+    assert (scheduler.missed_deadlines, scheduler.dropped_ticks, scheduler.time_until_next_tick()) == (0, 0, 0.125)
+    frame = FrameSnapshot(None, scheduler.ticks, False, None, (), (), published_at=now[0],
+                          tick_interval=scheduler.time_until_next_tick())
+    assert [frame.interpolation_progress(now[0] + offset) for offset in (-0.0625, 0.0, 0.0625, 0.125, 1.0)] == \
+        [0.0, 0.0, 0.5, 1.0, 1.0]
+    scheduler.wait_for_next_tick()
+    assert (sleeps, now[0], scheduler.advance()) == ([0.125], 0.5, 1)
+    now[0] = 1.0
+    assert scheduler.advance() == 2
+    assert (scheduler.missed_deadlines, scheduler.dropped_ticks) == (1, 0)
+    now[0] = 3.125
+    assert scheduler.advance() == 3
+    assert (scheduler.ticks, scheduler.missed_deadlines, scheduler.dropped_ticks) == (7, 3, 5)
+    assert scheduler.time_until_next_tick() == 0.125
+    now[0] = 10.0
+    scheduler.reset()
+    assert (scheduler.advance(), scheduler.time_until_next_tick()) == (0, 0.25)
+    assert FrameSnapshot(None, 0, False, None, (), ()).interpolation_progress(now[0]) == 1.0
+
+
+def test_input_queue_applies_one_turn_per_player_and_tick():
+    """
+    Buffers turns of two players on a fake clock, every tick has to apply the oldest turn of each player that changes
+    the direction of their snake and record how long it waited, without counting the time the game was paused
+    """
+    now = [0.0]
+    input_queue = InputQueue((1, 2), max_buffered_turns=4, clock=lambda: now[0])
+    first_snake = SimpleNamespace(player_number=1, last_direction_moved=Directions.VECTOR_RIGHT,
+                                  direction_to_move=Directions.VECTOR_RIGHT)
+    second_snake = SimpleNamespace(player_number=2, last_direction_moved=Directions.VECTOR_UP,
+                                   direction_to_move=Directions.VECTOR_UP)
+    ai_snake = SimpleNamespace(player_number=None, last_direction_moved=Directions.VECTOR_UP,
+                               direction_to_move=Directions.VECTOR_DOWN)
+    snakes = [first_snake, ai_snake, second_snake]
+    for timestamp, direction in ((0.0, Directions.VECTOR_LEFT), (0.5, Directions.VECTOR_RIGHT),
+                                 (1.0, Directions.VECTOR_UP), (2.0, Directions.VECTOR_LEFT)):
+        assert input_queue.push(1, direction, timestamp)
+    assert not input_queue.push(1, Directions.VECTOR_DOWN, 2.5)
+    assert input_queue.push(2, Directions.VECTOR_RIGHT, 1.5)
+    now[0] = 3.0
+    input_queue.apply_turns(snakes)
+    assert [snake.direction_to_move for snake in snakes] == [Directions.VECTOR_UP, Directions.VECTOR_DOWN,
+                                                              Directions.VECTOR_RIGHT]
+    assert (input_queue.skipped_turns, input_queue.dropped_turns) == (2, 1)
+    for snake in snakes:
+        snake.last_direction_moved = snake.direction_to_move
+    now[0] = 4.0
+    input_queue.apply_turns(snakes)
+    assert [snake.direction_to_move for snake in snakes] == [Directions.VECTOR_LEFT, Directions.VECTOR_DOWN,
+                                                              Directions.VECTOR_RIGHT]
+    assert input_queue.push(2, Directions.VECTOR_DOWN, 5.0)
+    now[0] = 6.0
+    input_queue.pause()
+    now[0] = 6.5
+    input_queue.apply_turns(snakes)
+    assert second_snake.direction_to_move == Directions.VECTOR_DOWN
+    assert list(input_queue.latency.durations) == [2.0, 1.5, 2.0, 0.5]
+    assert not any(input_queue.turns.values())
+
+
+def test_full_board_has_no_food():
+    """
+    Fills every free cell of a game with barriers, the game has to keep running without food and spawn food again as
+    soon as a cell is free
+    """
+    nibbles = Nibbles(TEST_COLORS, BOARD_WIDTH, BOARD_HEIGHT, 1.0, 1, 0, AiDifficultyLevel.EASY,
+                      LevelParserTypes.PNG_PARSER, 0, True, seed=5, prefetch=False)
+    nibbles.initialize_level()
+    collision_map = nibbles.collision_map
+    nibbles.remove_coordinate_from_collision_map(nibbles.food)
+    free_cells = [index for index in range(collision_map.size) if index in collision_map.free_cells]
+    for index in free_cells:
+        collision_map.place_index(index, CollisionMap.CELL_BARRIER)
+    nibbles.spawn_food()
+    assert nibbles.food is None and not collision_map.free_cells
+    snake = nibbles.snakes[0]
+    for tick in range(1, 4):
+        nibbles.update()
+        assert (nibbles.tick, nibbles.food, nibbles.stopped, snake.lives) == (tick, None, False, 5 - tick)
+        nibbles.reset_snakes()
+    collision_map.remove_index(free_cells[-1], CollisionMap.CELL_BARRIER)
+    nibbles.update()
+    assert nibbles.food is not None and collision_map.index(nibbles.food.column, nibbles.food.row) == free_cells[-1]
+
+
+def test_collision_map_owner_follows_snakes_in_cell():
+    """
+    Stacks the body chunks of several snakes in one cell and takes them out again, the cell has to belong to a snake
+    that is still inside of it, and every owned cell of a played game has to hold a body chunk of its owner
+    """
+    collision_map = CollisionMap(4, 3)
+    index = collision_map.index(2, 1)
+    for owner in (1, 3, 3):
+        collision_map.place_index(index, CollisionMap.CELL_SNAKE, owner)
+    collision_map.remove_index(index, CollisionMap.CELL_SNAKE, 3)
+    assert collision_map.owner(2, 1) == 3
+    collision_map.remove_index(index, CollisionMap.CELL_SNAKE, 3)
+    assert (collision_map.owner(2, 1), collision_map.count(2, 1)) == (1, 1)
+    collision_map.place_index(index, CollisionMap.CELL_SNAKE, 2)
+    collision_map.remove_index(index, CollisionMap.CELL_SNAKE, 1)
+    assert collision_map.owner(2, 1) == 2
+    collision_map.remove_index(index, CollisionMap.CELL_SNAKE, 2)
+    assert collision_map.owner(2, 1) == CollisionMap.NO_OWNER and collision_map.is_empty(2, 1)
+
+    nibbles = Nibbles(TEST_COLORS, BOARD_WIDTH, BOARD_HEIGHT, 1.0, 0, 6, AiDifficultyLevel.EASY,
+                      LevelParserTypes.PNG_PARSER, 1, True, seed=1, prefetch=False)
+    nibbles.initialize_level()
+    collision_map = nibbles.collision_map
+    ai_executor = InlineAiExecutor()
+    while not nibbles.stopped and nibbles.tick < 100:
+        ai_executor.calculate_ai_directions(nibbles)
+        nibbles.update()
+        owned_cells = {}
+        for snake in nibbles.snakes:
+            for chunk in snake.body:
+                owned_cells.setdefault(collision_map.coordinate_index(chunk), set()).add(snake.snake_id)
+        assert all(collision_map.owners[index] in owned_cells.get(index, {CollisionMap.NO_OWNER})
+                   for index in range(collision_map.size))
+        if nibbles.snake_reset_needed:
+            nibbles.reset_snakes()
+
+
+def test_free_cell_index_chooses_every_free_cell_once():
+    """
+    Marks cells free on both sides of block and group boundaries, every draw of the random number generator has to map
+    to a different free cell in cell order, so every free cell is equally likely
+    """
+    size = 3 * FreeCellIndex.GROUP_SIZE + 70
+    free_cell_index = FreeCellIndex(size)
+    random = Random(9)
+    boundaries = [FreeCellIndex.BLOCK_SIZE - 1, FreeCellIndex.BLOCK_SIZE, FreeCellIndex.GROUP_SIZE - 1,
+                  FreeCellIndex.GROUP_SIZE, 2 * FreeCellIndex.GROUP_SIZE - 1, 2 * FreeCellIndex.GROUP_SIZE, size - 1]
+    # the second group is empty apart from the cells at its edges
+    free_cells = sorted(set(boundaries) | {index for index in range(size) if random.random() < 0.3 and
+                                           not FreeCellIndex.GROUP_SIZE < index < 2 * FreeCellIndex.GROUP_SIZE - 1})
+    for index in range(size):
+        free_cell_index.track(index, True)
+    for index in set(range(size)) - set(free_cells):
+        free_cell_index.discard(index)
+    assert len(free_cell_index) == len(free_cells)
+    assert sum(free_cell_index.block_counts) == sum(free_cell_index.group_counts) == len(free_cells)
+    draws = iter(range(len(free_cells)))
+    chosen_cells = [free_cell_index.choice(SimpleNamespace(randrange=lambda stop: next(draws)))
+                    for _ in free_cells]
+    assert chosen_cells == free_cells
+    for index in free_cells:
+        free_cell_index.discard(index)
+    assert free_cell_index.choice(random) is None
+
+
+def test_level_cache_follows_level_source(tmp_path):
+    """
+    Parses a level through the level cache, editing the level source has to replace its entry and a corrupt or
+    truncated entry has to be parsed again from the source
+    """
+    level_dir = tmp_path / 'levels'
+    level_dir.mkdir()
+    source_path = level_dir / 'level_0.png'
+    shutil.copyfile(os.path.join(LEVEL_DIR, 'level_0.png'), source_path)
+    cache_dir = tmp_path / 'cache'
+    expected_levels = {level.number: describe_level(level) for level in create_level_parser().parse_levels()}
+    level_parser = create_level_parser(level_dir=level_dir, cache_dir=cache_dir)
+    assert describe_level(level_parser.parse_level(0)) == expected_levels[0]
+    [cache_path] = (cache_dir / 'levels').iterdir()
+    assert describe_level(level_parser.parse_level(0)) == expected_levels[0]
+
+    shutil.copyfile(os.path.join(LEVEL_DIR, 'level_1.png'), source_path)
+    assert describe_level(level_parser.parse_level(0))[1:] == expected_levels[1][1:]
+    [edited_cache_path] = (cache_dir / 'levels').iterdir()
+    assert edited_cache_path != cache_path
+
+    cached_data = edited_cache_path.read_bytes()
+    for corrupt_data in (cached_data[:-1], cached_data[:10], b'', b'X' * len(cached_data)):
+        edited_cache_path.write_bytes(corrupt_data)
+        assert describe_level(level_parser.parse_level(0))[1:] == expected_levels[1][1:]
+        assert edited_cache_path.read_bytes() == cached_data
+
+
+def test_profiler_only_instruments_enabled_instances():
+    """
+    Enables a profiler on one of two games, only that game and its AI executor may be timed, including the strategies
+    run on the threads of the executor, and disabling the profiler has to put the original methods back
+    """
+    games = []
+    for _ in range(2):
+        nibbles = Nibbles(TEST_COLORS, BOARD_WIDTH, BOARD_HEIGHT, 1.0, 0, 3, AiDifficultyLevel.INTERMEDIATE,
+                          LevelParserTypes.PNG_PARSER, 1, True, seed=6, prefetch=False)
+        nibbles.initialize_level()
+        games.append((nibbles, ThreadPoolAiExecutor(max_workers=3)))
+    original_attributes = [(set(vars(nibbles)), set(vars(ai_executor))) for nibbles, ai_executor in games]
+    original_class_attributes = [dict(vars(owner)) for owner in (Nibbles, ThreadPoolAiExecutor, Snake)]
+    profiler = Profiler()
+    profiler.enable(*games[0])
+    try:
+        for _ in range(20):
+            for nibbles, ai_executor in games:
+                ai_executor.calculate_ai_directions(nibbles)
+                nibbles.update()
+        assert profiler.get_histogram('nibbles.update').count == 20
+        assert profiler.get_histogram('ai.calculate_ai_directions').count == 20
+        assert profiler.get_histogram('ai.intermediate').count == 20 * 3
+        assert (set(vars(games[1][0])), set(vars(games[1][1]))) == original_attributes[1]
+        assert 'update' in vars(games[0][0]) and 'strategy_histograms' in vars(games[0][1])
+    finally:
+        profiler.disable()
+        for _, ai_executor in games:
+            ai_executor.shutdown()
+    assert [(set(vars(nibbles)), set(vars(ai_executor))) for nibbles, ai_executor in games] == original_attributes
+    assert [vars(owner) for owner in (Nibbles, ThreadPoolAiExecutor, Snake)] == original_class_attributes
+    assert games[0][1].strategy_histograms is None and not profiler.enabled
+
+
+def test_shared_distance_field_only_targets_hard_snakes(monkeypatch):
+    """
+    Builds the update data of a game with more hard snakes than the shared distance field needs and an easy snake, the
+    field may only search as far as the hard snakes and has to steer them like a field of the whole board
+    """
+    monkeypatch.setattr(Ai, 'SHARED_DISTANCE_FIELD_SNAKES', 4)
+    nibbles = Nibbles(TEST_COLORS, BOARD_WIDTH, BOARD_HEIGHT, 1.0, 0, 8, AiDifficultyLevel.HARD,
+                      LevelParserTypes.PNG_PARSER, 0, True, seed=2, prefetch=False)
+    nibbles.initialize_level()
+    InlineAiExecutor().calculate_ai_directions(nibbles)
+    nibbles.update()
+    food_index = nibbles.collision_map.index(nibbles.food.column, nibbles.food.row)
+    full_field = DistanceField(BOARD_WIDTH, BOARD_HEIGHT)
+    full_field.compute(nibbles.collision_map.counts, food_index)
+    snake_distances = {snake: min(full_field.distances[cell] for cell in Ai.distance_field_targets(snake, full_field)
+                                  if full_field.distances[cell] != DistanceField.UNREACHABLE)
+                       for snake in nibbles.snakes}
+    farthest_snake = max(nibbles.snakes, key=snake_distances.get)
+    farthest_snake.on_update_direction = Ai.easy_calculate_snake_direction
+    hard_snakes = [snake for snake in nibbles.snakes if snake is not farthest_snake]
+    for number_of_hard_snakes in (Ai.SHARED_DISTANCE_FIELD_SNAKES - 1, len(hard_snakes)):
+        distance_field = DistanceField(BOARD_WIDTH, BOARD_HEIGHT)
+        update_data = Ai.build_update_data(nibbles.food, nibbles.collision_map,
+                                           hard_snakes[:number_of_hard_snakes] + [farthest_snake], distance_field)
+        assert ('distance_field' in update_data) == (number_of_hard_snakes >= Ai.SHARED_DISTANCE_FIELD_SNAKES)
+    assert distance_field.goal == food_index and 0 < max(distance_field.distances) < snake_distances[farthest_snake]
+    for snake in hard_snakes:
+        Ai.follow_distance_field(snake, distance_field)
+        direction = snake.direction_to_move
+        Ai.follow_distance_field(snake, full_field)
+        assert direction == snake.direction_to_move
+
+
+def test_ai_executors_agree():
+    """
+    Plays the same seeded games with every AI executor, the snakes have to be steered in the same directions on every
+    tick, with the hard snakes both searching on their own and sharing a distance field
+    """
+    ai_executors = [InlineAiExecutor(), ThreadPoolAiExecutor(max_workers=4), ProcessPoolAiExecutor()]
+    try:
+        for number_of_ai, ai_difficulty_level in ((4, AiDifficultyLevel.INTERMEDIATE), (6, AiDifficultyLevel.HARD),
+                                                  (Ai.SHARED_DISTANCE_FIELD_SNAKES, AiDifficultyLevel.HARD)):
+            played_directions = []
+            for ai_executor in ai_executors:
+                nibbles = Nibbles(TEST_COLORS, BOARD_WIDTH, BOARD_HEIGHT, 1.0, 0, number_of_ai, ai_difficulty_level,
+                                  LevelParserTypes.PNG_PARSER, 2, True, seed=17, prefetch=False)
+                nibbles.initialize_level()
+                directions = []
+                for _ in range(80):
+                    ai_executor.calculate_ai_directions(nibbles)
+                    directions.append([(snake.snake_id, snake.direction_to_move) for snake in nibbles.snakes])
+                    nibbles.update()
+                    if nibbles.snake_reset_needed:
+                        nibbles.reset_snakes()
+                played_directions.append(directions)
+            assert played_directions[0] == played_directions[1] == played_directions[2]
+    finally:
+        for ai_executor in ai_executors:
+            ai_executor.shutdown()
+
+
+def test_environment_rewards_snakes_until_they_are_out():
+    """
+    Plays episodes with random actions, a snake that loses its last life has to get the death penalty and its done flag
+    on the step it is removed from the game, and the episode has to terminate once the player snake is out
+    """
+    environment = NibblesEnvironment(1, LevelParserTypes.PNG_PARSER, BOARD_WIDTH, BOARD_HEIGHT, 1, 3, seed=5)
+    random = Random(0)
+    removed_ai_snakes = 0
+    for _ in range(3):
+        observations, info = environment.reset()
+        assert info['tick'] == 0 and not environment.rewards.any() and not environment.dones.any()
+        assert (observations[:, NibblesEnvironment.CHANNEL_BARRIERS] ==
+                ((environment.cell_types & CollisionMap.CELL_BARRIER) != 0)).all()
+        terminated = truncated = False
+        while not (terminated or truncated):
+            snakes = {snake.snake_id: (snake, snake.score) for snake in environment.nibbles.snakes}
+            dones = environment.dones.copy()
+            observations, rewards, dones_after, terminated, truncated, info = environment.step(
+                [random.randrange(-1, 4) for _ in range(4)])
+            remaining_snake_ids = {snake.snake_id for snake in environment.nibbles.snakes}
+            for snake_id, (snake, score) in snakes.items():
+                killed = snake in environment.nibbles.killed_snakes
+                assert rewards[snake_id - 1] == snake.score - score - killed * environment.death_penalty
+                assert dones_after[snake_id - 1] == (snake_id not in remaining_snake_ids)
+                if snake_id not in remaining_snake_ids:
+                    assert killed and not dones[snake_id - 1]
+                    assert not observations[snake_id - 1, NibblesEnvironment.CHANNEL_OWN_BODY].any()
+                    removed_ai_snakes += snake.player_number is None
+            assert terminated == (1 not in remaining_snake_ids)
+        assert terminated and dones_after[0]
+    assert removed_ai_snakes
+    environment.close()
+
+
+def draw_full_frame(display):
+    """
+    Draws the current frame of a display from scratch into a copy of its screen and returns the pixels of both screens
+    """
+    screen = display.display
+    display.display = screen.copy()
+    display.draw_static_layer()
+    display.draw_snakes()
+    display.draw_food()
+    display.draw_game_stats()
+    full_frame = pygame.image.tobytes(display.display, 'RGB')
+    display.display = screen
+    return pygame.image.tobytes(screen, 'RGB'), full_frame
+
+
+def test_display_draws_changes_like_full_frames():
+    """
+    Draws a game on SDL's dummy video driver, the incrementally drawn frames have to match frames drawn from scratch,
+    also after the level and the display scale changed, which have to render the static layer again and drop the
+    cached text
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    snake_colors = [(255, index * 32, 255 - index * 32) for index in range(8)]
+    nibbles = Nibbles(snake_colors, BOARD_WIDTH, BOARD_HEIGHT, 1.0, 1, 3, AiDifficultyLevel.INTERMEDIATE,
+                      LevelParserTypes.PNG_PARSER, 1, True, seed=21, prefetch=False)
+    nibbles.initialize_level()
+    nibbles.paused = False
+    nibbles.publish_frame()
+    display = Display(nibbles, 6, 60)
+    ai_executor = InlineAiExecutor()
+    try:
+        for level_number, display_scale in ((1, 6), (2, 6), (2, 4)):
+            if level_number != nibbles.level_number:
+                nibbles.level_number = level_number
+                nibbles.restart_level(seed=level_number)
+                nibbles.paused = False
+                nibbles.publish_frame()
+            if display_scale != display.display_scale:
+                display.resize(display_scale)
+            static_layer = display.static_layer
+            display.text_renderer.render('stale', 12, (255, 255, 255))
+            display.draw_frame()
+            assert display.static_layer is not static_layer
+            assert display.static_layer.get_size() == (BOARD_WIDTH * display_scale,
+                                                       (BOARD_HEIGHT + Display.STATS_BAR_HEIGHT) * display_scale)
+            assert not any(key[0] == 'stale' for key in display.text_renderer.surfaces)
+            for tick in range(30):
+                ai_executor.calculate_ai_directions(nibbles)
+                nibbles.update()
+                if nibbles.snake_reset_needed:
+                    nibbles.reset_snakes()
+                    nibbles.paused = False
+                nibbles.publish_frame()
+                display.draw_frame()
+                if tick % 5 == 4:
+                    incremental_frame, full_frame = draw_full_frame(display)
+                    assert incremental_frame == full_frame
+            assert display.static_layer_key == (nibbles.loaded_level, display_scale)
+    finally:
+        pygame.quit()